@@ -12,6 +12,8 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 
+from learnlab.sqlite import sqlite_database
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -48,9 +50,20 @@ REST_FRAMEWORK = {
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
     ),
+    # DRF's default authentication classes, Basic first: the first class
+    # provides the WWW-Authenticate header, so anonymous writes get a 401
+    # rather than the 403 SessionAuthentication alone would produce.
+    'DEFAULT_AUTHENTICATION_CLASSES': (
+        'rest_framework.authentication.BasicAuthentication',
+        'rest_framework.authentication.SessionAuthentication',
+    ),
     # ... other DRF settings
 }
 
+# Largest JSON array accepted by the bulk book endpoints (api/books/bulk/...,
+# see api/parsers.py). Every other view keeps Django's DATA_UPLOAD_MAX_MEMORY_SIZE.
+BULK_UPLOAD_MAX_MEMORY_SIZE = 50 * 1024 * 1024
+
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -85,10 +98,24 @@ WSGI_APPLICATION = 'advanced_api_project.wsgi.application'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
 DATABASES = {
+    # WAL, tuned PRAGMAs and persistent connections (see learnlab/sqlite).
+    'default': sqlite_database(BASE_DIR / 'db.sqlite3'),
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# The AuthorSerializer payloads and their version tokens (api/cache.py) must be
+# visible to every worker process: a version bumped by the worker that handled
+# a write has to invalidate the payload in all of them. The default in-process
+# memory cache cannot do that, so a file-based cache shared by the workers of
+# this host is configured; use a Redis or Memcached backend across hosts.
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'django_cache',
+    },
 }
 
 
@@ -0,0 +1,101 @@
+import os
+import sys
+import json
+import time
+from base64 import b64encode
+from statistics import median
+
+import django
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'advanced_api_project.settings')
+django.setup()
+
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test.utils import setup_test_environment
+from learnlab.benchmarks import use_database
+from rest_framework.test import APIClient
+
+from api.models import Author, Book
+
+# Benchmark: offset vs keyset pagination on /api/books/list/
+# Usage: [BENCHMARK_DATABASE=path] python api/benchmark_pagination.py [total_books] [page_size] [deep_page]
+# Seeds a fresh, migrated temporary database (bulk_create + rebuild_trigram_index), or tops up BENCHMARK_DATABASE
+# to reuse the books of an earlier run, then times page 1 and a deep page in both modes. The configured database
+# is never touched.
+
+TOTAL_BOOKS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+PAGE_SIZE = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+DEEP_PAGE = int(sys.argv[3]) if len(sys.argv) > 3 else 50_000
+REPEAT = 5
+BATCH_SIZE = 10_000
+
+
+def seed_books():
+    """Top the Book table up to TOTAL_BOOKS rows with bulk_create, then rebuild the trigram index."""
+    existing = Book.objects.count()
+    if existing >= TOTAL_BOOKS:
+        return
+    print(f"--- Seeding {TOTAL_BOOKS - existing} books ---")
+    authors = Author.objects.bulk_create(Author(name=f"Author {i}") for i in range(1000))
+    with transaction.atomic():
+        for start in range(existing, TOTAL_BOOKS, BATCH_SIZE):
+            stop = min(start + BATCH_SIZE, TOTAL_BOOKS)
+            Book.objects.bulk_create(
+                Book(
+                    title=f"Title {i % 50_000:05d}",
+                    publication_year=1900 + i % 120,
+                    author=authors[i % len(authors)],
+                    author_name=authors[i % len(authors)].name,
+                )
+                for i in range(start, stop)
+            )
+    # bulk_create bypasses the signals that maintain the trigram index.
+    call_command('rebuild_trigram_index')
+
+
+def cursor_for_page(page, ordering):
+    """Build the keyset cursor a client would hold after walking to `page`."""
+    fields = [field.lstrip('-') for field in ordering]
+    if 'id' not in fields:
+        ordering = ordering + ['-id' if ordering[0].startswith('-') else 'id']
+        fields.append('id')
+    offset = (page - 1) * PAGE_SIZE - 1
+    values = Book.objects.order_by(*ordering).values_list(*fields)[offset]
+    return b64encode(json.dumps({'v': list(values), 'r': 0}).encode('utf-8')).decode('ascii')
+
+
+def time_request(client, params):
+    timings = []
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        response = client.get('/api/books/list/', params)
+        timings.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200, response.status_code
+    return median(timings)
+
+
+def run_benchmark():
+    client = APIClient()
+    for ordering in (['id'], ['title'], ['-publication_year']):
+        order_param = ','.join(ordering)
+        print(f"### ordering={order_param} page_size={PAGE_SIZE}")
+        offset_first = time_request(client, {'ordering': order_param, 'page_size': PAGE_SIZE})
+        offset_deep = time_request(client, {'ordering': order_param, 'page_size': PAGE_SIZE, 'page': DEEP_PAGE})
+        cursor = cursor_for_page(DEEP_PAGE, ordering)
+        keyset_first = time_request(client, {'ordering': order_param, 'page_size': PAGE_SIZE, 'pagination': 'cursor'})
+        keyset_deep = time_request(
+            client, {'ordering': order_param, 'page_size': PAGE_SIZE, 'pagination': 'cursor', 'cursor': cursor}
+        )
+        print(f"- offset: page 1 {offset_first:8.2f} ms | page {DEEP_PAGE} {offset_deep:8.2f} ms")
+        print(f"- keyset: page 1 {keyset_first:8.2f} ms | page {DEEP_PAGE} {keyset_deep:8.2f} ms")
+        print("-" * 30)
+
+
+if __name__ == '__main__':
+    use_database('benchmark_pagination.sqlite3', os.environ.get('BENCHMARK_DATABASE'))
+    setup_test_environment()
+    print(f"Database: {connection.settings_dict['NAME']}")
+    seed_books()
+    run_benchmark()
@@ -0,0 +1,122 @@
+import os
+import sys
+import time
+import random
+from statistics import median
+
+import django
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'advanced_api_project.settings')
+django.setup()
+
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.models import Q
+from django.test.utils import setup_test_environment
+from learnlab.benchmarks import use_database
+from rest_framework.test import APIClient
+
+from api.filters import substring_condition
+from api.models import Author, Book, SearchTrigram
+
+# Benchmark: trigram-indexed substring filters vs plain icontains scans.
+# Usage: [BENCHMARK_DATABASE=path] python api/benchmark_trigram.py [total_books]
+# Seeds a fresh, migrated temporary database (bulk_create + rebuild_trigram_index),
+# or tops up BENCHMARK_DATABASE to reuse the books of an earlier run, then times
+# the same title/author_name/search queries through both paths. The configured
+# database is never touched.
+
+TOTAL_BOOKS = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000
+REPEAT = 5
+BATCH_SIZE = 10_000
+WORDS = [
+    'river', 'shadow', 'garden', 'winter', 'empire', 'silent', 'golden', 'broken', 'hidden', 'last',
+    'night', 'ocean', 'glass', 'iron', 'paper', 'crown', 'storm', 'forest', 'letter', 'house',
+]
+QUERIES = [
+    ('title', 'den gla'),
+    ('title', 'storm 4242'),
+    ('author_name', 'author 77'),
+    ('search', 'empire 1234'),
+    ('title', 'zzz'),
+]
+
+
+def icontains_baseline(param, value):
+    """The original (unindexed, joined) filter for the same parameter."""
+    if param == 'title':
+        return Book.objects.filter(title__icontains=value)
+    if param == 'author_name':
+        return Book.objects.filter(author__name__icontains=value)
+    queryset = Book.objects.all()
+    for term in value.split():
+        queryset = queryset.filter(Q(title__icontains=term) | Q(author__name__icontains=term))
+    return queryset
+
+
+def trigram_queryset(param, value):
+    """The same filter through the trigram index and Book.author_name (what BookFilter/TrigramSearchFilter apply)."""
+    if param == 'title':
+        return Book.objects.filter(substring_condition('title', value))
+    if param == 'author_name':
+        return Book.objects.filter(substring_condition('author_name', value))
+    queryset = Book.objects.all()
+    for term in value.split():
+        queryset = queryset.filter(substring_condition('title', term) | substring_condition('author_name', term))
+    return queryset
+
+
+def seed_books():
+    """Top the Book table up to TOTAL_BOOKS rows, then rebuild the trigram index."""
+    existing = Book.objects.count()
+    if existing >= TOTAL_BOOKS:
+        return
+    print(f"--- Seeding {TOTAL_BOOKS - existing} books ---")
+    rng = random.Random(42)
+    authors = Author.objects.bulk_create(Author(name=f"Author {i}") for i in range(10_000))
+    with transaction.atomic():
+        for start in range(existing, TOTAL_BOOKS, BATCH_SIZE):
+            stop = min(start + BATCH_SIZE, TOTAL_BOOKS)
+            Book.objects.bulk_create(
+                Book(
+                    title=f"{rng.choice(WORDS).title()} {rng.choice(WORDS)} {i}",
+                    publication_year=1900 + i % 120,
+                    author=authors[i % len(authors)],
+                    author_name=authors[i % len(authors)].name,
+                )
+                for i in range(start, stop)
+            )
+    print("--- Rebuilding trigram index ---")
+    call_command('rebuild_trigram_index')
+
+
+def timed(func):
+    timings = []
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return median(timings)
+
+
+def run_benchmark():
+    client = APIClient()
+    print(f"### {Book.objects.count()} books, {SearchTrigram.objects.count()} trigram rows")
+    for param, value in QUERIES:
+        baseline = lambda: list(icontains_baseline(param, value).order_by('id')[:20])
+        indexed = lambda: list(trigram_queryset(param, value).order_by('id')[:20])
+        api = lambda: client.get('/api/books/list/', {param: value, 'pagination': 'cursor'})
+        print(
+            f"- {param}={value!r}: icontains scan {timed(baseline):8.2f} ms"
+            f" | trigram {timed(indexed):8.2f} ms | full API request {timed(api):8.2f} ms"
+        )
+    print("-" * 30)
+
+
+if __name__ == '__main__':
+    use_database('benchmark_trigram.sqlite3', os.environ.get('BENCHMARK_DATABASE'))
+    setup_test_environment()
+    print(f"Database: {connection.settings_dict['NAME']}")
+    seed_books()
+    run_benchmark()
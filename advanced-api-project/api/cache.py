@@ -0,0 +1,75 @@
+
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+# Cache keys for serialized Author payloads.
+# Each author has a version token; the payload key embeds it, so bumping the
+# version (from the Book/Author signals in models.py) invalidates the payload
+# without having to know or delete the old key. The cache must be shared by
+# every worker process (see CACHES in settings.py), and versions are bumped
+# only once the write has committed: bumping earlier would let a concurrent
+# request store the uncommitted state under the new version.
+AUTHOR_VERSION_KEY = 'api:author:{pk}:version'
+AUTHOR_PAYLOAD_KEY = 'api:author:{pk}:v{version}'
+
+# Version token of the book list as a whole. Any Book or Author write bumps
+# it, which changes the ETag of every (filtered) book list response, so a
+# conditional GET is answered without querying the books at all.
+BOOK_LIST_VERSION_KEY = 'api:book-list:version'
+
+
+def _new_version():
+    # A fresh token rather than 1, so a version key evicted from the cache can
+    # never line up with a payload stored under an older version.
+    return time.time_ns()
+
+
+def get_author_versions(author_ids):
+    """Return {author_id: version} for the given ids, creating missing versions."""
+    keys = {AUTHOR_VERSION_KEY.format(pk=pk): pk for pk in author_ids}
+    found = cache.get_many(keys)
+    versions = {keys[key]: version for key, version in found.items()}
+    missing = {key: _new_version() for key, pk in keys.items() if pk not in versions}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update({keys[key]: version for key, version in missing.items()})
+    return versions
+
+
+def bump_author_version(author_id):
+    """Invalidate the cached payload of one author when the current transaction commits."""
+    key = AUTHOR_VERSION_KEY.format(pk=author_id)
+    transaction.on_commit(lambda: cache.set(key, _new_version(), timeout=None))
+
+
+def author_payload_key(author_id, version):
+    return AUTHOR_PAYLOAD_KEY.format(pk=author_id, version=version)
+
+
+
+def get_book_list_version():
+    """Return the current book list version token (nanosecond timestamp of the last write)."""
+    version = cache.get(BOOK_LIST_VERSION_KEY)
+    if version is None:
+        version = _new_version()
+        cache.add(BOOK_LIST_VERSION_KEY, version, timeout=None)
+        version = cache.get(BOOK_LIST_VERSION_KEY, version)
+    return version
+
+
+def bump_book_list_version():
+    """Mark every book list representation as stale when the current transaction commits."""
+    transaction.on_commit(lambda: cache.set(BOOK_LIST_VERSION_KEY, _new_version(), timeout=None))
+
+
+def invalidate_books(author_ids):
+    """
+    Invalidate what a write to books of the given authors makes stale: their
+    AuthorSerializer payloads and the book list ETags. Called by the Book
+    signals and by the bulk endpoints, whose bulk_create/bulk_update send none.
+    """
+    for author_id in set(author_ids):
+        bump_author_version(author_id)
+    bump_book_list_version()
@@ -1,21 +1,84 @@
 
+import operator
+from functools import reduce
+
 import django_filters
-from .models import Book
+from django.db.models import Q
+from django_filters.constants import EMPTY_VALUES
+from rest_framework import filters
+from .models import Book, SearchTrigram
+
+# Book fields backed by the trigram index: field path -> (Book lookup holding
+# the indexed object's id, trigram source).
+TRIGRAM_FIELDS = {
+    'title': ('pk', SearchTrigram.BOOK_TITLE),
+    'author_name': ('author', SearchTrigram.AUTHOR_NAME),
+}
+
+
+def substring_condition(field_name, value):
+    """
+    Q object for 'field_name icontains value'.
+    For indexed fields and values of 3+ characters the rows are first narrowed
+    through the trigram index, plus the rows missing from it; shorter values
+    (which have no trigram), unselective values and unindexed fields fall back
+    to the plain icontains scan.
+    """
+    contains = Q(**{f'{field_name}__icontains': value})
+    if field_name not in TRIGRAM_FIELDS or len(value) < 3:
+        return contains
+    lookup, source = TRIGRAM_FIELDS[field_name]
+    candidates = SearchTrigram.objects.candidates(source, value)
+    if candidates is None:
+        return contains
+    unindexed = SearchTrigram.objects.unindexed(source)
+    return (Q(**{f'{lookup}__in': candidates}) | Q(**{f'{lookup}__in': unindexed})) & contains
+
+
+class TrigramCharFilter(django_filters.CharFilter):
+    """CharFilter performing an icontains lookup through the trigram index."""
+
+    def filter(self, qs, value):
+        if value in EMPTY_VALUES:
+            return qs
+        return qs.filter(substring_condition(self.field_name, value))
+
+
+class TrigramSearchFilter(filters.SearchFilter):
+    """
+    SearchFilter that narrows each search term through the trigram index.
+    Falls back to the standard SearchFilter when a search field uses a prefix
+    ('^', '=', '@', '$') or is not indexed.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request)
+        search_terms = self.get_search_terms(request)
+        if not search_fields or not search_terms:
+            return queryset
+        if not all(field in TRIGRAM_FIELDS for field in search_fields):
+            return super().filter_queryset(request, queryset, view)
+
+        for term in search_terms:
+            queryset = queryset.filter(
+                reduce(operator.or_, [substring_condition(field, term) for field in search_fields])
+            )
+        return queryset
 
 class BookFilter(django_filters.FilterSet):
     """
     Custom FilterSet for the Book model.
     Allows filtering by fields with specific lookup types.
     """
-    # Filter by title containing the value (case-insensitive)
-    title = django_filters.CharFilter(lookup_expr='icontains')
+    # Filter by title containing the value (case-insensitive, through the trigram index)
+    title = TrigramCharFilter(lookup_expr='icontains')
     
     # Filter by publication year (exact match)
     publication_year = django_filters.NumberFilter(lookup_expr='exact')
     
-    # Filter by author name containing the value (via the foreign key relationship)
-    # The 'author__name' syntax traverses the ForeignKey relationship.
-    author_name = django_filters.CharFilter(field_name='author__name', lookup_expr='icontains')
+    # Filter by author name containing the value
+    # Reads the denormalized Book.author_name column, so no join to api_author is needed.
+    author_name = TrigramCharFilter(field_name='author_name', lookup_expr='icontains')
     
     class Meta:
         model = Book
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.models import Author, Book, SearchTrigram
+
+
+class Command(BaseCommand):
+    """Rebuild the trigram index behind the title/author substring filters."""
+    help = 'Rebuilds the trigram index for book titles and author names.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=5000, help='Rows read per batch.')
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        manager = SearchTrigram.objects
+        sources = [
+            (SearchTrigram.BOOK_TITLE, Book.objects.values_list('pk', 'title')),
+            (SearchTrigram.AUTHOR_NAME, Author.objects.values_list('pk', 'name')),
+        ]
+        with transaction.atomic():
+            manager.all().delete()
+            for source, rows in sources:
+                batch, count = [], 0
+                for pair in rows.order_by('pk').iterator(chunk_size=chunk_size):
+                    batch.append(pair)
+                    if len(batch) >= chunk_size:
+                        manager.bulk_create(manager.build(source, batch), batch_size=manager.BATCH_SIZE)
+                        count += len(batch)
+                        batch = []
+                manager.bulk_create(manager.build(source, batch), batch_size=manager.BATCH_SIZE)
+                count += len(batch)
+                manager.mark_indexed(source)
+                self.stdout.write(f'Indexed {count} rows for {source}.')
+
+        self.stdout.write(self.style.SUCCESS('Trigram index rebuilt.'))
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:53
+
+from django.db import migrations, models
+
+# Sources and trigram rules of SearchTrigramManager at the time of this
+# migration; later changes are applied with the rebuild_trigram_index command.
+BOOK_TITLE, AUTHOR_NAME = 'book.title', 'author.name'
+BATCH_SIZE = 5000
+
+
+def trigrams(value):
+    value = (value or '').lower()
+    return {value[i:i + 3] for i in range(len(value) - 2)}
+
+
+def index_existing_rows(apps, schema_editor):
+    Author = apps.get_model('api', 'Author')
+    Book = apps.get_model('api', 'Book')
+    SearchTrigram = apps.get_model('api', 'SearchTrigram')
+    sources = [
+        (BOOK_TITLE, Book.objects.values_list('pk', 'title')),
+        (AUTHOR_NAME, Author.objects.values_list('pk', 'name')),
+    ]
+    for source, pairs in sources:
+        rows = []
+        for object_id, text in pairs.order_by('pk').iterator(chunk_size=BATCH_SIZE):
+            rows.extend(SearchTrigram(source=source, trigram=trigram, object_id=object_id) for trigram in trigrams(text))
+            if len(rows) >= BATCH_SIZE:
+                SearchTrigram.objects.bulk_create(rows)
+                rows = []
+        SearchTrigram.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_author_updated_at_book_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchTrigram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('book.title', 'Book title'), ('author.name', 'Author name')], max_length=20)),
+                ('trigram', models.CharField(max_length=3)),
+                ('object_id', models.BigIntegerField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['source', 'trigram', 'object_id'], name='api_searcht_source_e5a826_idx'), models.Index(fields=['source', 'object_id'], name='api_searcht_source_47eeea_idx')],
+            },
+        ),
+        migrations.RunPython(index_existing_rows, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:01
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_author_name(apps, schema_editor):
+    # One UPDATE ... SET author_name = (SELECT name FROM api_author ...) for the whole table.
+    Author = apps.get_model('api', 'Author')
+    Book = apps.get_model('api', 'Book')
+    Book.objects.update(author_name=Subquery(Author.objects.filter(pk=OuterRef('author_id')).values('name')[:1]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_searchtrigram'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='book',
+            name='author_name',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=100),
+        ),
+        migrations.RunPython(backfill_author_name, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:41
+
+from django.db import migrations, models
+from django.db.models import F
+
+# Sources and trigram rules of SearchTrigramManager at the time of this
+# migration. The index may be incomplete (rows written with bulk_create or
+# update() outside the endpoints), so it is rebuilt before every row is marked
+# as indexed.
+BOOK_TITLE, AUTHOR_NAME = 'book.title', 'author.name'
+BATCH_SIZE = 5000
+
+
+def trigrams(value):
+    value = (value or '').lower()
+    return {value[i:i + 3] for i in range(len(value) - 2)}
+
+
+def reindex_and_mark_rows(apps, schema_editor):
+    Author = apps.get_model('api', 'Author')
+    Book = apps.get_model('api', 'Book')
+    SearchTrigram = apps.get_model('api', 'SearchTrigram')
+    SearchTrigram.objects.all().delete()
+    sources = [
+        (BOOK_TITLE, Book, 'title', 'indexed_title'),
+        (AUTHOR_NAME, Author, 'name', 'indexed_name'),
+    ]
+    for source, model, field, marker in sources:
+        rows = []
+        pairs = model.objects.values_list('pk', field).order_by('pk')
+        for object_id, text in pairs.iterator(chunk_size=BATCH_SIZE):
+            rows.extend(SearchTrigram(source=source, trigram=trigram, object_id=object_id) for trigram in trigrams(text))
+            if len(rows) >= BATCH_SIZE:
+                SearchTrigram.objects.bulk_create(rows)
+                rows = []
+        SearchTrigram.objects.bulk_create(rows)
+        model.objects.update(**{marker: F(field)})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_book_author_name'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='author',
+            name='indexed_name',
+            field=models.CharField(blank=True, default='', editable=False, max_length=100, serialize=False),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='indexed_title',
+            field=models.CharField(blank=True, default='', editable=False, max_length=200, serialize=False),
+        ),
+        migrations.AddIndex(
+            model_name='author',
+            index=models.Index(condition=models.Q(('indexed_name', models.F('name')), _negated=True), fields=['id'], name='api_author_unindexed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(condition=models.Q(('indexed_title', models.F('title')), _negated=True), fields=['id'], name='api_book_unindexed_idx'),
+        ),
+        migrations.RunPython(reindex_and_mark_rows, migrations.RunPython.noop),
+    ]
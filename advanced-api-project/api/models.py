@@ -1,5 +1,11 @@
 
 from django.db import models
+from django.db.models import F, Q
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cache import invalidate_books
 
 class Author(models.Model):
     """
@@ -7,6 +13,16 @@ class Author(models.Model):
     This model is the 'one' side of the one-to-many relationship with the Book model.
     """
     name = models.CharField(max_length=100)
+    # Change tracking: used for Last-Modified / ETag headers.
+    updated_at = models.DateTimeField(auto_now=True)
+    # The name as last written to the trigram index (see SearchTrigramManager).
+    indexed_name = models.CharField(max_length=100, blank=True, default='', editable=False, serialize=False)
+
+    class Meta:
+        indexes = [
+            # The few authors whose name is not (yet) in the trigram index.
+            models.Index(fields=['id'], condition=~Q(indexed_name=F('name')), name='api_author_unindexed_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -22,6 +38,215 @@ class Book(models.Model):
     # Foreign key to Author, setting up the one-to-many relationship.
     # on_delete=models.CASCADE means if an Author is deleted, all their Books are also deleted.
     author = models.ForeignKey(Author, related_name='books', on_delete=models.CASCADE)
+    # Denormalized copy of author.name, so filtering and searching by author
+    # name does not need to join api_author. Kept in sync by save() and by the
+    # Author post_save signal (a single UPDATE when an author is renamed).
+    # Not nullable: every book has an author, and the empty default only covers
+    # rows written with bulk_create/update() that leave the column to the caller.
+    author_name = models.CharField(max_length=100, blank=True, default='', db_index=True, editable=False)
+    # Change tracking: set on every save, used for the detail view's ETag and Last-Modified headers.
+    updated_at = models.DateTimeField(auto_now=True)
+    # The title as last written to the trigram index (see SearchTrigramManager).
+    indexed_title = models.CharField(max_length=200, blank=True, default='', editable=False, serialize=False)
+
+    class Meta:
+        # Composite indexes matching each ordering option (with the 'id' tiebreaker),
+        # so keyset pagination can seek straight to the next page.
+        indexes = [
+            models.Index(fields=['title', 'id']),
+            models.Index(fields=['publication_year', 'id']),
+            # The few books whose title is not (yet) in the trigram index.
+            models.Index(fields=['id'], condition=~Q(indexed_title=F('title')), name='api_book_unindexed_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.title} ({self.publication_year})"
\ No newline at end of file
+        return f"{self.title} ({self.publication_year})"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The author the row was loaded with; save() only copies the name when it changes.
+        instance._loaded_author_id = instance.__dict__.get('author_id')
+        return instance
+
+    def sync_author_name(self):
+        """
+        Copy the author's name into the denormalized author_name column when
+        the book is new or has moved to another author. Returns whether it did.
+        """
+        if self.author_id is None or self.author_id == getattr(self, '_loaded_author_id', None):
+            return False
+        self.author_name = self.author.name
+        return True
+
+    def save(self, *args, **kwargs):
+        synced = self.sync_author_name()
+        update_fields = kwargs.get('update_fields')
+        if synced and update_fields is not None and 'author' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'author_name'}
+        super().save(*args, **kwargs)
+        self._loaded_author_id = self.author_id
+
+
+class SearchTrigramManager(models.Manager):
+    """
+    Maintains and queries the trigram index used for substring search.
+
+    index() also copies each indexed value into the row's indexed_<field>
+    column. Rows written around it (bulk_create, update(), fixtures, raw SQL)
+    end up with a copy that differs from the value; unindexed() finds them
+    through a partial index, so filters can check those rows directly instead
+    of silently missing them.
+    """
+
+    BATCH_SIZE = 5000
+    # A trigram matching more rows than this is not selective enough to use.
+    SELECTIVITY_LIMIT = 2000
+
+    @staticmethod
+    def trigrams(value):
+        """Return the distinct lower-cased 3-character substrings of a value."""
+        value = (value or '').lower()
+        return {value[i:i + 3] for i in range(len(value) - 2)}
+
+    def build(self, source, pairs):
+        """Unsaved index rows for an iterable of (object_id, text) pairs."""
+        return [
+            self.model(source=source, trigram=trigram, object_id=object_id)
+            for object_id, text in pairs
+            for trigram in self.trigrams(text)
+        ]
+
+    def index(self, source, pairs):
+        """(Re)index the given (object_id, text) pairs for one source."""
+        pairs = list(pairs)
+        object_ids = [object_id for object_id, _ in pairs]
+        self.filter(source=source, object_id__in=object_ids).delete()
+        self.bulk_create(self.build(source, pairs), batch_size=self.BATCH_SIZE)
+        self.mark_indexed(source, object_ids)
+
+    def mark_indexed(self, source, object_ids=None):
+        """Record the current values of the given rows (default: all) as indexed."""
+        model, field, marker = self.model.SOURCE_FIELDS[source]
+        rows = model.objects.all() if object_ids is None else model.objects.filter(pk__in=object_ids)
+        rows.exclude(**{marker: F(field)}).update(**{marker: F(field)})
+
+    def unindexed(self, source):
+        """Subquery of object ids whose current value is not in the index."""
+        model, field, marker = self.model.SOURCE_FIELDS[source]
+        return model.objects.filter(~Q(**{marker: F(field)})).values('pk')
+
+    def candidates(self, source, value):
+        """
+        Subquery of object ids whose indexed text contains the rarest trigram
+        of `value`. It is a superset of the real matches, so callers still
+        apply the icontains check, but only to these rows.
+
+        Each trigram's posting list is probed with a capped COUNT, so the cost
+        is bounded. If every trigram is more common than SELECTIVITY_LIMIT the
+        index would not narrow anything down and None is returned; callers then
+        use the plain scan, which finds such common substrings quickly anyway.
+        Rows missing from the index are not candidates; see unindexed().
+        """
+        best, best_count = None, self.SELECTIVITY_LIMIT
+        for trigram in self.trigrams(value):
+            count = self.filter(source=source, trigram=trigram)[:best_count].count()
+            if count < best_count:
+                best, best_count = trigram, count
+                if count == 0:
+                    break
+        if best is None:
+            return None
+        return self.filter(source=source, trigram=best).values('object_id')
+
+
+class SearchTrigram(models.Model):
+    """
+    Trigram (3-character substring) index over Book titles and Author names.
+    Each indexed value is stored as its distinct trigrams, so an icontains
+    filter can be narrowed through the (source, trigram, object_id) index
+    instead of scanning every row with LIKE '%...%'.
+    """
+    BOOK_TITLE = 'book.title'
+    AUTHOR_NAME = 'author.name'
+    SOURCE_CHOICES = [
+        (BOOK_TITLE, 'Book title'),
+        (AUTHOR_NAME, 'Author name'),
+    ]
+
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    trigram = models.CharField(max_length=3)
+    object_id = models.BigIntegerField()
+
+    # source -> (model, indexed field, column holding the value last indexed)
+    SOURCE_FIELDS = {
+        BOOK_TITLE: (Book, 'title', 'indexed_title'),
+        AUTHOR_NAME: (Author, 'name', 'indexed_name'),
+    }
+
+    objects = SearchTrigramManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['source', 'trigram', 'object_id']),
+            models.Index(fields=['source', 'object_id']),
+        ]
+
+    def __str__(self):
+        return f"{self.source}:{self.trigram} -> {self.object_id}"
+
+
+# Invalidate the cached AuthorSerializer payloads and the book list ETags
+# (see api/cache.py) whenever an author or one of their books changes.
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+def invalidate_author_cache(sender, instance, **kwargs):
+    invalidate_books([instance.pk])
+
+
+@receiver(post_save, sender=Author)
+def sync_book_author_names(sender, instance, created, raw=False, **kwargs):
+    # Renaming an author rewrites the denormalized column of all their books in one UPDATE
+    # (and their updated_at, which the detail validators are derived from).
+    if not created and not raw:
+        Book.objects.filter(author=instance).exclude(author_name=instance.name).update(
+            author_name=instance.name, updated_at=timezone.now()
+        )
+
+
+@receiver(pre_save, sender=Book)
+def invalidate_previous_author_cache(sender, instance, **kwargs):
+    # A book moved to another author must also disappear from the old author's payload.
+    # _loaded_author_id is recorded by Book.from_db(), so no query is needed.
+    previous = getattr(instance, '_loaded_author_id', None)
+    if previous is not None and previous != instance.author_id:
+        invalidate_books([previous])
+
+
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+def invalidate_book_author_cache(sender, instance, **kwargs):
+    invalidate_books([instance.author_id])
+
+
+# Keep the trigram index in sync with book titles and author names.
+@receiver(post_save, sender=Book)
+def index_book_trigrams(sender, instance, raw=False, **kwargs):
+    if not raw:
+        SearchTrigram.objects.index(SearchTrigram.BOOK_TITLE, [(instance.pk, instance.title)])
+
+
+@receiver(post_save, sender=Author)
+def index_author_trigrams(sender, instance, raw=False, **kwargs):
+    if not raw:
+        SearchTrigram.objects.index(SearchTrigram.AUTHOR_NAME, [(instance.pk, instance.name)])
+
+
+@receiver(post_delete, sender=Book)
+def delete_book_trigrams(sender, instance, **kwargs):
+    SearchTrigram.objects.filter(source=SearchTrigram.BOOK_TITLE, object_id=instance.pk).delete()
+
+
+@receiver(post_delete, sender=Author)
+def delete_author_trigrams(sender, instance, **kwargs):
+    SearchTrigram.objects.filter(source=SearchTrigram.AUTHOR_NAME, object_id=instance.pk).delete()
@@ -0,0 +1,153 @@
+
+import json
+from base64 import b64decode, b64encode
+from functools import reduce
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class BookPageNumberPagination(PageNumberPagination):
+    """
+    Default (offset) pagination for the Book list.
+    Returns 'count', 'next', 'previous' and 'results'.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class BookKeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination for the Book list.
+
+    Instead of 'OFFSET n' the cursor stores the ordering values of the last row
+    on the page, and the next page is fetched with a 'WHERE (title, id) > (...)'
+    style condition. The cost of a page therefore does not grow with its depth,
+    and no COUNT(*) query is issued.
+
+    The ordering chosen through OrderingFilter ('title', '-publication_year', ...)
+    is respected; 'id' is always appended as a tiebreaker so that rows sharing
+    the same title or year are never skipped or repeated.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    tiebreaker = 'id'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        values, reverse = self.decode_cursor(request)
+        # Walking backwards means flipping every ordering direction,
+        # fetching the page and flipping the rows back afterwards.
+        ordering = [self._flip(field) for field in self.ordering] if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self._keyset_condition(ordering, values))
+
+        # Fetch one extra row to know whether another page follows.
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.page = rows
+        self.has_next = has_more if not reverse else values is not None
+        self.has_previous = values is not None if not reverse else has_more
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Resolve ordering from the view's OrderingFilter and append the tiebreaker.
+        """
+        ordering = None
+        for backend in getattr(view, 'filter_backends', []):
+            if hasattr(backend, 'get_ordering'):
+                ordering = backend().get_ordering(request, queryset, view)
+                break
+        ordering = list(ordering or getattr(view, 'ordering', None) or [])
+        if self.tiebreaker not in [field.lstrip('-') for field in ordering]:
+            # The tiebreaker follows the direction of the primary field so a
+            # single composite index can be scanned in one direction.
+            descending = bool(ordering) and ordering[0].startswith('-')
+            ordering.append('-' + self.tiebreaker if descending else self.tiebreaker)
+        return ordering
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+        try:
+            payload = json.loads(b64decode(encoded.encode('ascii')).decode('utf-8'))
+            values = payload['v']
+            reverse = bool(payload.get('r', 0))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return values, reverse
+
+    def encode_cursor(self, instance, reverse=False):
+        values = [getattr(instance, field.lstrip('-')) for field in self.ordering]
+        payload = {'v': values, 'r': int(reverse)}
+        encoded = b64encode(json.dumps(payload).encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1])
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def _keyset_condition(self, ordering, values):
+        """
+        Build the row-value comparison (a, b, c) > (x, y, z) as
+        a >= x AND (a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z)),
+        honouring the direction of every ordering field. The leading 'a >= x'
+        bound is what lets the database seek into the composite index.
+        """
+        first = ordering[0]
+        bound = Q(**{('%s__lte' if first.startswith('-') else '%s__gte') % first.lstrip('-'): values[0]})
+        clauses = []
+        for index, field in enumerate(ordering):
+            name = field.lstrip('-')
+            lookup = '%s__lt' if field.startswith('-') else '%s__gt'
+            equal = {ordering[i].lstrip('-'): values[i] for i in range(index)}
+            clauses.append(Q(**equal) & Q(**{lookup % name: values[index]}))
+        return bound & reduce(lambda left, right: left | right, clauses)
+
+    @staticmethod
+    def _flip(field):
+        return field[1:] if field.startswith('-') else '-' + field
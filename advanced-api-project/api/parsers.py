@@ -0,0 +1,38 @@
+import json
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import APIException, ParseError
+from rest_framework.parsers import BaseParser
+
+
+class RequestTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = 'Request body is too large.'
+    default_code = 'request_too_large'
+
+
+class BulkJSONParser(BaseParser):
+    """
+    JSON parser for the bulk Book endpoints.
+
+    The body is checked against settings.BULK_UPLOAD_MAX_MEMORY_SIZE instead
+    of the site-wide DATA_UPLOAD_MAX_MEMORY_SIZE, so only these views accept
+    large arrays. It deliberately does not subclass JSONParser: DRF reads the
+    body of JSONParser requests through request.body, which enforces the
+    site-wide limit.
+    """
+    media_type = 'application/json'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        limit = settings.BULK_UPLOAD_MAX_MEMORY_SIZE
+        # Read one byte past the limit to detect an oversize body without
+        # loading all of it.
+        body = stream.read(limit + 1)
+        if len(body) > limit:
+            raise RequestTooLarge()
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            return json.loads(body.decode(encoding))
+        except (LookupError, UnicodeError, ValueError) as error:
+            raise ParseError('JSON parse error - %s' % error)
@@ -1,6 +1,9 @@
 
+from django.core.cache import cache
+from django.db.models import prefetch_related_objects
 from rest_framework import serializers
 from .models import Author, Book
+from .cache import author_payload_key, get_author_versions
 from datetime import date
 
 class BookSerializer(serializers.ModelSerializer):
@@ -10,7 +13,6 @@ class BookSerializer(serializers.ModelSerializer):
     class Meta:
         model = Book
         fields = ['id', 'title', 'publication_year', 'author']
-        read_only_fields = ['author'] # Prevent accidental modification of the foreign key directly
 
     def validate_publication_year(self, value):
         """
@@ -21,6 +23,74 @@ class BookSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(f"Publication year cannot be in the future. Current year is {current_year}.")
         return value
 
+class BulkAuthorField(serializers.PrimaryKeyRelatedField):
+    """
+    Author foreign key for bulk writes.
+    Resolves ids against the authors preloaded by the view (context['authors'])
+    instead of issuing one Author query per row.
+    """
+    def to_internal_value(self, data):
+        authors = self.context.get('authors')
+        if authors is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool) or not isinstance(data, (str, int)):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            return authors[int(data)]
+        except (KeyError, ValueError):
+            self.fail('does_not_exist', pk_value=data)
+
+
+class BookBulkListSerializer(serializers.ListSerializer):
+    """
+    Validates a chunk of rows with a single child serializer, so the fields are
+    built once per chunk rather than once per row. For updates, the rows are
+    matched by 'id' against the books preloaded in context['books'].
+    """
+    def run_child_validation(self, data):
+        books = self.context.get('books')
+        if books is not None:
+            book = books.get(data.get('id')) if isinstance(data, dict) else None
+            if book is None:
+                raise serializers.ValidationError({'id': ['Book not found.']})
+            self.child.instance = book
+        return super().run_child_validation(data)
+
+
+class BookBulkSerializer(BookSerializer):
+    """
+    BookSerializer used by the bulk endpoints.
+    Same fields and validate_publication_year rule; 'author' is resolved
+    against the authors the view preloaded for the chunk.
+    """
+    author = BulkAuthorField(queryset=Author.objects.all())
+
+    class Meta(BookSerializer.Meta):
+        list_serializer_class = BookBulkListSerializer
+
+
+class CachedAuthorListSerializer(serializers.ListSerializer):
+    """
+    List serializer for authors that reuses cached payloads.
+    Versions and payloads are fetched with one get_many each; the books of
+    the authors missing from the cache are then loaded with one query and
+    only those authors are serialized. A page served entirely from the cache
+    never touches the book table.
+    """
+    def to_representation(self, data):
+        authors = list(data.all() if hasattr(data, 'all') else data)
+        versions = get_author_versions([author.pk for author in authors])
+        keys = {author.pk: author_payload_key(author.pk, versions[author.pk]) for author in authors}
+        cached = cache.get_many(keys.values())
+
+        missing = [author for author in authors if keys[author.pk] not in cached]
+        prefetch_related_objects(missing, 'books')
+        misses = {keys[author.pk]: self.child.serialize(author) for author in missing}
+        if misses:
+            cache.set_many(misses)
+        return [cached.get(keys[author.pk]) or misses[keys[author.pk]] for author in authors]
+
+
 class AuthorSerializer(serializers.ModelSerializer):
     """
     Serializer for the Author model.
@@ -33,6 +103,26 @@ class AuthorSerializer(serializers.ModelSerializer):
     class Meta:
         model = Author
         fields = ['id', 'name', 'books'] # 'books' field displays the nested Book data
+        # Lists of authors go through the cache (see CachedAuthorListSerializer)
+        list_serializer_class = CachedAuthorListSerializer
+
+    def to_representation(self, instance):
+        """
+        Return the cached payload for this author, serializing it on a miss.
+        The cache key includes a version bumped whenever the author or one of
+        their books changes, so stale payloads are never returned.
+        """
+        version = get_author_versions([instance.pk])[instance.pk]
+        key = author_payload_key(instance.pk, version)
+        payload = cache.get(key)
+        if payload is None:
+            payload = self.serialize(instance)
+            cache.set(key, payload)
+        return payload
+
+    def serialize(self, instance):
+        """Serialize the author without going through the cache."""
+        return super().to_representation(instance)
 
     # Documentation Requirements:
     # 1. Relationship Handling: The AuthorSerializer handles the one-to-many 
@@ -1,9 +1,18 @@
 
+import json
+from io import StringIO
+
 from rest_framework.test import APITestCase
 from rest_framework import status
 from django.urls import reverse
 from django.contrib.auth.models import User
-from .models import Author, Book
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.models.signals import post_delete
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from .models import Author, Book, SearchTrigram
 
 class BookAPITestCase(APITestCase):
     """
@@ -115,4 +124,467 @@ class BookAPITestCase(APITestCase):
         """Test that an unauthenticated user is denied from deleting a book (DELETE)."""
         response = self.unauthenticated_client.delete(self.delete_url)
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
-        self.assertEqual(Book.objects.count(), 3) # Count should not change
\ No newline at end of file
+        self.assertEqual(Book.objects.count(), 3) # Count should not change
+
+class BookCursorPaginationTestCase(APITestCase):
+    """
+    Test suite for the opt-in keyset (cursor) pagination mode of the book list.
+    """
+
+    def setUp(self):
+        author = Author.objects.create(name='Jane Austen')
+        # Duplicate titles and years make sure the 'id' tiebreaker is exercised.
+        for index in range(7):
+            Book.objects.create(title=f'Book {index % 3}', publication_year=1900 + index % 2, author=author)
+        self.list_url = reverse('book-list')
+
+    def collect(self, params):
+        """Follow 'next' links from the first page and return every title/id seen."""
+        seen = []
+        response = self.client.get(self.list_url, params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            seen.extend((book['title'], book['publication_year'], book['id']) for book in response.data['results'])
+            if not response.data['next']:
+                return seen
+            response = self.client.get(response.data['next'])
+
+    def test_cursor_walk_matches_full_ordering(self):
+        """Walking the cursor pages returns every row exactly once, in order, for each ordering option."""
+        expected_orderings = {
+            'id': lambda book: book[2],
+            'title': lambda book: (book[0], book[2]),
+            '-publication_year': lambda book: (-book[1], -book[2]),
+        }
+        for ordering, key in expected_orderings.items():
+            seen = self.collect({'pagination': 'cursor', 'page_size': 2, 'ordering': ordering})
+            self.assertEqual(len(seen), 7)
+            self.assertEqual(seen, sorted(seen, key=key))
+
+    def test_previous_link_returns_previous_page(self):
+        """The 'previous' link of the second page returns the first page again."""
+        params = {'pagination': 'cursor', 'page_size': 3, 'ordering': 'title'}
+        first = self.client.get(self.list_url, params)
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+        self.assertEqual(back.data['results'], first.data['results'])
+
+    def test_invalid_cursor_returns_404(self):
+        """A malformed cursor is rejected instead of raising a server error."""
+        response = self.client.get(self.list_url, {'pagination': 'cursor', 'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class AuthorListCacheTestCase(APITestCase):
+    """
+    Test suite for the cached author list endpoint.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.list_url = reverse('author-list')
+
+    def create_authors(self, count):
+        for index in range(count):
+            author = Author.objects.create(name=f'Author {index}')
+            Book.objects.create(title=f'Book {index}', publication_year=2000, author=author)
+
+    def test_query_count_is_constant(self):
+        """One query for the page of authors plus one for their books, however many authors there are."""
+        self.create_authors(3)
+        with self.assertNumQueries(2):
+            self.client.get(self.list_url)
+        self.create_authors(20)
+        cache.clear()
+        with self.assertNumQueries(2):
+            response = self.client.get(self.list_url)
+        self.assertEqual(len(response.data['results']), 20)
+
+    def test_cached_page_does_not_load_books(self):
+        """A page served from the cache costs only the query for the page of authors."""
+        self.create_authors(3)
+        first = self.client.get(self.list_url)
+        with self.assertNumQueries(1):
+            second = self.client.get(self.list_url)
+        self.assertEqual(second.data, first.data)
+
+    def test_pages_follow_author_ids(self):
+        self.create_authors(25)
+        response = self.client.get(self.list_url)
+        names = [author['name'] for author in response.data['results']]
+        response = self.client.get(response.data['next'])
+        names += [author['name'] for author in response.data['results']]
+        self.assertIsNone(response.data['next'])
+        self.assertEqual(names, [f'Author {index}' for index in range(25)])
+
+    def test_book_changes_invalidate_cached_payload(self):
+        """Creating, moving and deleting books is reflected in the next response."""
+        self.create_authors(2)
+        first, second = Author.objects.order_by('id')
+        self.client.get(self.list_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            book = Book.objects.create(title='Sequel', publication_year=2001, author=first)
+        response = self.client.get(self.list_url)
+        self.assertEqual(len(response.data['results'][0]['books']), 2)
+
+        book.author = second
+        with self.captureOnCommitCallbacks(execute=True):
+            book.save()
+        response = self.client.get(self.list_url)
+        self.assertEqual(len(response.data['results'][0]['books']), 1)
+        self.assertEqual(len(response.data['results'][1]['books']), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            book.delete()
+        response = self.client.get(self.list_url)
+        self.assertEqual(len(response.data['results'][1]['books']), 1)
+
+    def test_versions_are_bumped_after_commit(self):
+        """Until the write commits, other requests keep being served the previous payload."""
+        self.create_authors(1)
+        author = Author.objects.get()
+        first = self.client.get(self.list_url)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            Book.objects.create(title='Sequel', publication_year=2001, author=author)
+            self.assertEqual(self.client.get(self.list_url).data, first.data)
+        self.assertTrue(callbacks)
+        self.assertEqual(len(self.client.get(self.list_url).data['results'][0]['books']), 2)
+
+    def test_moving_a_book_does_not_reload_it(self):
+        """The previous author comes from the loaded row, not from an extra SELECT."""
+        self.create_authors(2)
+        book = Book.objects.get(title='Book 0')
+        book.author = Author.objects.get(name='Author 1')
+        with CaptureQueriesContext(connection) as queries:
+            book.save()
+        self.assertFalse(any(query['sql'].startswith('SELECT') and '"api_book"' in query['sql'] for query in queries))
+
+
+class BookBulkAPITestCase(APITestCase):
+    """
+    Test suite for the bulk create/update/delete endpoints.
+    """
+
+    def setUp(self):
+        # The file-based cache outlives the test database, so start from an empty one.
+        cache.clear()
+        self.user = User.objects.create_user(username='importer', password='password123')
+        self.client.force_authenticate(user=self.user)
+        self.author = Author.objects.create(name='Jane Austen')
+        self.create_url = reverse('book-bulk-create')
+        self.update_url = reverse('book-bulk-update')
+        self.delete_url = reverse('book-bulk-delete')
+
+    def test_bulk_create(self):
+        """A list of valid rows is created in one request."""
+        rows = [{'title': f'Book {i}', 'publication_year': 2000, 'author': self.author.pk} for i in range(25)]
+        response = self.client.post(self.create_url, rows, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 25)
+        self.assertEqual(Book.objects.count(), 25)
+
+    def test_bulk_create_reports_row_errors_and_writes_nothing(self):
+        """Invalid rows are reported by index and the whole batch is rolled back."""
+        rows = [
+            {'title': 'Valid', 'publication_year': 2000, 'author': self.author.pk},
+            {'title': 'Future', 'publication_year': 9999, 'author': self.author.pk},
+            {'title': 'No author', 'publication_year': 2000, 'author': 12345},
+        ]
+        response = self.client.post(self.create_url, rows, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1, 2])
+        self.assertIn('publication_year', response.data['errors'][0]['errors'])
+        self.assertIn('author', response.data['errors'][1]['errors'])
+        self.assertEqual(Book.objects.count(), 0)
+
+    def test_bulk_update(self):
+        """PATCH updates only the given fields of each listed book."""
+        books = [Book.objects.create(title=f'Book {i}', publication_year=2000, author=self.author) for i in range(3)]
+        rows = [{'id': book.pk, 'publication_year': 1990} for book in books]
+        response = self.client.patch(self.update_url, rows, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['updated'], 3)
+        self.assertEqual(set(Book.objects.values_list('publication_year', flat=True)), {1990})
+
+        response = self.client.patch(self.update_url, [{'id': 12345, 'title': 'Missing'}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['errors'][0]['index'], 0)
+
+    def test_bulk_delete(self):
+        """DELETE removes the listed books and reports unknown ids."""
+        books = [Book.objects.create(title=f'Book {i}', publication_year=2000, author=self.author) for i in range(3)]
+        response = self.client.delete(self.delete_url, [books[0].pk, books[1].pk, 12345], format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['deleted'], 2)
+        self.assertEqual(response.data['not_found'], [12345])
+        self.assertEqual(list(Book.objects.all()), [books[2]])
+
+    def test_bulk_delete_sends_delete_signals(self):
+        """Every post_delete receiver runs for each deleted book, so no cleanup is skipped."""
+        books = [Book.objects.create(title=f'Book {i}', publication_year=2000, author=self.author) for i in range(5)]
+        self.client.get(reverse('author-list'))
+        deleted = []
+
+        def record(sender, instance, **kwargs):
+            deleted.append(instance.pk)
+
+        post_delete.connect(record, sender=Book)
+        try:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.delete(self.delete_url, [book.pk for book in books], format='json')
+        finally:
+            post_delete.disconnect(record, sender=Book)
+        self.assertEqual(response.data['deleted'], 5)
+        self.assertEqual(sorted(deleted), [book.pk for book in books])
+        self.assertFalse(SearchTrigram.objects.filter(source=SearchTrigram.BOOK_TITLE).exists())
+        response = self.client.get(reverse('author-list'))
+        self.assertEqual(response.data['results'][0]['books'], [])
+
+    @override_settings(DATA_UPLOAD_MAX_MEMORY_SIZE=1000, BULK_UPLOAD_MAX_MEMORY_SIZE=10_000)
+    def test_bulk_upload_limit_applies_to_bulk_views_only(self):
+        """Bulk bodies may exceed DATA_UPLOAD_MAX_MEMORY_SIZE, up to BULK_UPLOAD_MAX_MEMORY_SIZE."""
+        rows = [{'title': f'Book {i}', 'publication_year': 2000, 'author': self.author.pk} for i in range(50)]
+        response = self.client.post(self.create_url, rows, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.post(self.create_url, rows * 5, format='json')
+        self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+    def test_bulk_endpoints_require_authentication(self):
+        """Unauthenticated clients cannot use the bulk endpoints."""
+        self.client.force_authenticate(user=None)
+        response = self.client.post(self.create_url, [], format='json')
+        self.assertIn(response.status_code, (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN))
+
+
+class BookExportTestCase(APITestCase):
+    """
+    Test suite for the streaming NDJSON/CSV export.
+    """
+
+    def setUp(self):
+        austen = Author.objects.create(name='Jane Austen')
+        orwell = Author.objects.create(name='George Orwell')
+        self.emma = Book.objects.create(title='Emma', publication_year=1815, author=austen)
+        self.farm = Book.objects.create(title='Animal Farm', publication_year=1945, author=orwell)
+        self.nineteen = Book.objects.create(title='1984', publication_year=1949, author=orwell)
+
+    def export(self, export_format, params=None):
+        response = self.client.get(reverse('book-export', kwargs={'export_format': export_format}), params or {})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_ndjson_export_honours_filters_and_ordering(self):
+        """The export applies the same filter/search/ordering parameters as the list view."""
+        body = self.export('ndjson', {'author_name': 'orwell', 'ordering': '-publication_year'})
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([row['id'] for row in rows], [self.nineteen.pk, self.farm.pk])
+        self.assertEqual(rows[0], {
+            'id': self.nineteen.pk, 'title': '1984', 'publication_year': 1949, 'author': self.nineteen.author_id,
+        })
+
+    def test_csv_export(self):
+        """The CSV export starts with a header row followed by one line per book."""
+        body = self.export('csv', {'search': 'emma'})
+        self.assertEqual(body.splitlines(), ['id,title,publication_year,author', f'{self.emma.pk},Emma,1815,{self.emma.author_id}'])
+
+    def test_unknown_format_returns_404(self):
+        """Only the ndjson and csv formats are available."""
+        response = self.client.get(reverse('book-export', kwargs={'export_format': 'xml'}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class BookConditionalGetTestCase(APITestCase):
+    """
+    Test suite for ETag / Last-Modified support on the book list and detail views.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='editor', password='password123')
+        self.author = Author.objects.create(name='Jane Austen')
+        self.book = Book.objects.create(title='Emma', publication_year=1815, author=self.author)
+        self.list_url = reverse('book-list')
+        self.detail_url = reverse('book-detail', kwargs={'pk': self.book.pk})
+
+    def test_detail_returns_304_without_serializing(self):
+        """A matching If-None-Match costs a single lookup of the row's version."""
+        response = self.client.get(self.detail_url)
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_detail_etag_changes_on_write(self):
+        """Saving the book produces a new ETag."""
+        etag = self.client.get(self.detail_url)['ETag']
+        self.book.title = 'Emma (revised)'
+        self.book.save()
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_list_returns_304_until_a_book_or_author_changes(self):
+        """List ETags depend on the query string and on every Book/Author write."""
+        params = {'ordering': 'title'}
+        etag = self.client.get(self.list_url, params)['ETag']
+        self.assertNotEqual(self.client.get(self.list_url, {'ordering': '-title'})['ETag'], etag)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.list_url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.author.name = 'J. Austen'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.author.save()
+        response = self.client.get(self.list_url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_validators_do_not_query_the_books(self):
+        """Neither a full nor a 304 response of a cursor page aggregates or counts the books."""
+        params = {'pagination': 'cursor', 'ordering': 'title'}
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.list_url, params)
+        self.assertFalse(any('COUNT(' in query['sql'] or 'MAX(' in query['sql'] for query in queries))
+        with self.assertNumQueries(0):
+            response = self.client.get(self.list_url, params, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_list_versions_change_only_after_commit(self):
+        """A write is reflected in the list validators once it has committed."""
+        etag = self.client.get(self.list_url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            Book.objects.create(title='Persuasion', publication_year=1817, author=self.author)
+            response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+
+    def test_bulk_update_refreshes_versions(self):
+        """Bulk updates bypass auto_now and signals but still invalidate ETags."""
+        self.client.force_authenticate(user=self.user)
+        detail_etag = self.client.get(self.detail_url)['ETag']
+        list_etag = self.client.get(self.list_url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(reverse('book-bulk-update'), [{'id': self.book.pk, 'publication_year': 1816}], format='json')
+        self.assertEqual(self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=detail_etag).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get(self.list_url, HTTP_IF_NONE_MATCH=list_etag).status_code, status.HTTP_200_OK)
+
+
+class BookTrigramFilterTestCase(APITestCase):
+    """
+    Test suite for the trigram-indexed title/author_name filters and search.
+    """
+
+    def setUp(self):
+        self.austen = Author.objects.create(name='Jane Austen')
+        self.orwell = Author.objects.create(name='George Orwell')
+        self.pride = Book.objects.create(title='Pride and Prejudice', publication_year=1813, author=self.austen)
+        self.farm = Book.objects.create(title='Animal Farm', publication_year=1945, author=self.orwell)
+        self.nineteen = Book.objects.create(title='1984', publication_year=1949, author=self.orwell)
+        self.list_url = reverse('book-list')
+
+    def titles(self, params):
+        response = self.client.get(self.list_url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return sorted(book['title'] for book in response.data['results'])
+
+    def test_title_and_author_filters_use_substrings(self):
+        """Substring filters match anywhere in the value, ignoring case."""
+        self.assertEqual(self.titles({'title': 'PREJ'}), ['Pride and Prejudice'])
+        self.assertEqual(self.titles({'author_name': 'rwel'}), ['1984', 'Animal Farm'])
+        self.assertEqual(self.titles({'title': 'dice pri'}), [])
+
+    def test_search_terms_match_title_or_author(self):
+        """Every search term must match the title or the author name."""
+        self.assertEqual(self.titles({'search': 'austen'}), ['Pride and Prejudice'])
+        self.assertEqual(self.titles({'search': 'orwell farm'}), ['Animal Farm'])
+
+    def test_short_values_fall_back_to_icontains(self):
+        """Values shorter than a trigram still work through the plain lookup."""
+        self.assertEqual(self.titles({'title': '84'}), ['1984'])
+        self.assertEqual(self.titles({'search': 'an'}), ['Animal Farm', 'Pride and Prejudice'])
+
+    def test_index_follows_renames_and_deletes(self):
+        """Renaming or deleting rows keeps the trigram index in sync."""
+        self.orwell.name = 'Eric Blair'
+        self.orwell.save()
+        self.assertEqual(self.titles({'author_name': 'orwell'}), [])
+        self.assertEqual(self.titles({'author_name': 'blair'}), ['1984', 'Animal Farm'])
+
+        book_id = self.farm.pk
+        self.farm.delete()
+        self.assertFalse(
+            SearchTrigram.objects.filter(source=SearchTrigram.BOOK_TITLE, object_id=book_id).exists()
+        )
+
+    def test_rows_written_around_the_index_are_still_found(self):
+        """Books written with bulk_create or update() are matched without the index."""
+        Book.objects.bulk_create([Book(title='Brave New World', publication_year=1932, author=self.orwell)])
+        Book.objects.filter(pk=self.farm.pk).update(title='Homage to Catalonia')
+        self.assertEqual(self.titles({'title': 'new wor'}), ['Brave New World'])
+        self.assertEqual(self.titles({'title': 'catalon'}), ['Homage to Catalonia'])
+        self.assertEqual(self.titles({'title': 'animal'}), [])
+        self.assertEqual(self.titles({'search': 'prejudice'}), ['Pride and Prejudice'])
+
+        call_command('rebuild_trigram_index', stdout=StringIO())
+        self.assertFalse(Book.objects.filter(pk__in=SearchTrigram.objects.unindexed(SearchTrigram.BOOK_TITLE)).exists())
+        self.assertEqual(self.titles({'title': 'new wor'}), ['Brave New World'])
+
+    def test_unindexed_rows_are_found_through_a_partial_index(self):
+        """Looking up the rows missing from the index does not scan the books."""
+        sql, params = SearchTrigram.objects.unindexed(SearchTrigram.BOOK_TITLE).query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = ' '.join(str(row[-1]) for row in cursor.fetchall())
+        self.assertIn('api_book_unindexed_idx', plan)
+
+
+class BookAuthorNameTestCase(APITestCase):
+    """
+    Test suite for the denormalized Book.author_name column.
+    """
+
+    def setUp(self):
+        self.author = Author.objects.create(name='George Orwell')
+        self.books = [Book.objects.create(title=f'Book {i}', publication_year=1945, author=self.author) for i in range(3)]
+
+    def test_author_name_is_copied_on_save(self):
+        """Saving a book copies its author's name, including when the author changes."""
+        self.assertEqual(Book.objects.get(pk=self.books[0].pk).author_name, 'George Orwell')
+        other = Author.objects.create(name='Aldous Huxley')
+        self.books[0].author = other
+        self.books[0].save()
+        self.assertEqual(Book.objects.get(pk=self.books[0].pk).author_name, 'Aldous Huxley')
+
+    def test_saving_without_moving_the_book_does_not_read_the_author(self):
+        """The name is copied only when author_id changes, so other saves skip the lookup."""
+        book = Book.objects.get(pk=self.books[0].pk)
+        book.title = 'Homage to Catalonia'
+        with CaptureQueriesContext(connection) as queries:
+            book.save()
+        self.assertFalse(any('FROM "api_author"' in query['sql'] for query in queries))
+
+        book.author_id = Author.objects.create(name='Aldous Huxley').pk
+        book.save()
+        self.assertEqual(Book.objects.get(pk=book.pk).author_name, 'Aldous Huxley')
+
+    def test_author_rename_updates_books_with_one_query(self):
+        """Renaming an author rewrites all their books with a single UPDATE."""
+        self.author.name = 'Eric Blair'
+        with CaptureQueriesContext(connection) as queries:
+            self.author.save()
+        updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE "api_book"')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(set(Book.objects.values_list('author_name', flat=True)), {'Eric Blair'})
+
+    def test_author_filters_do_not_join_author_table(self):
+        """The author_name filter and search read Book.author_name without a join."""
+        response = self.client.get(reverse('book-list'), {'author_name': 'orwell', 'search': 'orw'})
+        self.assertEqual(len(response.data['results']), 3)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('book-list'), {'author_name': 'orwell', 'search': 'orw'})
+        self.assertFalse(any('JOIN "api_author"' in query['sql'] for query in queries))
@@ -1,30 +1,47 @@
 # api/urls.py
 from django.urls import path
 from .views import (
-    BookListView, 
-    BookDetailView, 
-    BookCreateView, 
-    BookUpdateView, 
-    BookDeleteView
+    BookListCreate,
+    BookDetailUpdateDelete,
+    AuthorList,
+    BookBulkCreate,
+    BookBulkUpdate,
+    BookBulkDelete,
+    BookExport
 )
 
 urlpatterns = [
     # ListView: /api/books/list/ (GET)
-    path('books/list/', BookListView.as_view(), name='book-list'),
+    path('books/list/', BookListCreate.as_view(), name='book-list'),
+
+    # Streaming export: /api/books/export/ndjson/ or /api/books/export/csv/ (GET)
+    # Takes the same filter/search/ordering parameters as the list view.
+    path('books/export/<str:export_format>/', BookExport.as_view(), name='book-export'),
 
     # DetailView: /api/books/detail/<int:pk>/ (GET)
-    path('books/detail/<int:pk>/', BookDetailView.as_view(), name='book-detail'),
+    path('books/detail/<int:pk>/', BookDetailUpdateDelete.as_view(), name='book-detail'),
     
     # CreateView: /api/books/create/ (POST)
-    path('books/create/', BookCreateView.as_view(), name='book-create'),
+    path('books/create/', BookListCreate.as_view(), name='book-create'),
 
     # UpdateView: /api/books/update/<int:pk>/ (PUT/PATCH)
-    path('books/update/<int:pk>/', BookUpdateView.as_view(), name='book-update'),
+    path('books/update/<int:pk>/', BookDetailUpdateDelete.as_view(), name='book-update'),
 
     # DeleteView: /api/books/delete/<int:pk>/ (DELETE)
-    path('books/delete/<int:pk>/', BookDeleteView.as_view(), name='book-delete'),
+    path('books/delete/<int:pk>/', BookDetailUpdateDelete.as_view(), name='book-delete'),
+
+    # Bulk endpoints: each takes a JSON array and writes it in one transaction
+    # /api/books/bulk/create/ (POST), /api/books/bulk/update/ (PUT/PATCH), /api/books/bulk/delete/ (DELETE)
+    path('books/bulk/create/', BookBulkCreate.as_view(), name='book-bulk-create'),
+    path('books/bulk/update/', BookBulkUpdate.as_view(), name='book-bulk-update'),
+    path('books/bulk/delete/', BookBulkDelete.as_view(), name='book-bulk-delete'),
+
+    # Author list with nested books: /api/authors/ (GET)
+    path('authors/', AuthorList.as_view(), name='author-list'),
 ]
 
 # Documentation Requirements (Step 6):
 # The URL patterns are non-standard RESTful, explicitly defining the action (e.g., 'create', 'update', 'delete') 
-# within the path, thereby requiring five separate endpoints to manage the Book resource.
\ No newline at end of file
+# within the path, thereby requiring five separate endpoints to manage the Book resource.
+# They are served by the two generic views: BookListCreate (list, create) and
+# BookDetailUpdateDelete (detail, update, delete).
\ No newline at end of file
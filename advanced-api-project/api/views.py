@@ -1,12 +1,64 @@
+import csv
+import hashlib
+import json
+from datetime import datetime, timezone as dt_timezone
+
+from django.db import transaction
+from django.http import Http404, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from django_filters import rest_framework
-from rest_framework import generics, permissions
+from rest_framework import generics, permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework import filters  # Import the filters module
 from django_filters.rest_framework import DjangoFilterBackend # Import the DjangoFilterBackend
 
-from .models import Book
-from .serializers import BookSerializer
-from .filters import BookFilter # Import the custom filterset
+from .models import Author, Book, SearchTrigram
+from .serializers import AuthorSerializer, BookSerializer, BookBulkSerializer
+from .filters import BookFilter, TrigramSearchFilter # Import the custom filterset and search backend
+from .pagination import BookPageNumberPagination, BookKeysetPagination
+from .parsers import BulkJSONParser
+from .cache import get_book_list_version, invalidate_books
+
+# Conditional GET helpers
+# The list ETag combines the book list version (bumped, once committed, on every
+# Book/Author write; see api/cache.py) with the full query string, so each
+# filter/ordering/page combination has its own validator, and Last-Modified is
+# the time of that last write. Both come from the shared cache: a conditional
+# GET of any list page, cursor pages included, runs no query. The detail ETag
+# comes from the row's updated_at. On a match Django answers 304 before the
+# view queries or serializes anything.
+
+def book_list_etag(request, *args, **kwargs):
+    key = f'{get_book_list_version()}:{request.get_full_path()}'
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def book_list_last_modified(request, *args, **kwargs):
+    return datetime.fromtimestamp(get_book_list_version() / 1e9, tz=dt_timezone.utc)
+
+
+def book_detail_updated_at(request, pk):
+    # Looked up once per request and shared by the ETag and Last-Modified functions.
+    if not hasattr(request, '_book_updated_at'):
+        request._book_updated_at = Book.objects.filter(pk=pk).values_list('updated_at', flat=True).first()
+    return request._book_updated_at
+
+
+def book_detail_etag(request, pk, *args, **kwargs):
+    updated_at = book_detail_updated_at(request, pk)
+    if updated_at is None:
+        return None
+    return f'book-{pk}-{int(updated_at.timestamp() * 1_000_000)}'
 
+
+def book_detail_last_modified(request, pk, *args, **kwargs):
+    return book_detail_updated_at(request, pk)
+
+
+@method_decorator(condition(etag_func=book_list_etag, last_modified_func=book_list_last_modified), name='get')
 class BookListCreate(generics.ListCreateAPIView):
     """
     ListCreateAPIView with Filtering, Searching, and Ordering enabled.
@@ -18,7 +70,7 @@ class BookListCreate(generics.ListCreateAPIView):
     # Define the filter backends to be used in this view
     filter_backends = [
         DjangoFilterBackend,       # Step 1: Enables comprehensive filtering
-        filters.SearchFilter,      # Step 2: Enables text search
+        TrigramSearchFilter,       # Step 2: Enables text search (trigram-indexed SearchFilter)
         filters.OrderingFilter,    # Step 3: Enables field ordering
     ]
     
@@ -28,7 +80,7 @@ class BookListCreate(generics.ListCreateAPIView):
 
     # Search Configuration (Step 2)
     # Fields to search across (case-insensitive text search)
-    search_fields = ['title', 'author__name'] # Search across Book title and the linked Author's name
+    search_fields = ['title', 'author_name'] # Search across Book title and the (denormalized) Author's name
     
     # Ordering Configuration (Step 3)
     # Fields available for ordering
@@ -36,10 +88,262 @@ class BookListCreate(generics.ListCreateAPIView):
     # Default ordering (e.g., by ID ascending)
     ordering = ['id'] 
 
+    # Pagination Configuration
+    # Offset pagination by default; clients opt in to keyset pagination with
+    # ?pagination=cursor, which keeps deep pages as cheap as the first one.
+    pagination_class = BookPageNumberPagination
+    keyset_pagination_class = BookKeysetPagination
+    pagination_mode_param = 'pagination'
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            if self.request.query_params.get(self.pagination_mode_param) == 'cursor':
+                self._paginator = self.keyset_pagination_class()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+class EchoBuffer:
+    """File-like object whose write() returns the value, so csv.writer can feed a generator."""
+    def write(self, value):
+        return value
+
+
+class BookExport(generics.GenericAPIView):
+    """
+    Streaming export of the (filtered) book list as NDJSON or CSV.
+
+    Accepts exactly the same filter, search and ordering parameters as
+    BookListCreate. Rows are read with a chunked iterator over values() and
+    written out one at a time through a StreamingHttpResponse, so memory use
+    stays flat however many books match.
+    """
+    queryset = Book.objects.all()
+    serializer_class = BookSerializer
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    filter_backends = BookListCreate.filter_backends
+    filterset_class = BookListCreate.filterset_class
+    search_fields = BookListCreate.search_fields
+    ordering_fields = BookListCreate.ordering_fields
+    ordering = BookListCreate.ordering
+
+    # Same fields (and order) as BookSerializer; 'author' is the author id.
+    export_fields = ['id', 'title', 'publication_year', 'author']
+    chunk_size = 2000
+
+    def get(self, request, export_format, *args, **kwargs):
+        if export_format not in ('ndjson', 'csv'):
+            raise Http404('Unsupported export format.')
+        rows = (
+            self.filter_queryset(self.get_queryset())
+            .values_list(*self.export_fields)
+            .iterator(chunk_size=self.chunk_size)
+        )
+        if export_format == 'csv':
+            response = StreamingHttpResponse(self.csv_lines(rows), content_type='text/csv')
+            response['Content-Disposition'] = 'attachment; filename="books.csv"'
+        else:
+            response = StreamingHttpResponse(self.ndjson_lines(rows), content_type='application/x-ndjson')
+        return response
+
+    def ndjson_lines(self, rows):
+        for row in rows:
+            yield json.dumps(dict(zip(self.export_fields, row))) + '\n'
+
+    def csv_lines(self, rows):
+        writer = csv.writer(EchoBuffer())
+        yield writer.writerow(self.export_fields)
+        for row in rows:
+            yield writer.writerow(row)
+
 
 # BookDetailUpdateDelete remains unchanged as these features only apply to list views.
+@method_decorator(condition(etag_func=book_detail_etag, last_modified_func=book_detail_last_modified), name='get')
 class BookDetailUpdateDelete(generics.RetrieveUpdateDestroyAPIView):
     # ... (code for BookDetailUpdateDelete remains the same)
     queryset = Book.objects.all()
     serializer_class = BookSerializer
-    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
\ No newline at end of file
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+
+
+class AuthorList(generics.ListAPIView):
+    """
+    Read-only list of authors with their nested books, paginated by keyset on id.
+    Each author's serialized payload is served from the cache until the author
+    or one of their books changes; books are only loaded (in one query) for the
+    authors of the page missing from the cache.
+    """
+    queryset = Author.objects.all()
+    serializer_class = AuthorSerializer
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = BookKeysetPagination
+    ordering = ['id']
+
+
+class BookBulkMixin:
+    """
+    Shared helpers for the bulk Book endpoints.
+
+    The request body is a JSON array. Rows are processed in chunks of
+    `chunk_size`; every write happens inside one transaction, which is rolled
+    back if any row fails validation. Errors are reported per row as
+    {'index': <position in the array>, 'errors': {...}}.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    # Large request bodies are accepted here only (settings.BULK_UPLOAD_MAX_MEMORY_SIZE).
+    parser_classes = [BulkJSONParser]
+    chunk_size = 1000
+
+    def get_rows(self, request):
+        if not isinstance(request.data, list):
+            return None
+        return request.data
+
+    def chunks(self, rows):
+        for start in range(0, len(rows), self.chunk_size):
+            yield start, rows[start:start + self.chunk_size]
+
+    def load_authors(self, rows):
+        """Fetch every author referenced by a chunk in a single query."""
+        ids = set()
+        for row in rows:
+            try:
+                ids.add(int(row.get('author')))
+            except (AttributeError, TypeError, ValueError):
+                pass
+        return Author.objects.in_bulk(ids)
+
+    def index_titles(self, books):
+        # Signals are not sent for bulk writes, so the trigram index is updated here.
+        SearchTrigram.objects.index(SearchTrigram.BOOK_TITLE, [(book.pk, book.title) for book in books])
+
+    def row_errors(self, start, errors):
+        """Turn a chunk's ListSerializer errors into [{'index', 'errors'}] for the invalid rows."""
+        # ListSerializer reports errors either as a list aligned with the rows
+        # or as a {position: errors} dict, depending on the DRF version/settings.
+        items = errors.items() if isinstance(errors, dict) else enumerate(errors)
+        return [
+            {'index': start + int(position), 'errors': row_errors}
+            for position, row_errors in items if row_errors
+        ]
+
+    def bad_request(self, message):
+        return Response({'detail': message}, status=status.HTTP_400_BAD_REQUEST)
+
+    def rollback_with_errors(self, errors):
+        transaction.set_rollback(True)
+        return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class BookBulkCreate(BookBulkMixin, APIView):
+    """
+    POST a list of books to create them with bulk_create.
+    Each row is validated with BookBulkSerializer (BookSerializer rules).
+    """
+
+    def post(self, request, *args, **kwargs):
+        rows = self.get_rows(request)
+        if rows is None:
+            return self.bad_request('Expected a list of books.')
+
+        errors, created, author_ids = [], [], set()
+        with transaction.atomic():
+            for start, chunk in self.chunks(rows):
+                context = {'request': request, 'authors': self.load_authors(chunk)}
+                serializer = BookBulkSerializer(data=chunk, many=True, context=context)
+                if not serializer.is_valid():
+                    errors.extend(self.row_errors(start, serializer.errors))
+                    continue
+                if not errors:
+                    books = [Book(**row) for row in serializer.validated_data]
+                    for book in books:
+                        book.sync_author_name()
+                    created.extend(Book.objects.bulk_create(books, batch_size=self.chunk_size))
+                    self.index_titles(books)
+                    author_ids.update(book.author_id for book in books)
+            if errors:
+                return self.rollback_with_errors(errors)
+        # bulk_create/bulk_update send no signals, so the caches are invalidated here.
+        invalidate_books(author_ids)
+
+        return Response(
+            {'created': len(created), 'ids': [book.pk for book in created]},
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class BookBulkUpdate(BookBulkMixin, APIView):
+    """
+    PUT/PATCH a list of books (each with its 'id') to update them with bulk_update.
+    PUT requires every field; PATCH only the fields being changed.
+    """
+    update_fields = ['title', 'publication_year', 'author', 'author_name', 'updated_at']
+
+    def put(self, request, *args, **kwargs):
+        return self.update(request, partial=False)
+
+    def patch(self, request, *args, **kwargs):
+        return self.update(request, partial=True)
+
+    def update(self, request, partial):
+        rows = self.get_rows(request)
+        if rows is None:
+            return self.bad_request('Expected a list of books.')
+
+        errors, updated, author_ids = [], 0, set()
+        with transaction.atomic():
+            for start, chunk in self.chunks(rows):
+                ids = [row.get('id') for row in chunk if isinstance(row, dict)]
+                books = Book.objects.select_related('author').in_bulk([pk for pk in ids if isinstance(pk, int)])
+                context = {'request': request, 'authors': self.load_authors(chunk), 'books': books}
+                serializer = BookBulkSerializer(data=chunk, many=True, partial=partial, context=context)
+                if not serializer.is_valid():
+                    errors.extend(self.row_errors(start, serializer.errors))
+                    continue
+                if not errors:
+                    changed, now = [], timezone.now()
+                    for row, values in zip(chunk, serializer.validated_data):
+                        book = books[row['id']]
+                        author_ids.add(book.author_id)
+                        for field, value in values.items():
+                            setattr(book, field, value)
+                        # bulk_update does not call save(), so keep updated_at and author_name current by hand.
+                        book.updated_at = now
+                        book.sync_author_name()
+                        author_ids.add(book.author_id)
+                        changed.append(book)
+                    updated += Book.objects.bulk_update(changed, self.update_fields, batch_size=self.chunk_size)
+                    self.index_titles(changed)
+            if errors:
+                return self.rollback_with_errors(errors)
+        # bulk_create/bulk_update send no signals, so the caches are invalidated here.
+        invalidate_books(author_ids)
+
+        return Response({'updated': updated}, status=status.HTTP_200_OK)
+
+
+class BookBulkDelete(BookBulkMixin, APIView):
+    """
+    DELETE with a list of book ids to delete them in chunks.
+    Ids that do not exist are reported back in 'not_found'.
+    """
+
+    def delete(self, request, *args, **kwargs):
+        ids = self.get_rows(request)
+        if ids is None or not all(isinstance(pk, int) and not isinstance(pk, bool) for pk in ids):
+            return self.bad_request('Expected a list of book ids.')
+
+        deleted, found = 0, set()
+        with transaction.atomic():
+            for _, chunk in self.chunks(ids):
+                pks = set(Book.objects.filter(pk__in=chunk).values_list('pk', flat=True))
+                found |= pks
+                # The chunk's trigram rows go in one DELETE up front; the
+                # post_delete receivers (cache invalidation included) still run
+                # for every book.
+                SearchTrigram.objects.filter(source=SearchTrigram.BOOK_TITLE, object_id__in=pks).delete()
+                deleted += Book.objects.filter(pk__in=pks).delete()[1].get(Book._meta.label, 0)
+
+        not_found = [pk for pk in ids if pk not in found]
+        return Response({'deleted': deleted, 'not_found': not_found}, status=status.HTTP_200_OK)
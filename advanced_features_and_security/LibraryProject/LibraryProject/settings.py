@@ -12,6 +12,8 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 import os
 from pathlib import Path
 
+from learnlab.sqlite import sqlite_database
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -42,6 +44,9 @@ INSTALLED_APPS = [
 ]
 AUTH_USER_MODEL = 'bookshelf.CustomUser'
 
+# Permission checks read a per-request snapshot of the user's permissions (bookshelf/permissions.py).
+AUTHENTICATION_BACKENDS = ['bookshelf.backends.SnapshotPermissionBackend']
+
 # 4. HTTPS-Only Cookies (Crucial for production)
 CSRF_COOKIE_SECURE = True
 SESSION_COOKIE_SECURE = True
@@ -78,9 +83,10 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'relationship_app.middleware.UserRoleMiddleware', # request.role, looked up once per request
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'csp.middleware.CspMiddleware'
+    'csp.middleware.CSPMiddleware'
 ]
 
 CSP_DEFAULT_SRC = ("'self'",) # Default policy is 'self' (only content from your domain)
@@ -113,10 +119,8 @@ WSGI_APPLICATION = 'LibraryProject.wsgi.application'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    # WAL, tuned PRAGMAs and persistent connections (see learnlab/sqlite).
+    'default': sqlite_database(BASE_DIR / 'db.sqlite3'),
 }
 
 
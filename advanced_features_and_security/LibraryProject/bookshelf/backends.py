@@ -0,0 +1,16 @@
+from django.contrib.auth.backends import ModelBackend
+
+from .permissions import get_user_permissions
+
+
+class SnapshotPermissionBackend(ModelBackend):
+    """
+    ModelBackend whose has_perm() / get_all_permissions() read the permission
+    snapshot, so @permission_required, perms_for() and the `perms` template
+    variable share one permission query per request.
+    """
+
+    def get_all_permissions(self, user_obj, obj=None):
+        if obj is not None:
+            return set()
+        return get_user_permissions(user_obj)
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from bookshelf.models import Book, BookSearchTerm
+
+
+class Command(BaseCommand):
+    """Rebuild the catalogue search index from scratch in bulk."""
+    help = 'Rebuilds the inverted search index used by the bookshelf search page.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Books loaded per batch.')
+
+    def handle(self, *args, **options):
+        manager = BookSearchTerm.objects
+        indexed = 0
+
+        with transaction.atomic():
+            manager.all().delete()
+            terms = []
+            books = Book.objects.only('title', 'author').order_by('pk')
+            for book in books.iterator(chunk_size=options['chunk_size']):
+                terms.extend(manager.terms_for_book(book))
+                if len(terms) >= manager.BATCH_SIZE:
+                    manager.bulk_create(terms, batch_size=manager.BATCH_SIZE)
+                    terms = []
+                indexed += 1
+            manager.bulk_create(terms, batch_size=manager.BATCH_SIZE)
+
+        self.stdout.write(self.style.SUCCESS(f'Indexed {indexed} books.'))
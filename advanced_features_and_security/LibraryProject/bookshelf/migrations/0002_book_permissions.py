@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:25
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookshelf', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='book',
+            options={'permissions': [('can_view', 'Can view all books in the catalog'), ('can_create', 'Can add new books to the catalog'), ('can_edit', 'Can modify existing book details'), ('can_delete', 'Can remove books from the catalog')]},
+        ),
+    ]
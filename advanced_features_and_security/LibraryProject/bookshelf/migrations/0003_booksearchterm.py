@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:26
+
+import re
+from collections import Counter
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Weights and tokenization of BookSearchTermManager at the time of this
+# migration; later changes are applied with the rebuild_book_search_index command.
+TITLE_WEIGHT, AUTHOR_WEIGHT = 3, 2
+TERM_LENGTH = 64
+
+
+def tokenize(text):
+    return [word[:TERM_LENGTH] for word in re.findall(r'\w+', text.casefold())]
+
+
+def index_existing_books(apps, schema_editor):
+    Book = apps.get_model('bookshelf', 'Book')
+    BookSearchTerm = apps.get_model('bookshelf', 'BookSearchTerm')
+    rows = []
+    for book_id, title, author in Book.objects.values_list('pk', 'title', 'author').iterator(chunk_size=1000):
+        weights = Counter()
+        for term in tokenize(title):
+            weights[term] += TITLE_WEIGHT
+        for term in tokenize(author):
+            weights[term] += AUTHOR_WEIGHT
+        rows.extend(BookSearchTerm(book_id=book_id, term=term, weight=weight) for term, weight in weights.items())
+        if len(rows) >= 5000:
+            BookSearchTerm.objects.bulk_create(rows)
+            rows = []
+    BookSearchTerm.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookshelf', '0002_book_permissions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookSearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64)),
+                ('weight', models.PositiveIntegerField(default=1)),
+                ('book', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='bookshelf.book')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['term', 'book'], name='bookshelf_b_term_3eedfd_idx')],
+            },
+        ),
+        migrations.RunPython(index_existing_books, migrations.RunPython.noop),
+    ]
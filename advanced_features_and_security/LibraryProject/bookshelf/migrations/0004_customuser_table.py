@@ -0,0 +1,85 @@
+from django.db import migrations
+
+# CustomUser is created by 0001_initial, because AUTH_USER_MODEL has to be
+# created by its app's first migration. Databases that applied 0001_initial
+# before CustomUser was added to it (while AUTH_USER_MODEL was still
+# auth.User) have no bookshelf_customuser table. This migration creates it,
+# moves the existing accounts across with their ids, groups and permissions,
+# and rebuilds the tables whose foreign keys still point at auth_user. On
+# databases created from scratch it does nothing.
+
+USER_COLUMNS = [
+    'id', 'password', 'last_login', 'is_superuser', 'first_name', 'last_name',
+    'is_staff', 'is_active', 'date_joined', 'email',
+]
+
+
+def create_missing_user_table(apps, schema_editor):
+    CustomUser = apps.get_model('bookshelf', 'CustomUser')
+    connection = schema_editor.connection
+    user_table = CustomUser._meta.db_table
+    with connection.cursor() as cursor:
+        tables = connection.introspection.table_names(cursor)
+    if user_table in tables:
+        return
+
+    schema_editor.create_model(CustomUser)
+    if 'auth_user' in tables:
+        copy_auth_users(CustomUser, schema_editor)
+
+    # Every table created under auth.User references auth_user; SQLite can
+    # only change a foreign key by rebuilding the table (data is copied).
+    if connection.vendor != 'sqlite':
+        return
+    for model in apps.get_models():
+        if model._meta.proxy or not model._meta.managed or model is CustomUser:
+            continue
+        columns = [
+            field.column for field in model._meta.local_fields
+            if field.is_relation and field.remote_field.model is CustomUser and field.db_constraint
+        ]
+        if not columns:
+            continue
+        with connection.cursor() as cursor:
+            relations = connection.introspection.get_relations(cursor, model._meta.db_table)
+        if any(relations.get(column, (None, None))[1] != user_table for column in columns):
+            schema_editor._remake_table(model)
+
+
+def copy_auth_users(CustomUser, schema_editor):
+    """Copy auth_user rows (and their groups and permissions) into the new table."""
+    quote = schema_editor.quote_name
+    with schema_editor.connection.cursor() as cursor:
+        # CustomUser logs in by email, which must be present and unique.
+        cursor.execute(
+            "SELECT COUNT(*) FROM auth_user WHERE TRIM(email) = '' OR LOWER(email) IN "
+            "(SELECT LOWER(email) FROM auth_user GROUP BY LOWER(email) HAVING COUNT(*) > 1)"
+        )
+        unusable = cursor.fetchone()[0]
+    if unusable:
+        raise RuntimeError(
+            f'{unusable} auth_user accounts have a blank or duplicate email; give each account '
+            'a unique email address before migrating to bookshelf.CustomUser.'
+        )
+
+    columns = ', '.join(quote(column) for column in USER_COLUMNS)
+    schema_editor.execute(f'INSERT INTO {quote(CustomUser._meta.db_table)} ({columns}) SELECT {columns} FROM auth_user')
+    for name, target in (('groups', 'group_id'), ('user_permissions', 'permission_id')):
+        through = CustomUser._meta.get_field(name).remote_field.through._meta.db_table
+        schema_editor.execute(
+            f'INSERT INTO {quote(through)} ({quote("customuser_id")}, {quote(target)}) '
+            f'SELECT {quote("user_id")}, {quote(target)} FROM {quote("auth_user_" + name)}'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookshelf', '0003_booksearchterm'),
+        ('admin', '0003_logentry_add_action_flag_choices'),
+        ('relationship_app', '0003_library_holding'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_missing_user_table, migrations.RunPython.noop),
+    ]
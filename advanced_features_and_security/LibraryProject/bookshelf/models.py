@@ -1,9 +1,16 @@
 
 
+import re
+from collections import Counter
+
 from django.db import models
+from django.db.models import OuterRef, Q, Subquery, Sum
+from django.db.models.signals import post_save
+from django.dispatch import receiver
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.utils.translation import gettext_lazy as _
 from django.contrib.auth import get_user_model 
+
 class CustomUserManager(BaseUserManager):
     
     def create_user(self, email, password, **extra_fields):
@@ -61,11 +68,102 @@ class Book(models.Model):
     publication_year = models.IntegerField()
     def __str__(self):
         return f"{self.title} by {self.author}"
-class Meta:
-    permissions = [ 
-        ("can_view", "Can view all books in the catalog"),
-        ("can_create", "Can add new books to the catalog"),
-        ("can_edit", "Can modify existing book details"),
-        ("can_delete", "Can remove books from the catalog"),
+
+    class Meta:
+        permissions = [ 
+            ("can_view", "Can view all books in the catalog"),
+            ("can_create", "Can add new books to the catalog"),
+            ("can_edit", "Can modify existing book details"),
+            ("can_delete", "Can remove books from the catalog"),
+            ]
+
+
+
+class BookSearchTermManager(models.Manager):
+    """Builds and queries the inverted search index for the catalogue."""
+
+    # Relative weight of a term depending on where it appears in the book.
+    TITLE_WEIGHT = 3
+    AUTHOR_WEIGHT = 2
+    BATCH_SIZE = 5000
+
+    @staticmethod
+    def tokenize(text):
+        """Split text into case-folded word terms (truncated to the column size)."""
+        max_length = BookSearchTerm._meta.get_field('term').max_length
+        return [word[:max_length] for word in re.findall(r'\w+', text.casefold())]
+
+    @staticmethod
+    def term_weights(title, author):
+        """Return a Counter mapping each distinct term of a book to its weight."""
+        manager = BookSearchTermManager
+        weights = Counter()
+        for term in manager.tokenize(title):
+            weights[term] += manager.TITLE_WEIGHT
+        for term in manager.tokenize(author):
+            weights[term] += manager.AUTHOR_WEIGHT
+        return weights
+
+    def terms_for_book(self, book):
+        """Return BookSearchTerm rows (unsaved) for a book, one per distinct term."""
+        weights = self.term_weights(book.title, book.author)
+        return [self.model(book=book, term=term, weight=weight) for term, weight in weights.items()]
+
+    def index_book(self, book):
+        """Replace the indexed terms of a single book."""
+        self.filter(book=book).delete()
+        self.bulk_create(self.terms_for_book(book))
+
+    def search(self, query):
+        """
+        Return books whose title or author contains every word of the query
+        (as a prefix), ranked by the summed weight of the matched terms.
+        """
+        words = self.tokenize(query or '')
+        if not words:
+            return Book.objects.none()
+
+        books = Book.objects.all()
+        matched = Q()
+        for word in words:
+            # A range scan instead of LIKE 'word%' so the (term, book) index is used;
+            # chr(0x10FFFF), the highest code point, sorts after any continuation.
+            prefix = Q(term__gte=word, term__lt=word + chr(0x10FFFF))
+            books = books.filter(pk__in=self.filter(prefix).values('book'))
+            matched |= prefix
+
+        rank = (
+            self.filter(matched, book=OuterRef('pk'))
+            .values('book')
+            .annotate(total=Sum('weight'))
+            .values('total')
+        )
+        return books.annotate(search_rank=Subquery(rank)).order_by('-search_rank', 'title', 'pk')
+
+
+class BookSearchTerm(models.Model):
+    """
+    Inverted index over book titles and authors.
+    One row per (term, book) with the weighted number of occurrences, so a
+    search is an index range scan on 'term' instead of a LIKE over every row.
+    """
+    term = models.CharField(max_length=64)
+    book = models.ForeignKey(Book, related_name='search_terms', on_delete=models.CASCADE)
+    weight = models.PositiveIntegerField(default=1)
+
+    objects = BookSearchTermManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['term', 'book']),
         ]
 
+    def __str__(self):
+        return f'{self.term} -> {self.book_id} ({self.weight})'
+
+
+# Keep the search index in sync with the catalogue.
+@receiver(post_save, sender=Book)
+def index_book_on_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        BookSearchTerm.objects.index_book(instance)
@@ -0,0 +1,63 @@
+from django.contrib.auth.models import Permission
+from django.db.models import Q
+
+# Permission snapshots for the permission-gated views.
+#
+# A user's permissions ('app_label.codename', direct and through groups) are
+# loaded with one query and memoized on the user object, which
+# AuthenticationMiddleware loads afresh for every request: the decorator, the
+# view and the `perms` template variable share one snapshot per request.
+# Snapshots are not cached across requests, so a revoked permission or group
+# membership applies on the user's very next request, in every worker.
+
+
+def load_user_permissions(user):
+    """Return the permission names of user, with a single query."""
+    if user.is_superuser:
+        permissions = Permission.objects.all()
+    else:
+        permissions = Permission.objects.filter(Q(user=user) | Q(group__user=user))
+    rows = permissions.values_list('content_type__app_label', 'codename').distinct()
+    return frozenset(f'{app_label}.{codename}' for app_label, codename in rows)
+
+
+def get_user_permissions(user):
+    """Return the frozenset of permission names of user (empty for anonymous and inactive users)."""
+    if user.is_anonymous or not user.is_active:
+        return frozenset()
+    perms = getattr(user, '_perm_snapshot', None)
+    if perms is None:
+        perms = user._perm_snapshot = load_user_permissions(user)
+    return perms
+
+
+class ModelPermissions:
+    """
+    One user's permissions within a model's app, for templates:
+    `{{ book_perms.can_edit }}` or `{% if 'can_edit' in book_perms %}`.
+    """
+
+    def __init__(self, perms, app_label):
+        self.perms = perms
+        self.app_label = app_label
+
+    def __getitem__(self, codename):
+        return f'{self.app_label}.{codename}' in self.perms
+
+    def __getattr__(self, codename):
+        if codename.startswith('_'):
+            raise AttributeError(codename)
+        return self[codename]
+
+    def __contains__(self, codename):
+        return self[codename]
+
+    def __bool__(self):
+        prefix = f'{self.app_label}.'
+        return any(perm.startswith(prefix) for perm in self.perms)
+
+
+def perms_for(user, model):
+    """Return the ModelPermissions of user for model's app."""
+    return ModelPermissions(get_user_permissions(user), model._meta.app_label)
+
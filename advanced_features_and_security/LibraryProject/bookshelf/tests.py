@@ -1,3 +1,107 @@
+from io import StringIO
+
+from django.contrib.auth.models import Group, Permission
+from django.core.management import call_command
 from django.test import TestCase
+from django.urls import reverse
+
+from .models import Book, BookSearchTerm, CustomUser
+from .permissions import get_user_permissions, perms_for
+
+
+class PermissionSnapshotTest(TestCase):
+    """Tests for the per-request permission snapshots behind the permission-gated views."""
+
+    def setUp(self):
+        self.editors = Group.objects.create(name='Editors')
+        self.editors.permissions.add(*Permission.objects.filter(codename__in=['can_view', 'can_edit']))
+        self.user = CustomUser.objects.create_user(email='editor@example.com', password='password123')
+        self.user.groups.add(self.editors)
+        Book.objects.create(title='Emma', author='Jane Austen', publication_year=1815)
+        self.client.force_login(self.user)
+        self.url = reverse('book_list')
+
+    def fresh_user(self):
+        return CustomUser.objects.get(pk=self.user.pk)
+
+    def test_snapshot_is_loaded_with_one_query(self):
+        with self.assertNumQueries(1):
+            perms = get_user_permissions(self.user)
+        self.assertEqual(perms, {'bookshelf.can_view', 'bookshelf.can_edit'})
+
+    def test_book_list_checks_permissions_with_one_query(self):
+        """Decorator and template checks share one snapshot per request."""
+        with self.assertNumQueries(4):  # session, user, permissions, books
+            response = self.client.get(self.url, secure=True)
+        self.assertContains(response, 'Edit</a>')
+        self.assertNotContains(response, 'Delete</a>')
+
+    def test_permission_changes_apply_to_the_next_request(self):
+        self.client.get(self.url, secure=True)
+        self.editors.permissions.add(Permission.objects.get(codename='can_delete'))
+        self.assertContains(self.client.get(self.url, secure=True), 'Delete</a>')
+        self.user.groups.remove(self.editors)
+        self.assertEqual(self.client.get(self.url, secure=True).status_code, 403)
+
+    def test_snapshot_is_not_shared_between_requests(self):
+        """A permission removed without m2m_changed (a queryset delete) is gone on the next request."""
+        self.client.get(self.url, secure=True)
+        Group.permissions.through.objects.filter(group=self.editors).delete()
+        self.assertEqual(self.client.get(self.url, secure=True).status_code, 403)
+
+    def test_user_permission_change_applies_to_a_fresh_user(self):
+        self.assertFalse(perms_for(self.fresh_user(), Book).can_create)
+        self.user.user_permissions.add(Permission.objects.get(codename='can_create'))
+        book_perms = perms_for(self.fresh_user(), Book)
+        self.assertTrue(book_perms.can_create)
+        self.assertIn('can_create', book_perms)
+
+
+class BookSearchTest(TestCase):
+    """Tests for the indexed, ranked and paginated catalogue search."""
+
+    def setUp(self):
+        user = CustomUser.objects.create_user(email='reader@example.com', password='password123')
+        user.user_permissions.add(Permission.objects.get(codename='can_view'))
+        self.client.force_login(user)
+        self.url = reverse('book_search')
+        Book.objects.create(title='Emma', author='Jane Austen', publication_year=1815)
+        Book.objects.create(title='Pride and Prejudice', author='Jane Austen', publication_year=1813)
+        Book.objects.create(title='Jane Eyre', author='Charlotte Brontë', publication_year=1847)
+
+    def titles(self, query):
+        return [book.title for book in BookSearchTerm.objects.search(query)]
+
+    def test_prefix_search_is_case_folded(self):
+        self.assertEqual(self.titles('PRID'), ['Pride and Prejudice'])
+        self.assertEqual(self.titles('bront'), ['Jane Eyre'])
+
+    def test_prefix_matches_astral_plane_continuations(self):
+        Book.objects.create(title='Mathematical a\U0001D518', author='Anonymous', publication_year=1900)
+        self.assertEqual(self.titles('mathematical a'), ['Mathematical a\U0001D518'])
+
+    def test_every_word_must_match(self):
+        self.assertEqual(self.titles('jane emm'), ['Emma'])
+        self.assertEqual(self.titles('jane dickens'), [])
+
+    def test_title_matches_rank_above_author_matches(self):
+        self.assertEqual(self.titles('jane'), ['Jane Eyre', 'Emma', 'Pride and Prejudice'])
+
+    def test_index_follows_edits(self):
+        book = Book.objects.get(title='Emma')
+        book.title = 'Persuasion'
+        book.save()
+        self.assertEqual(self.titles('emma'), [])
+        self.assertEqual(self.titles('persua'), ['Persuasion'])
 
-# Create your tests here.
+    def test_results_are_paginated(self):
+        Book.objects.bulk_create(
+            Book(title=f'Austen Companion {i}', author='Various', publication_year=2000) for i in range(25)
+        )
+        call_command('rebuild_book_search_index', stdout=StringIO())
+        response = self.client.get(self.url, {'q': 'companion'}, secure=True)
+        self.assertEqual(len(response.context['books']), 20)
+        self.assertEqual(response.context['page_obj'].paginator.count, 25)
+        response = self.client.get(self.url, {'q': 'companion', 'page': 2}, secure=True)
+        self.assertEqual(len(response.context['books']), 5)
+        self.assertContains(response, 'Page 2 of 2')
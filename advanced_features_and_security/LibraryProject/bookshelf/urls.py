@@ -0,0 +1,11 @@
+from django.urls import path
+
+from . import views
+
+urlpatterns = [
+    path('books/', views.book_list_view, name='book_list'),
+    path('books/create/', views.book_create_view, name='book_create'),
+    path('books/<int:pk>/edit/', views.book_edit_view, name='book_edit'),
+    path('books/<int:pk>/delete/', views.book_delete_view, name='book_delete'),
+    path('books/search/', views.book_search_view, name='book_search'),
+]
@@ -2,30 +2,29 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required, permission_required
 from django.http import HttpResponseForbidden
-from django.db.models import Q 
-from .models import Book 
+from django.core.paginator import Paginator
+from .models import Book, BookSearchTerm
 from .forms import ExampleForm, BookForm
+from .permissions import perms_for
+
+SEARCH_PAGE_SIZE = 20
+
 
 @login_required 
-@permission_required('users.can_view', raise_exception=True)
+@permission_required('bookshelf.can_view', raise_exception=True)
 def book_list_view(request):
 
     books = Book.objects.all()
-    can_create = request.user.has_perm('users.can_create')
-    can_edit = request.user.has_perm('users.can_edit')
-    can_delete = request.user.has_perm('users.can_delete')
-    
+    # One snapshot for every button check in the template (see permissions.py).
     context = {
         'books': books,
-        'can_create': can_create,
-        'can_edit': can_edit,
-        'can_delete': can_delete
+        'book_perms': perms_for(request.user, Book),
     }
     return render(request, 'bookshelf/book_list.html', context)
 
 
 @login_required
-@permission_required('users.can_create', raise_exception=True)
+@permission_required('bookshelf.can_create', raise_exception=True)
 def book_create_view(request):
    
     if request.method == 'POST':
@@ -47,7 +46,7 @@ def book_create_view(request):
 
 
 @login_required
-@permission_required('users.can_edit', raise_exception=True)
+@permission_required('bookshelf.can_edit', raise_exception=True)
 def book_edit_view(request, pk):
     book = get_object_or_404(Book, pk=pk)
     if request.method == 'POST':
@@ -62,7 +61,7 @@ def book_edit_view(request, pk):
 
 
 @login_required
-@permission_required('users.can_delete', raise_exception=True)
+@permission_required('bookshelf.can_delete', raise_exception=True)
 def book_delete_view(request, pk):
     book = get_object_or_404(Book, pk=pk)
     if request.method == 'POST':
@@ -73,18 +72,16 @@ def book_delete_view(request, pk):
 
 
 @login_required 
-@permission_required('users.can_view', raise_exception=True)
+@permission_required('bookshelf.can_view', raise_exception=True)
 def book_search_view(request):
     search_query = request.GET.get('q', '')
-    books = Book.objects.none() 
-
-    if search_query:
-        books = Book.objects.filter(
-            Q(title__icontains=search_query) | 
-            Q(author__icontains=search_query)
-        ).distinct()
+    # Every word is looked up as a prefix in the search index (title and
+    # author), best matches first; an empty query matches nothing.
+    paginator = Paginator(BookSearchTerm.objects.search(search_query), SEARCH_PAGE_SIZE)
+    page = paginator.get_page(request.GET.get('page'))
 
     return render(request, 'bookshelf/book_search.html', {
-        'books': books,
+        'books': page.object_list,
+        'page_obj': page,
         'search_query': search_query
-    })
\ No newline at end of file
+    })
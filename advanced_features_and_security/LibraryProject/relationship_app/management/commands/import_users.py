@@ -0,0 +1,95 @@
+import csv
+import secrets
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from relationship_app.models import UserProfile
+
+
+def unusable_password():
+    # Same format as make_password(None), from one urandom read instead of 40 random.choice() calls.
+    return UNUSABLE_PASSWORD_PREFIX + secrets.token_hex(20)
+
+
+class Command(BaseCommand):
+    """
+    Create users and their profiles from a CSV file with bulk inserts.
+
+    bulk_create sends no post_save, so no per-user profile signal runs: each
+    batch costs one SELECT (existing emails), one INSERT of users and one
+    INSERT of profiles (plus one SELECT of the new ids on backends that cannot
+    return them from a bulk INSERT). Passwords are never hashed here (hashing is by far the
+    slowest part of creating a user): a `password` column must already hold
+    Django password hashes, and users without one get an unusable password
+    and set their own through the password reset flow.
+    """
+    help = 'Imports users from a CSV file with columns email[, first_name, last_name, role, password].'
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_file')
+        parser.add_argument(
+            '--role', default=UserProfile.MEMBER, choices=[role for role, _ in UserProfile.ROLE_CHOICES],
+            help='Role of rows without a role column value.',
+        )
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        imported = skipped = 0
+        with open(options['csv_file'], newline='', encoding='utf-8') as csv_file:
+            reader = csv.DictReader(csv_file)
+            if 'email' not in (reader.fieldnames or []):
+                raise CommandError('The CSV file needs an "email" column.')
+            batch = []
+            for row in reader:
+                batch.append(row)
+                if len(batch) >= options['batch_size']:
+                    created, existing = self.import_batch(batch, options['role'])
+                    imported, skipped = imported + created, skipped + existing
+                    batch = []
+            if batch:
+                created, existing = self.import_batch(batch, options['role'])
+                imported, skipped = imported + created, skipped + existing
+        self.stdout.write(self.style.SUCCESS(f'Imported {imported} users ({skipped} rows skipped).'))
+
+    def import_batch(self, rows, default_role):
+        """Insert the users of one batch that do not exist yet; returns (imported, skipped)."""
+        User = get_user_model()
+        roles = {role for role, _ in UserProfile.ROLE_CHOICES}
+        by_email = {}
+        for row in rows:
+            email = User.objects.normalize_email((row.get('email') or '').strip())
+            if email:
+                # Later duplicates of an email in the file are skipped.
+                by_email.setdefault(email, row)
+        existing = set(User.objects.filter(email__in=list(by_email)).values_list('email', flat=True))
+
+        users, user_roles = [], []
+        for email, row in by_email.items():
+            if email in existing:
+                continue
+            role = row.get('role') or default_role
+            if role not in roles:
+                raise CommandError(f'Unknown role {role!r} for {email}.')
+            users.append(User(
+                email=email,
+                first_name=row.get('first_name') or '',
+                last_name=row.get('last_name') or '',
+                password=row.get('password') or unusable_password(),
+            ))
+            user_roles.append(role)
+
+        with transaction.atomic():
+            users = User.objects.bulk_create(users)
+            if not connections[User.objects.db].features.can_return_rows_from_bulk_insert:
+                # Only some backends (SQLite, PostgreSQL, MariaDB) set the primary keys
+                # of bulk-created rows; elsewhere they are read back by email.
+                ids = dict(User.objects.filter(email__in=[user.email for user in users]).values_list('email', 'pk'))
+                for user in users:
+                    user.pk = ids[user.email]
+            UserProfile.objects.bulk_create(
+                UserProfile(user_id=user.pk, role=role) for user, role in zip(users, user_roles)
+            )
+        return len(users), len(rows) - len(users)
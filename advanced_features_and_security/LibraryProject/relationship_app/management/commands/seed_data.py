@@ -0,0 +1,108 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+from learnlab.seeding import TableWriter, chunk_specs
+
+from bookshelf.models import Book as ShelfBook, BookSearchTerm
+from relationship_app import seeding
+from relationship_app.models import Author, Book, Library, LibraryHolding, Librarian, UserProfile
+
+
+class Command(BaseCommand):
+    """
+    Add a deterministic synthetic dataset for load tests: authors, books,
+    libraries, librarians and holdings (relationship_app), catalogue books
+    with their search index (bookshelf) and users with profiles.
+
+    Rows are written with bulk_create (holdings and search terms included),
+    one transaction per chunk, and get their primary keys from the
+    database; with --workers the chunks are generated in a process pool
+    while the main process writes them, in order, so the data is the same
+    for any number of workers.
+    """
+    help = 'Seeds relationship_app, bookshelf and user data in bulk (deterministic for a given --seed).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--books', type=int, default=100_000, help='Books added to each catalogue.')
+        parser.add_argument('--users', type=int, default=10_000)
+        parser.add_argument('--authors', type=int, help='Defaults to one author per 20 books.')
+        parser.add_argument('--libraries', type=int, help='Defaults to one library per 10,000 books (at least 2).')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--workers', type=int, default=0, help='Generator processes (0: generate inline).')
+        parser.add_argument('--chunk-size', type=int, default=20_000, help='Rows generated and written per chunk.')
+        parser.add_argument('--batch-size', type=int, default=1_000, help='Rows per INSERT statement.')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        books, users = options['books'], options['users']
+        authors = options['authors'] or max(1, books // 20)
+        libraries = options['libraries'] or max(2, books // 10_000)
+
+        User = get_user_model()
+        batch_size = options['batch_size']
+        author_writer = TableWriter(Author, ['name'], keep_pks=True, batch_size=batch_size)
+        library_writer = TableWriter(Library, ['name'], keep_pks=True, batch_size=batch_size)
+        with transaction.atomic():
+            author_writer.write((seeding.person_name(i),) for i in range(authors))
+            library_writer.write((f'Library {i}',) for i in range(libraries))
+            TableWriter(Librarian, ['library', 'name'], references={'library': library_writer}).write(
+                (i, seeding.person_name(i)) for i in range(libraries)
+            )
+
+        book_specs = chunk_specs(
+            books, options['chunk_size'], seed=options['seed'], authors=authors, libraries=libraries,
+        )
+        # Only keeps the e-mail addresses of this run apart from earlier ones; the keys come from the database.
+        name_offset = (User.objects.aggregate(top=Max('pk'))['top'] or 0) + 1
+        user_specs = chunk_specs(users, options['chunk_size'], seed=options['seed'], name_offset=name_offset)
+        book_writer = TableWriter(
+            Book, ['title', 'author'], references={'author': author_writer}, keep_pks=True, batch_size=batch_size,
+        )
+        shelf_writer = TableWriter(
+            ShelfBook, ['title', 'author', 'publication_year'], keep_pks=True, batch_size=batch_size,
+        )
+        user_writer = TableWriter(User, [
+            'password', 'is_superuser', 'first_name', 'last_name', 'is_staff', 'is_active',
+            'date_joined', 'email', 'profile_photo',
+        ], keep_pks=True, batch_size=batch_size)
+        writers = {
+            'book': book_writer,
+            'holding': TableWriter(
+                LibraryHolding, ['library', 'book'],
+                references={'library': library_writer, 'book': book_writer}, batch_size=batch_size,
+            ),
+            'shelf_book': shelf_writer,
+            'search_term': TableWriter(
+                BookSearchTerm, ['term', 'book', 'weight'], references={'book': shelf_writer}, batch_size=batch_size,
+            ),
+            'user': user_writer,
+            'profile': TableWriter(
+                UserProfile, ['user', 'role'], references={'user': user_writer}, batch_size=batch_size,
+            ),
+        }
+
+        if options['workers']:
+            with ProcessPoolExecutor(max_workers=options['workers']) as pool:
+                self.write_chunks(writers, pool.map(seeding.library_chunk, book_specs))
+                self.write_chunks(writers, pool.map(seeding.user_chunk, user_specs))
+        else:
+            self.write_chunks(writers, map(seeding.library_chunk, book_specs))
+            self.write_chunks(writers, map(seeding.user_chunk, user_specs))
+
+        elapsed = time.perf_counter() - started
+        total = authors + 2 * libraries + sum(writer.written for writer in writers.values())
+        summary = ', '.join(f'{writer.written} {name} rows' for name, writer in writers.items())
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {total} rows in {elapsed:.1f}s ({total / elapsed * 60:,.0f} rows/min): '
+            f'{authors} authors, {libraries} libraries and librarians, {summary}.'
+        ))
+
+    def write_chunks(self, writers, chunks):
+        for chunk in chunks:
+            with transaction.atomic():
+                for table, rows in chunk.items():
+                    writers[table].write(rows)
@@ -0,0 +1,17 @@
+from django.utils.functional import SimpleLazyObject
+
+from .roles import get_user_role
+
+
+class UserRoleMiddleware:
+    """
+    Attach the user's role as `request.role`, resolved lazily on first use
+    (one query per request, see roles.py). Must come after AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.role = SimpleLazyObject(lambda: get_user_role(request.user))
+        return self.get_response(request)
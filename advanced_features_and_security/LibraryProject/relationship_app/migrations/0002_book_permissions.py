@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:19
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('relationship_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='book',
+            options={'permissions': [('can_add_book', 'Can add new books to the catalog'), ('can_change_book', 'Can edit existing book details'), ('can_delete_book', 'Can delete books from the catalog')]},
+        ),
+    ]
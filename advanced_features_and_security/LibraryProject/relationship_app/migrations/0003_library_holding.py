@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('relationship_app', '0002_book_permissions'),
+    ]
+
+    operations = [
+        # LibraryHolding takes over the table of the auto-created Library.books
+        # through model (same columns and unique (library, book) index), so
+        # only the state changes and existing holdings are kept.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='LibraryHolding',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('book', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='holdings', to='relationship_app.book')),
+                        ('library', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='holdings', to='relationship_app.library')),
+                    ],
+                    options={
+                        'db_table': 'relationship_app_library_books',
+                        'unique_together': {('library', 'book')},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='library',
+                    name='books',
+                    field=models.ManyToManyField(related_name='libraries', through='relationship_app.LibraryHolding', to='relationship_app.book'),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='libraryholding',
+            index=models.Index(fields=['book', 'library'], name='relationship_holding_book_idx'),
+        ),
+    ]
@@ -1,6 +1,7 @@
-from django.db import models
-from django.db import models
-from django.contrib.auth.models import User
+from collections import defaultdict, namedtuple
+
+from django.conf import settings
+from django.db import models, transaction
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
@@ -12,18 +13,113 @@ class Author(models.Model):
 
 class Book(models.Model):
     title = models.CharField(max_length=200)
+    
     author = models.ForeignKey(Author, on_delete=models.CASCADE, related_name='books')
 
     def __str__(self):
         return f"{self.title} by {self.author.name}"
+    
+    
+    class Meta:
+        permissions = [
+            
+            ("can_add_book", "Can add new books to the catalog"),
+            ("can_change_book", "Can edit existing book details"),
+            ("can_delete_book", "Can delete books from the catalog"),
+        ]
 
 class Library(models.Model):
     name = models.CharField(max_length=100)
-    books = models.ManyToManyField(Book, related_name='libraries')
+    books = models.ManyToManyField(Book, related_name='libraries', through='LibraryHolding')
 
     def __str__(self):
         return self.name
 
+
+Holdings = namedtuple('Holdings', ['by_book', 'by_library'])
+
+
+class LibraryHoldingManager(models.Manager):
+    """Bulk membership changes and lookups for the library catalogues."""
+
+    BATCH_SIZE = 5000
+
+    def add_holdings(self, pairs, batch_size=None):
+        """
+        Add (library_id, book_id) pairs in chunked INSERTs; pairs already
+        held are skipped. Returns the number of pairs submitted.
+        """
+        batch_size = batch_size or self.BATCH_SIZE
+        submitted = 0
+        batch = []
+        with transaction.atomic(using=self.db):
+            for library_id, book_id in pairs:
+                batch.append(self.model(library_id=library_id, book_id=book_id))
+                if len(batch) >= batch_size:
+                    self.bulk_create(batch, ignore_conflicts=True)
+                    submitted += len(batch)
+                    batch = []
+            self.bulk_create(batch, ignore_conflicts=True)
+        return submitted + len(batch)
+
+    def remove_holdings(self, pairs, batch_size=None):
+        """
+        Remove (library_id, book_id) pairs with one chunked DELETE per
+        library. Returns the number of holdings deleted.
+        """
+        batch_size = batch_size or self.BATCH_SIZE
+        by_library = defaultdict(set)
+        for library_id, book_id in pairs:
+            by_library[library_id].add(book_id)
+        deleted = 0
+        with transaction.atomic(using=self.db):
+            for library_id, book_ids in by_library.items():
+                book_ids = sorted(book_ids)
+                for start in range(0, len(book_ids), batch_size):
+                    chunk = book_ids[start:start + batch_size]
+                    deleted += self.filter(library_id=library_id, book_id__in=chunk).delete()[0]
+        return deleted
+
+    def holdings(self, book_ids=None, library_ids=None):
+        """
+        Return Holdings(by_book={book_id: [library_id, ...]},
+        by_library={library_id: [book_id, ...]}) for the given books and/or
+        libraries, read with a single query over the holding indexes.
+        """
+        rows = self.all()
+        if book_ids is not None:
+            rows = rows.filter(book_id__in=book_ids)
+        if library_ids is not None:
+            rows = rows.filter(library_id__in=library_ids)
+        by_book, by_library = defaultdict(list), defaultdict(list)
+        for library_id, book_id in rows.values_list('library_id', 'book_id').order_by('library_id', 'book_id'):
+            by_book[book_id].append(library_id)
+            by_library[library_id].append(book_id)
+        return Holdings(dict(by_book), dict(by_library))
+
+
+class LibraryHolding(models.Model):
+    """
+    A book held by a library: the Library.books through table. The unique
+    (library, book) index serves a library's catalogue, the (book, library)
+    index serves "which libraries hold this book".
+    """
+    library = models.ForeignKey(Library, related_name='holdings', on_delete=models.CASCADE)
+    book = models.ForeignKey(Book, related_name='holdings', on_delete=models.CASCADE)
+
+    objects = LibraryHoldingManager()
+
+    class Meta:
+        # Keeps the table of the former auto-created through model.
+        db_table = 'relationship_app_library_books'
+        unique_together = [('library', 'book')]
+        indexes = [
+            models.Index(fields=['book', 'library'], name='relationship_holding_book_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.book_id} in {self.library_id}"
+
 class Librarian(models.Model):
     name = models.CharField(max_length=100)
     library = models.OneToOneField(Library, on_delete=models.CASCADE, primary_key=True)
@@ -31,6 +127,29 @@ class Librarian(models.Model):
     def __str__(self):
         return f"Librarian {self.name} at {self.library.name}"
 
+class UserProfileManager(models.Manager):
+
+    def create_missing(self, users=None, role=None, batch_size=1000):
+        """
+        Bulk-create a profile for every user (or every user in `users`) that
+        has none, with `role` or the default role. Returns the number created.
+        """
+        from django.contrib.auth import get_user_model
+
+        candidates = get_user_model().objects.filter(userprofile__isnull=True)
+        if users is not None:
+            candidates = candidates.filter(pk__in=[getattr(user, 'pk', user) for user in users])
+        fields = {'role': role} if role else {}
+        created = 0
+        user_ids = list(candidates.values_list('pk', flat=True))
+        for start in range(0, len(user_ids), batch_size):
+            batch = [self.model(user_id=pk, **fields) for pk in user_ids[start:start + batch_size]]
+            # ignore_conflicts: a profile created concurrently is left as it is.
+            self.bulk_create(batch, ignore_conflicts=True)
+            created += len(batch)
+        return created
+
+
 class UserProfile(models.Model):
   
     ADMIN = 'Admin'
@@ -44,7 +163,7 @@ class UserProfile(models.Model):
     ]
     
    
-    user = models.OneToOneField(User, on_delete=models.CASCADE)
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     
     
     role = models.CharField(
@@ -53,35 +172,17 @@ class UserProfile(models.Model):
         default=MEMBER,
     )
 
+    objects = UserProfileManager()
+
     def __str__(self):
-        return f"{self.user.username} ({self.role})"
+        return f"{self.user.get_username()} ({self.role})"
 
 
 
-@receiver(post_save, sender=User)
-def create_or_update_user_profile(sender, instance, created, **kwargs):
-    
-    if created:
-        
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def create_user_profile(sender, instance, created, raw=False, **kwargs):
+    # Only new users get a profile here. Later saves (last_login on every
+    # login, update_fields saves) leave the profile alone, and users created
+    # with bulk_create get theirs from UserProfile.objects.create_missing().
+    if created and not raw:
         UserProfile.objects.create(user=instance)
-    
-    if hasattr(instance, 'userprofile'):
-        instance.userprofile.save()
-
-class Book(models.Model):
-    title = models.CharField(max_length=200)
-    
-    author = models.ForeignKey(Author, on_delete=models.CASCADE, related_name='books')
-
-    def __str__(self):
-        return f"{self.title} by {self.author.name}"
-    
-    
-    class Meta:
-        permissions = [
-            
-            ("can_add_book", "Can add new books to the catalog"),
-            ("can_change_book", "Can edit existing book details"),
-            ("can_delete_book", "Can delete books from the catalog"),
-        ]
-
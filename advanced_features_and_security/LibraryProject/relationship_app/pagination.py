@@ -0,0 +1,55 @@
+from django.http import Http404
+
+
+class HoldingKeysetPaginator:
+    """
+    Keyset (cursor) pagination over the holdings of one library, by book id.
+
+    The cursor is the id of the last book on the page and the next page is
+    fetched with 'WHERE library_id = ... AND book_id > cursor', so with the
+    unique (library, book) index every page is an index range scan no matter
+    how deep it is, and no COUNT(*) is issued.
+    """
+    per_page = 50
+
+    def __init__(self, per_page=None):
+        if per_page is not None:
+            self.per_page = per_page
+
+    def paginate(self, queryset, cursor=None):
+        """Return (holdings, next_cursor); next_cursor is None on the last page."""
+        return self.split_page(list(self.page_queryset(queryset, cursor)))
+
+    def page_queryset(self, queryset, cursor, size=None):
+        queryset = queryset.order_by('book_id')
+        if cursor:
+            queryset = queryset.filter(book_id__gt=self.decode_cursor(cursor))
+        # Fetch one extra row to know whether another page follows.
+        return queryset[:(size or self.per_page) + 1]
+
+    def split_page(self, holdings):
+        if len(holdings) <= self.per_page:
+            return holdings, None
+        holdings = holdings[:self.per_page]
+        return holdings, str(holdings[-1].book_id)
+
+    def iterate(self, queryset, chunk_size=2000):
+        """
+        Yield every holding of queryset in book id order, one keyset page of
+        chunk_size rows at a time, so memory stays constant however large the
+        library is.
+        """
+        cursor = None
+        while True:
+            chunk = list(self.page_queryset(queryset, cursor, chunk_size))
+            yield from chunk[:chunk_size]
+            if len(chunk) <= chunk_size:
+                return
+            cursor = chunk[chunk_size - 1].book_id
+
+    @staticmethod
+    def decode_cursor(cursor):
+        try:
+            return int(cursor)
+        except (TypeError, ValueError):
+            raise Http404('Invalid cursor')
@@ -1,23 +1,78 @@
 import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tracemalloc
+from statistics import median, quantiles
+
 import django
-from django.db.models import Count
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'django_models.settings')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'LibraryProject.settings')
 django.setup()
 
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.db import connection, reset_queries, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, setup_test_environment
+from learnlab.benchmarks import use_database
+
+from bookshelf.models import Book as ShelfBook, BookSearchTerm
+from relationship_app.models import Author, Book, Library, LibraryHolding, Librarian, UserProfile
+
+# Sample queries over the relationship_app models, and a benchmark harness.
+# Usage: python relationship_app/query_samples.py [--database PATH]
+#        python relationship_app/query_samples.py --benchmark [--scales 1k,10k,100k] [--repeat N]
+#                                                 [--max-unbounded N] [--output results.json]
+#                                                 [--database PATH]
+# Both run against a fresh, migrated temporary SQLite file unless --database is
+# given; the configured database is never touched.
+#
+# Without --benchmark, setup_data() creates a few authors, books, libraries and
+# librarians and run_queries() prints the sample lookups.
+#
+# With --benchmark: query counts, latency and peak memory of every
+# relationship_app and bookshelf view plus the ORM lookups, per data scale.
+# Scales are book counts (1k ... 10m) and run smallest first: the database is
+# topped up to each scale once (bulk inserts), so re-runs against the same
+# --database and larger scales only add the missing rows. Without --database
+# the harness seeds a fresh, migrated temporary SQLite file; the configured
+# database is never touched. Per scale, every workload is run once to
+# warm up, once under CaptureQueriesContext (query count), N times for the
+# p50/p99 latency and once under tracemalloc (peak Python allocations).
+# Views that render every book at once are skipped above --max-unbounded books.
+# The JSON report goes to stdout (or --output); progress goes to stderr.
+
+BATCH_SIZE = 5000
+BOOKS_PER_AUTHOR = 20
+BOOKS_PER_LIBRARY = 10_000
+PASSWORD = 'benchmark-password'
+
+
+def parse_scale(value):
+    value = value.strip().lower()
+    multiplier = {'k': 1_000, 'm': 1_000_000}.get(value[-1], 1)
+    return int(float(value.rstrip('km')) * multiplier)
 
-from relationship_app.models import Author, Book, Library, Librarian
+
+def log(message):
+    print(message, file=sys.stderr)
+
+
+# --- Sample lookups ----------------------------------------------------------
 
 def setup_data():
-   
     print("--- Setting up sample data ---")
 
     Author.objects.all().delete()
     Library.objects.all().delete()
-    
+
     author1 = Author.objects.create(name="J.R.R. Tolkien")
     author2 = Author.objects.create(name="Jane Austen")
-    
+
     book1 = Book.objects.create(title="The Hobbit", author=author1)
     book2 = Book.objects.create(title="The Lord of the Rings", author=author1)
     book3 = Book.objects.create(title="Pride and Prejudice", author=author2)
@@ -25,41 +80,37 @@ def setup_data():
 
     library_a = Library.objects.create(name="Central City Library")
     library_b = Library.objects.create(name="West Side Branch")
-    
-    
-    library_a.books.add(book1, book2, book3)
-    
-    library_b.books.add(book3, book4)
 
-    
+    # All memberships in one bulk insert instead of one add() per library.
+    LibraryHolding.objects.add_holdings([
+        (library_a.pk, book1.pk), (library_a.pk, book2.pk), (library_a.pk, book3.pk),
+        (library_b.pk, book3.pk), (library_b.pk, book4.pk),
+    ])
+
     Librarian.objects.create(name="Alice Smith", library=library_a)
     Librarian.objects.create(name="Bob Johnson", library=library_b)
-    
+
     print("Sample data populated successfully!")
     print("-" * 30)
 
 
 def run_queries():
-   
     author_name = "J.R.R. Tolkien"
     library_name = "Central City Library"
     library_name_west = "West Side Branch"
-    
+
     print(f"### 1. Query all books by a specific author ({author_name}):")
     try:
         author = Author.objects.get(name=author_name)
-        
         books_by_author = Book.objects.filter(author=author)
-        
         for book in books_by_author:
             print(f"- {book.title}")
     except Author.DoesNotExist:
         print(f"Author '{author_name}' not found.")
     print("-" * 30)
-    
+
     print(f"### 2. List all books in a library ({library_name}):")
     try:
-        
         library_central = Library.objects.get(name=library_name)
         books_in_library = library_central.books.all()
         for book in books_in_library:
@@ -71,9 +122,7 @@ def run_queries():
     print(f"### 3. Retrieve the librarian for a library ({library_name_west}):")
     try:
         library_west = Library.objects.get(name=library_name_west)
-        
         librarian = Librarian.objects.get(library=library_west)
-        
         print(f"- The librarian is: {librarian.name}")
     except Library.DoesNotExist:
         print(f"Library '{library_name_west}' not found.")
@@ -82,6 +131,226 @@ def run_queries():
     print("-" * 30)
 
 
+# --- Benchmark data ----------------------------------------------------------
+
+def seed(scale):
+    """Top both catalogues up to `scale` books, with authors, libraries, holdings and librarians."""
+    existing = Book.objects.count()
+    if existing < scale:
+        log(f"--- Seeding {scale - existing} relationship_app books ---")
+        with transaction.atomic():
+            seed_library_books(existing, scale)
+    existing = ShelfBook.objects.count()
+    if existing < scale:
+        log(f"--- Seeding {scale - existing} bookshelf books ---")
+        with transaction.atomic():
+            seed_shelf_books(existing, scale)
+
+
+def top_up(model, target, make):
+    missing = target - model.objects.count()
+    if missing > 0:
+        model.objects.bulk_create((make(i) for i in range(missing)), batch_size=BATCH_SIZE)
+    return list(model.objects.order_by('pk').values_list('pk', flat=True))
+
+
+def seed_library_books(existing, scale):
+    author_ids = top_up(Author, max(1, scale // BOOKS_PER_AUTHOR), lambda i: Author(name=f'Author {i}'))
+    library_ids = top_up(Library, max(2, scale // BOOKS_PER_LIBRARY), lambda i: Library(name=f'Library {i}'))
+    staffed = set(Librarian.objects.values_list('library_id', flat=True))
+    Librarian.objects.bulk_create(
+        Librarian(name=f'Librarian {pk}', library_id=pk) for pk in library_ids if pk not in staffed
+    )
+    for start in range(existing, scale, BATCH_SIZE):
+        books = Book.objects.bulk_create(
+            Book(title=f'Book {i}', author_id=author_ids[i % len(author_ids)])
+            for i in range(start, min(start + BATCH_SIZE, scale))
+        )
+        # Every book in one library, every third one in a second library too.
+        pairs = []
+        for book in books:
+            pairs.append((library_ids[book.pk % len(library_ids)], book.pk))
+            if book.pk % 3 == 0:
+                pairs.append((library_ids[(book.pk + 1) % len(library_ids)], book.pk))
+        LibraryHolding.objects.add_holdings(pairs)
+
+
+def seed_shelf_books(existing, scale):
+    terms = BookSearchTerm.objects
+    for start in range(existing, scale, BATCH_SIZE):
+        books = ShelfBook.objects.bulk_create(
+            ShelfBook(title=f'Book {i}', author=f'Author {i % (scale // BOOKS_PER_AUTHOR or 1)}',
+                      publication_year=1900 + i % 120)
+            for i in range(start, min(start + BATCH_SIZE, scale))
+        )
+        # bulk_create sends no post_save, so index the new books here.
+        terms.bulk_create([term for book in books for term in terms.terms_for_book(book)], batch_size=BATCH_SIZE)
+
+
+def benchmark_users():
+    """One user per role; the admin is a superuser, the librarian holds every book permission."""
+    User = get_user_model()
+    users = {}
+    for role in (UserProfile.ADMIN, UserProfile.LIBRARIAN, UserProfile.MEMBER):
+        email = f'benchmark-{role.lower()}@example.com'
+        user = User.objects.filter(email=email).first()
+        if user is None:
+            create = User.objects.create_superuser if role == UserProfile.ADMIN else User.objects.create_user
+            user = create(email=email, password=PASSWORD, first_name='Bench', last_name=role)
+        UserProfile.objects.filter(user=user).update(role=role)
+        users[role] = user
+    librarians, _ = Group.objects.get_or_create(name='Benchmark librarians')
+    librarians.permissions.set(Permission.objects.filter(
+        content_type__app_label__in=['bookshelf', 'relationship_app'], codename__startswith='can_'
+    ))
+    users[UserProfile.LIBRARIAN].groups.add(librarians)
+    return users
+
+
+# --- Workloads ---------------------------------------------------------------
+
+def workloads(client_for):
+    """Return [(name, unbounded, callable)] for every view and ORM lookup."""
+    library = Library.objects.order_by('pk').first()
+    holding_ids = list(library.holdings.order_by('book_id').values_list('book_id', flat=True)[:1])
+    middle = LibraryHolding.objects.filter(library=library).order_by('book_id').values_list('book_id', flat=True)
+    middle = middle[library.holdings.count() // 2] if holding_ids else 0
+    book = Book.objects.order_by('pk').first()
+    shelf_book = ShelfBook.objects.order_by('pk').first()
+    author = Author.objects.order_by('pk').first()
+    book_ids = list(Book.objects.order_by('-pk').values_list('pk', flat=True)[:1000])
+
+    admin = client_for(UserProfile.ADMIN)
+    librarian = client_for(UserProfile.LIBRARIAN)
+    member = client_for(UserProfile.MEMBER)
+    anonymous = Client()
+
+    def get(client, path, params=None):
+        def request():
+            response = client.get(path, params or {}, secure=True)
+            if response.streaming:
+                b''.join(response.streaming_content)
+            assert response.status_code == 200, (path, response.status_code)
+        return request
+
+    def lookup(query):
+        return lambda: list(query())
+
+    return [
+        # relationship_app views
+        ('relationship_app:book-list', True, get(anonymous, '/relationship/books/')),
+        ('relationship_app:library-detail', False, get(anonymous, f'/relationship/library/{library.pk}/')),
+        ('relationship_app:library-detail (middle page)', False,
+         get(anonymous, f'/relationship/library/{library.pk}/', {'after': middle})),
+        ('relationship_app:library-export', True, get(anonymous, f'/relationship/library/{library.pk}/export/')),
+        ('relationship_app:register', False, get(anonymous, '/relationship/register/')),
+        ('relationship_app:login', False, get(anonymous, '/relationship/login/')),
+        ('relationship_app:admin-dashboard', False, get(admin, '/relationship/admin-dashboard/')),
+        ('relationship_app:librarian-panel', True, get(librarian, '/relationship/librarian-panel/')),
+        ('relationship_app:member-page', False, get(member, '/relationship/member-page/')),
+        ('relationship_app:book-add', False, get(librarian, '/relationship/book/add/')),
+        ('relationship_app:book-edit', False, get(librarian, f'/relationship/book/edit/{book.pk}/')),
+        ('relationship_app:book-delete', False, get(librarian, f'/relationship/book/delete/{book.pk}/')),
+        # bookshelf views
+        ('bookshelf:book_list', True, get(librarian, '/bookshelf/books/')),
+        ('bookshelf:book_create', False, get(librarian, '/bookshelf/books/create/')),
+        ('bookshelf:book_edit', False, get(librarian, f'/bookshelf/books/{shelf_book.pk}/edit/')),
+        ('bookshelf:book_delete', False, get(librarian, f'/bookshelf/books/{shelf_book.pk}/delete/')),
+        ('bookshelf:book_search', False, get(librarian, '/bookshelf/books/search/', {'q': 'book 1'})),
+        ('bookshelf:book_search (page 5)', False,
+         get(librarian, '/bookshelf/books/search/', {'q': 'book', 'page': 5})),
+        # ORM lookups
+        ('orm:books by author', False, lookup(lambda: Book.objects.filter(author=author))),
+        ('orm:books in library (first page)', False,
+         lookup(lambda: library.holdings.select_related('book').order_by('book_id')[:50])),
+        ('orm:librarian of library', False, lookup(lambda: [Librarian.objects.get(library=library)])),
+        ('orm:libraries holding 1000 books', False,
+         lambda: LibraryHolding.objects.holdings(book_ids=book_ids)),
+    ]
+
+
+def measure(func, repeat):
+    func()  # warm up templates, caches and connections
+    # Each request clears the query log (request_started), so start from an
+    # empty one and count the captured queries before the next request.
+    reset_queries()
+    with CaptureQueriesContext(connection) as queries:
+        func()
+    query_count = len(queries)
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    cuts = quantiles(timings, n=100) if len(timings) > 1 else timings * 99
+    return {
+        'queries': query_count,
+        'p50_ms': round(median(timings), 3),
+        'p99_ms': round(cuts[98], 3),
+        'peak_memory_kb': round(peak / 1024, 1),
+    }
+
+
+def run_scale(scale, options):
+    seed(scale)
+    users = benchmark_users()
+
+    def client_for(role):
+        client = Client()
+        client.force_login(users[role])
+        return client
+
+    results = {}
+    for name, unbounded, func in workloads(client_for):
+        if unbounded and scale > options.max_unbounded:
+            results[name] = {'skipped': f'renders every book (> --max-unbounded {options.max_unbounded})'}
+            continue
+        try:
+            results[name] = measure(func, options.repeat)
+        except Exception as error:  # report the failure and keep measuring the other workloads
+            results[name] = {'error': repr(error)}
+        log(f"- {scale:>10} {name:48} {results[name]}")
+    return results
+
+
+def run_benchmark(options):
+    setup_test_environment()
+    log(f"Database: {connection.settings_dict['NAME']}")
+    report = {
+        'database': {'vendor': connection.vendor, 'name': str(connection.settings_dict['NAME'])},
+        'django': django.get_version(),
+        'python': platform.python_version(),
+        'repeat': options.repeat,
+        'scales': {},
+    }
+    for scale in sorted(parse_scale(value) for value in options.scales.split(',')):
+        report['scales'][str(scale)] = run_scale(scale, options)
+
+    output = json.dumps(report, indent=2)
+    if options.output:
+        with open(options.output, 'w') as report_file:
+            report_file.write(output + '\n')
+    else:
+        print(output)
+
+
 if __name__ == '__main__':
-    setup_data()
-    run_queries()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Sample relationship_app queries, or a benchmark of the views.')
+    parser.add_argument('--benchmark', action='store_true', help='Measure the views instead of running the samples.')
+    parser.add_argument('--scales', default='1k,10k', help='Comma separated book counts, e.g. 1k,10k,1m,10m.')
+    parser.add_argument('--repeat', type=int, default=20, help='Timed runs per workload.')
+    parser.add_argument('--max-unbounded', type=parse_scale, default=parse_scale('100k'))
+    parser.add_argument('--output', help='Write the JSON report to this file instead of stdout.')
+    parser.add_argument('--database', help='SQLite file to use (default: a fresh temporary database).')
+    options = parser.parse_args()
+
+    use_database('query_samples.sqlite3', options.database)
+    if options.benchmark:
+        run_benchmark(options)
+    else:
+        setup_data()
+        run_queries()
@@ -0,0 +1,15 @@
+# Role lookups for the role-gated views (is_admin / is_librarian / is_member).
+# A user's role is read from UserProfile once and memoized on the user object
+# for the rest of the request, like the permission snapshots of
+# bookshelf/permissions.py: the view gate and request.role in the template
+# share one query.
+
+
+def get_user_role(user):
+    """Return the UserProfile role of user, or None (anonymous or no profile)."""
+    if not user.is_authenticated:
+        return None
+    if not hasattr(user, '_role'):
+        from .models import UserProfile
+        user._role = UserProfile.objects.filter(user_id=user.pk).values_list('role', flat=True).first()
+    return user._role
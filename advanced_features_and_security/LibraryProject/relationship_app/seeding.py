@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta, timezone
+
+from learnlab.seeding import chunk_random
+
+from bookshelf.models import BookSearchTermManager
+
+# Synthetic data for load tests (see the seed_data command and
+# learnlab.seeding). Books refer to their author, holdings to their library
+# and book, search terms to their catalogue book and profiles to their user,
+# by index in the run. The search terms come from
+# BookSearchTermManager.term_weights().
+
+FIRST_NAMES = ['Ada', 'Alan', 'Grace', 'Linus', 'Margaret', 'Dennis', 'Barbara', 'Ken', 'Frances', 'Edsger']
+LAST_NAMES = ['Lovelace', 'Turing', 'Hopper', 'Torvalds', 'Hamilton', 'Ritchie', 'Liskov', 'Thompson']
+TITLE_WORDS = [
+    'silent', 'river', 'garden', 'empire', 'winter', 'shadow', 'letters', 'journey', 'glass', 'harbor',
+    'orchard', 'machine', 'lantern', 'island', 'memory', 'summer', 'kingdom', 'signal', 'archive', 'storm',
+]
+ROLES = [('Member', 90), ('Librarian', 9), ('Admin', 1)]
+EPOCH = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+
+def person_name(index):
+    return f'{FIRST_NAMES[index % len(FIRST_NAMES)]} {LAST_NAMES[index // len(FIRST_NAMES) % len(LAST_NAMES)]} {index}'
+
+
+def book_title(rng, index):
+    return f'The {rng.choice(TITLE_WORDS).title()} {rng.choice(TITLE_WORDS).title()} {index}'
+
+
+def library_chunk(spec):
+    """
+    relationship_app books and their holdings, plus bookshelf books and their
+    search terms, for books [start, start + count).
+    """
+    rng = chunk_random(spec['seed'], 'books', spec['start'])
+    books, holdings, shelf_books, terms = [], [], [], []
+    for index in range(spec['start'], spec['start'] + spec['count']):
+        title = book_title(rng, index)
+        books.append((title, rng.randrange(spec['authors'])))
+        library = rng.randrange(spec['libraries'])
+        holdings.append((library, index))
+        # A third of the books are held by a second library.
+        if spec['libraries'] > 1 and rng.random() < 1 / 3:
+            other = (library + 1 + rng.randrange(spec['libraries'] - 1)) % spec['libraries']
+            holdings.append((other, index))
+
+        author = person_name(rng.randrange(spec['authors']))
+        shelf_books.append((title, author, 1800 + rng.randrange(225)))
+        weights = BookSearchTermManager.term_weights(title, author)
+        terms.extend((term, index, weight) for term, weight in weights.items())
+    return {'book': books, 'holding': holdings, 'shelf_book': shelf_books, 'search_term': terms}
+
+
+def user_chunk(spec):
+    """Users [start, start + count) with unusable passwords, and their profiles."""
+    rng = chunk_random(spec['seed'], 'users', spec['start'])
+    users, profiles = [], []
+    names, weights = zip(*ROLES)
+    for index in range(spec['start'], spec['start'] + spec['count']):
+        number = spec['name_offset'] + index
+        first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        joined = EPOCH + timedelta(minutes=rng.randrange(3 * 365 * 24 * 60))
+        # Same format as make_password(None): '!' and 40 random characters.
+        password = '!%040x' % rng.getrandbits(160)
+        users.append((
+            password, False, first_name, last_name, False, True, joined,
+            f'user{number}@example.com', '',
+        ))
+        profiles.append((index, rng.choices(names, weights)[0]))
+    return {'user': users, 'profile': profiles}
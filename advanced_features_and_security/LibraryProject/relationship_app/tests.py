@@ -1,3 +1,235 @@
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.urls import reverse
+
+from bookshelf.models import Book as ShelfBook, BookSearchTerm
+
+from .models import Author, Book, Library, LibraryHolding, UserProfile
+from .pagination import HoldingKeysetPaginator
+from .roles import get_user_role
+
+
+class UserRoleTest(TestCase):
+    """Tests for the per-request role lookups behind the role-gated views."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email='admin@example.com', password='password123', first_name='Ada', last_name='Admin'
+        )
+        self.user.userprofile.role = UserProfile.ADMIN
+        self.user.userprofile.save()
+        self.client.force_login(self.user)
+        self.url = reverse('relationship_app:admin-dashboard')
+
+    def test_role_gated_page_reads_the_role_once(self):
+        """The view gate and the template share one role query: session, user, role."""
+        with self.assertNumQueries(3):
+            self.assertEqual(self.client.get(self.url, secure=True).status_code, 200)
+
+    def test_role_change_applies_to_the_next_request(self):
+        """A demotion takes effect on the next request, even when written with update()."""
+        self.client.get(self.url, secure=True)
+        UserProfile.objects.filter(user=self.user).update(role=UserProfile.MEMBER)
+        self.assertEqual(self.client.get(self.url, secure=True).status_code, 302)
+        self.assertEqual(self.client.get(reverse('relationship_app:member-page'), secure=True).status_code, 200)
+
+    def test_role_is_memoized_per_request(self):
+        """Repeated checks on the same user object do not hit the database again."""
+        user = get_user_model().objects.get(pk=self.user.pk)
+        self.assertEqual(get_user_role(user), UserProfile.ADMIN)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_user_role(user), UserProfile.ADMIN)
+
+    def test_users_without_profile_have_no_role(self):
+        """A missing profile means no role."""
+        UserProfile.objects.filter(user=self.user).delete()
+        user = get_user_model().objects.get(pk=self.user.pk)
+        self.assertIsNone(get_user_role(user))
+        self.assertEqual(self.client.get(self.url, secure=True).status_code, 302)
+
+
+class UserProfileLifecycleTest(TestCase):
+    """Tests for profile creation on single saves, logins and bulk imports."""
+
+    def test_new_user_gets_profile(self):
+        user = get_user_model().objects.create_user(email='new@example.com', password='password123')
+        self.assertEqual(UserProfile.objects.get(user=user).role, UserProfile.MEMBER)
+        self.assertEqual(str(UserProfile.objects.get(user=user)), 'new@example.com (Member)')
+
+    def test_update_fields_save_leaves_profile_alone(self):
+        """Login only writes last_login: one UPDATE, no profile SELECT/UPDATE."""
+        user = get_user_model().objects.create_user(email='login@example.com', password='password123')
+        user = get_user_model().objects.get(pk=user.pk)
+        with self.assertNumQueries(1):
+            user.save(update_fields=['last_login'])
+
+    def test_create_missing_profiles_in_bulk(self):
+        User = get_user_model()
+        User.objects.bulk_create(User(email=f'bulk{i}@example.com') for i in range(5))
+        self.assertEqual(get_user_role(User.objects.get(email='bulk0@example.com')), None)
+        self.assertEqual(UserProfile.objects.create_missing(role=UserProfile.LIBRARIAN), 5)
+        self.assertEqual(UserProfile.objects.filter(role=UserProfile.LIBRARIAN).count(), 5)
+        self.assertEqual(get_user_role(User.objects.get(email='bulk0@example.com')), UserProfile.LIBRARIAN)
+        self.assertEqual(UserProfile.objects.create_missing(), 0)
+
+    def write_csv(self, rows):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as csv_file:
+            csv_file.write('\n'.join(rows))
+        self.addCleanup(os.remove, csv_file.name)
+        return csv_file.name
+
+    def test_import_users_command(self):
+        get_user_model().objects.create_user(email='existing@example.com', password='password123')
+        path = self.write_csv([
+            'email,first_name,last_name,role',
+            'existing@example.com,Ex,Isting,Admin',
+            'ada@example.com,Ada,Lovelace,Librarian',
+            'bob@example.com,Bob,Smith,',
+            'ada@example.com,Ada,Again,Admin',
+        ])
+
+        with self.assertNumQueries(5):  # existing emails, savepoint, users, profiles, release
+            call_command('import_users', path, stdout=StringIO())
+
+        User = get_user_model()
+        self.assertEqual(User.objects.count(), 3)
+        self.assertEqual(User.objects.get(email='ada@example.com').userprofile.role, UserProfile.LIBRARIAN)
+        self.assertEqual(User.objects.get(email='bob@example.com').userprofile.role, UserProfile.MEMBER)
+        self.assertFalse(User.objects.get(email='bob@example.com').has_usable_password())
+        self.assertEqual(User.objects.get(email='existing@example.com').userprofile.role, UserProfile.MEMBER)
+
+    def test_import_users_without_returned_primary_keys(self):
+        """Backends whose bulk INSERT returns no ids get the new users' ids read back by email."""
+        path = self.write_csv(['email,role', 'ada@example.com,Librarian', 'bob@example.com,Admin'])
+        with mock.patch.object(type(connection.features), 'can_return_rows_from_bulk_insert', False):
+            call_command('import_users', path, stdout=StringIO())
+        roles = dict(UserProfile.objects.values_list('user__email', 'role'))
+        self.assertEqual(roles, {'ada@example.com': UserProfile.LIBRARIAN, 'bob@example.com': UserProfile.ADMIN})
+
+
+class LibraryHoldingTest(TestCase):
+    """Tests for the bulk membership operations and the holdings lookup."""
+
+    def setUp(self):
+        author = Author.objects.create(name='Jane Austen')
+        self.books = Book.objects.bulk_create(Book(title=f'Book {i}', author=author) for i in range(10))
+        self.libraries = Library.objects.bulk_create(Library(name=f'Library {i}') for i in range(3))
+
+    def pairs(self, libraries, books):
+        return [(library.pk, book.pk) for library in libraries for book in books]
+
+    def test_add_holdings_in_chunks_skips_existing(self):
+        self.libraries[0].books.add(self.books[0])
+        with self.assertNumQueries(6):  # savepoint, 4 chunked inserts, release
+            LibraryHolding.objects.add_holdings(self.pairs(self.libraries[:2], self.books), batch_size=5)
+        self.assertEqual(LibraryHolding.objects.count(), 20)
+        self.assertEqual(self.libraries[1].books.count(), 10)
+
+    def test_remove_holdings(self):
+        LibraryHolding.objects.add_holdings(self.pairs(self.libraries, self.books))
+        removed = LibraryHolding.objects.remove_holdings(self.pairs(self.libraries[:2], self.books[:4]), batch_size=3)
+        self.assertEqual(removed, 8)
+        self.assertEqual(LibraryHolding.objects.count(), 22)
+        self.assertFalse(self.books[0].libraries.filter(pk=self.libraries[0].pk).exists())
+
+    def test_holdings_maps_in_one_query(self):
+        LibraryHolding.objects.add_holdings(self.pairs(self.libraries[:2], self.books[:3]))
+        LibraryHolding.objects.add_holdings(self.pairs(self.libraries[2:], self.books[2:4]))
+        book_ids = [book.pk for book in self.books[2:5]]
+        with self.assertNumQueries(1):
+            holdings = LibraryHolding.objects.holdings(book_ids=book_ids)
+        library_ids = [library.pk for library in self.libraries]
+        self.assertEqual(holdings.by_book, {self.books[2].pk: library_ids, self.books[3].pk: library_ids[2:]})
+        self.assertEqual(holdings.by_library[library_ids[2]], [self.books[2].pk, self.books[3].pk])
+        self.assertEqual(LibraryHolding.objects.holdings(library_ids=library_ids[:1]).by_library,
+                         {library_ids[0]: [book.pk for book in self.books[:3]]})
+
+
+class LibraryDetailPaginationTest(TestCase):
+    """Tests for the keyset-paginated library page and the streaming export."""
+
+    def setUp(self):
+        author = Author.objects.create(name='Jane Austen')
+        self.books = Book.objects.bulk_create(Book(title=f'Book {i}', author=author) for i in range(120))
+        self.library = Library.objects.create(name='Central')
+        LibraryHolding.objects.add_holdings((self.library.pk, book.pk) for book in self.books)
+        self.url = reverse('relationship_app:library-detail', args=[self.library.pk])
+
+    def test_pages_follow_the_cursor(self):
+        response = self.client.get(self.url, secure=True)
+        self.assertEqual(response.context['books'], self.books[:50])
+        cursor = response.context['next_cursor']
+        self.assertEqual(cursor, str(self.books[49].pk))
+        response = self.client.get(self.url, {'after': self.books[99].pk}, secure=True)
+        self.assertEqual(response.context['books'], self.books[100:])
+        self.assertIsNone(response.context['next_cursor'])
+
+    def test_page_costs_two_queries(self):
+        with self.assertNumQueries(2):  # library, one page of holdings with books and authors
+            self.client.get(self.url, {'after': self.books[10].pk}, secure=True)
+
+    def test_empty_library(self):
+        empty = Library.objects.create(name='Empty')
+        response = self.client.get(reverse('relationship_app:library-detail', args=[empty.pk]), secure=True)
+        self.assertContains(response, 'no books in its catalog')
+
+    def test_bad_cursor_is_404(self):
+        self.assertEqual(self.client.get(self.url, {'after': 'x'}, secure=True).status_code, 404)
+
+    def test_export_streams_every_holding_in_chunks(self):
+        response = self.client.get(reverse('relationship_app:library-export', args=[self.library.pk]), secure=True)
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], 'book_id,title,author')
+        self.assertEqual(len(lines), 121)
+        self.assertEqual(lines[-1], f'{self.books[-1].pk},Book 119,Jane Austen')
+
+    def test_iterate_walks_keyset_chunks(self):
+        paginator = HoldingKeysetPaginator()
+        with self.assertNumQueries(3):
+            book_ids = [holding.book_id for holding in paginator.iterate(self.library.holdings.all(), chunk_size=50)]
+        self.assertEqual(book_ids, [book.pk for book in self.books])
+
+
+class SeedDataCommandTest(TestCase):
+    """Tests for the bulk synthetic data generator."""
+
+    def seed(self, **options):
+        call_command('seed_data', books=60, users=10, chunk_size=25, stdout=StringIO(), **options)
+
+    def test_seeded_rows_are_consistent(self):
+        self.seed()
+        self.assertEqual((Book.objects.count(), Author.objects.count(), Library.objects.count()), (60, 3, 2))
+        self.assertEqual(Library.objects.filter(librarian__isnull=False).count(), 2)
+        self.assertFalse(Book.objects.filter(holdings__isnull=True).exists())
+        shelf_book = ShelfBook.objects.order_by('pk').first()
+        self.assertIn(shelf_book, BookSearchTerm.objects.search(shelf_book.author))
+        User = get_user_model()
+        self.assertEqual(UserProfile.objects.filter(user__in=User.objects.all()).count(), 10)
+        self.assertFalse(User.objects.first().has_usable_password())
+        # The seeded books took consecutive keys from the database.
+        self.assertEqual(Book.objects.create(title='New', author=Author.objects.first()).pk, 61)
+
+    def test_same_seed_same_data(self):
+        """The rows depend on the seed only, not on the number of worker processes."""
+        def snapshot():
+            # Holdings relative to the first book and library of the run.
+            holdings = list(LibraryHolding.objects.values_list('book_id', 'library_id'))
+            first_book, first_library = min(book for book, _ in holdings), min(library for _, library in holdings)
+            titles = list(Book.objects.order_by('pk').values_list('title', flat=True))
+            return titles, sorted((book - first_book, library - first_library) for book, library in holdings)
 
-# Create your tests here.
+        self.seed(seed=3)
+        first = snapshot()
+        Book.objects.all().delete()
+        self.seed(seed=3, workers=2)
+        self.assertEqual(snapshot(), first)
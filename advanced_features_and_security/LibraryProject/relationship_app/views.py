@@ -1,4 +1,6 @@
+import csv
 
+from django.http import StreamingHttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.views.generic.detail import DetailView
 from django.urls import reverse_lazy
@@ -8,12 +10,15 @@ from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth import login
 from django.forms import modelform_factory
 from .models import Library,Book, UserProfile, Author 
+from .pagination import HoldingKeysetPaginator
+from .roles import get_user_role
+from bookshelf.permissions import perms_for
 
 
 def list_books(request):
     
     all_books = Book.objects.all().select_related('author')
-    context = {'books': all_books}
+    context = {'books': all_books, 'book_perms': perms_for(request.user, Book)}
     return render(request, 'relationship_app/list_books.html', context)
 
 class LibraryDetailView(DetailView):
@@ -21,8 +26,43 @@ class LibraryDetailView(DetailView):
     model = Library
     template_name = 'relationship_app/library_detail.html'
     context_object_name = 'library' 
-    def get_queryset(self):
-        return Library.objects.all().prefetch_related('books__author')
+    paginator_class = HoldingKeysetPaginator
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        # One keyset page of the catalogue (?after=<book id>) instead of every
+        # holding; the page itself tells whether the library holds any book.
+        holdings = self.object.holdings.select_related('book__author')
+        page, next_cursor = self.paginator_class().paginate(holdings, self.request.GET.get('after'))
+        context['books'] = [holding.book for holding in page]
+        context['next_cursor'] = next_cursor
+        context['is_first_page'] = not self.request.GET.get('after')
+        return context
+
+
+class Echo:
+    """File-like object for csv.writer that hands each written row back."""
+
+    def write(self, value):
+        return value
+
+
+def library_export(request, pk):
+    """Stream a library's full catalogue as CSV, in constant memory."""
+    library = get_object_or_404(Library, pk=pk)
+    holdings = library.holdings.values_list('book_id', 'book__title', 'book__author__name', named=True)
+    buffer = Echo()
+    writer = csv.writer(buffer)
+
+    def rows():
+        yield writer.writerow(['book_id', 'title', 'author'])
+        for holding in HoldingKeysetPaginator().iterate(holdings):
+            yield writer.writerow(holding)
+
+    response = StreamingHttpResponse(rows(), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="library-{library.pk}.csv"'
+    return response
+
 
 def register_view(request):
     
@@ -37,14 +77,16 @@ def register_view(request):
     return render(request, 'relationship_app/register.html', {'form': form})
 
 
+# Roles come from roles.py, not from user.userprofile: one role query per
+# request, shared by every check and by request.role in the templates.
 def is_admin(user):
-    return user.is_authenticated and hasattr(user, 'userprofile') and user.userprofile.role == UserProfile.ADMIN
+    return get_user_role(user) == UserProfile.ADMIN
 
 def is_librarian(user):
-    return user.is_authenticated and hasattr(user, 'userprofile') and user.userprofile.role == UserProfile.LIBRARIAN
+    return get_user_role(user) == UserProfile.LIBRARIAN
 
 def is_member(user):
-    return user.is_authenticated and hasattr(user, 'userprofile') and user.userprofile.role == UserProfile.MEMBER
+    return get_user_role(user) == UserProfile.MEMBER
 
 
 
@@ -0,0 +1,219 @@
+import os
+import sys
+import time
+import asyncio
+import argparse
+from io import BytesIO
+from statistics import median, quantiles
+from concurrent.futures import ThreadPoolExecutor
+from urllib.request import urlopen
+
+import django
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'django_blog.settings')
+django.setup()
+
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import override_settings
+from learnlab.benchmarks import use_database
+from taggit.models import Tag, TaggedItem
+
+from blog.models import Comment, Post
+
+# Load test: sync views under WSGI vs async views under ASGI.
+# Usage: python blog/benchmark_async.py [--posts N] [--requests N] [--concurrency C] [--cache] [--database PATH]
+#        python blog/benchmark_async.py --wsgi-url http://127.0.0.1:8000 --asgi-url http://127.0.0.1:8001
+# Fires the same mix of list/detail/tag/search requests at both deployments with
+# C requests in flight. Without URLs both applications (django_blog.wsgi /
+# django_blog.asgi) are driven in-process, without sockets: WSGI from a pool of C
+# threads, ASGI from C tasks on one event loop, against a fresh, migrated
+# temporary database seeded with --posts posts (or --database, topped up to
+# --posts); the configured database is never written to. With URLs, already
+# running servers are measured over HTTP as they are, e.g.
+# `gunicorn django_blog.wsgi --threads 8` and `uvicorn django_blog.asgi:application`
+# after `manage.py seed_blog`; the post pages requested are read from the
+# configured database, which the servers serve.
+# The response cache is disabled unless --cache is passed, so every request renders.
+
+WORDS = ['django', 'python', 'async', 'cache', 'index', 'query', 'template', 'signal']
+HOST = 'localhost'
+
+
+def seed(total_posts):
+    """Top the blog up to total_posts posts with tags and comments (bulk, then rebuild derived tables)."""
+    existing = Post.objects.count()
+    if existing >= total_posts:
+        return
+    print(f"--- Seeding {total_posts - existing} posts ---")
+    with transaction.atomic():
+        authors = [User.objects.get_or_create(username=f'bench{i}')[0] for i in range(20)]
+        tags = [Tag.objects.get_or_create(name=word, slug=word)[0] for word in WORDS]
+        posts = Post.objects.bulk_create(
+            Post(
+                title=f'{WORDS[i % 8].title()} notes {i}',
+                content=' '.join(WORDS[(i + j) % 8] for j in range(200)),
+                author=authors[i % len(authors)],
+            )
+            for i in range(existing, total_posts)
+        )
+        post_type = ContentType.objects.get_for_model(Post)
+        TaggedItem.objects.bulk_create(
+            TaggedItem(content_type=post_type, object_id=post.pk, tag=tags[(post.pk + k) % len(tags)])
+            for post in posts for k in range(2)
+        )
+        Comment.objects.bulk_create(
+            Comment(post=post, author=authors[(post.pk + k) % len(authors)], content=f'Comment {k}')
+            for post in posts for k in range(post.pk % 30)
+        )
+    call_command('rebuild_search_index')
+    call_command('rebuild_tag_stats')
+    call_command('reconcile_comment_counts')
+    call_command('backfill_post_excerpts')
+
+
+def request_paths(count):
+    post_ids = list(Post.objects.order_by('-pk').values_list('pk', flat=True)[:50])
+    pages = [('/', ''), ('/search/', 'q=async')]
+    pages += [(f'/post/{pk}/', '') for pk in post_ids]
+    pages += [(f'/tags/{word}/', '') for word in WORDS]
+    return [pages[i % len(pages)] for i in range(count)]
+
+
+# --- In-process drivers ---------------------------------------------------
+
+def wsgi_get(application, path, query):
+    environ = {
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': query, 'SCRIPT_NAME': '',
+        'SERVER_NAME': HOST, 'SERVER_PORT': '80', 'HTTP_HOST': HOST, 'SERVER_PROTOCOL': 'HTTP/1.1',
+        'wsgi.input': BytesIO(), 'wsgi.errors': sys.stderr, 'wsgi.url_scheme': 'http',
+        'wsgi.version': (1, 0), 'wsgi.multithread': True, 'wsgi.multiprocess': False, 'wsgi.run_once': False,
+    }
+    status = []
+    body = b''.join(application(environ, lambda line, headers, exc_info=None: status.append(line)))
+    return int(status[0].split()[0]), len(body)
+
+
+async def asgi_get(application, path, query):
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+        'path': path, 'raw_path': path.encode(), 'query_string': query.encode(), 'root_path': '',
+        'headers': [(b'host', HOST.encode())], 'client': ('127.0.0.1', 0), 'server': (HOST, 80),
+    }
+    done = asyncio.Event()
+    messages = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        await done.wait()
+        return {'type': 'http.disconnect'}
+
+    status, size = None, 0
+
+    async def send(message):
+        nonlocal status, size
+        if message['type'] == 'http.response.start':
+            status = message['status']
+        elif message['type'] == 'http.response.body':
+            size += len(message.get('body', b''))
+            if not message.get('more_body'):
+                done.set()
+
+    await application(scope, receive, send)
+    return status, size
+
+
+def http_get(base_url, path, query):
+    with urlopen(base_url.rstrip('/') + path + ('?' + query if query else '')) as response:
+        return response.status, len(response.read())
+
+
+def timed_call(func, *args):
+    started = time.perf_counter()
+    status, _ = func(*args)
+    return status, (time.perf_counter() - started) * 1000
+
+
+async def atimed_call(func, *args):
+    started = time.perf_counter()
+    status, _ = await func(*args)
+    return status, (time.perf_counter() - started) * 1000
+
+
+def run_threads(func, target, paths, concurrency):
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(lambda page: timed_call(func, target, *page), paths))
+
+
+async def run_tasks(application, paths, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(page):
+        async with semaphore:
+            return await atimed_call(asgi_get, application, *page)
+
+    return await asyncio.gather(*(one(page) for page in paths))
+
+
+def report(label, results, elapsed):
+    latencies = [latency for _, latency in results]
+    errors = sum(1 for status, _ in results if status != 200)
+    p95 = quantiles(latencies, n=20)[-1] if len(latencies) > 1 else latencies[0]
+    print(
+        f"- {label}: {len(results) / elapsed:8.1f} req/s | p50 {median(latencies):7.2f} ms"
+        f" | p95 {p95:7.2f} ms | errors {errors}"
+    )
+
+
+def run_benchmark(options):
+    paths = request_paths(options.requests)
+    print(f"### {Post.objects.count()} posts, {len(paths)} requests, concurrency {options.concurrency}")
+
+    if options.wsgi_url or options.asgi_url:
+        for label, url in (('WSGI (sync views)', options.wsgi_url), ('ASGI (async views)', options.asgi_url)):
+            if url:
+                started = time.perf_counter()
+                results = run_threads(http_get, url, paths, options.concurrency)
+                report(f'{label} {url}', results, time.perf_counter() - started)
+        return
+
+    from django.core.wsgi import get_wsgi_application
+    from django_blog.asgi import application as asgi_application
+
+    wsgi_application = get_wsgi_application()
+    connection.close()  # each worker thread opens its own connection
+
+    started = time.perf_counter()
+    results = run_threads(wsgi_get, wsgi_application, paths, options.concurrency)
+    report('WSGI (sync views, threads) ', results, time.perf_counter() - started)
+
+    started = time.perf_counter()
+    # The settings are django_blog.settings here; route as django_blog.asgi_settings does.
+    with override_settings(ROOT_URLCONF='django_blog.asgi_urls'):
+        results = asyncio.run(run_tasks(asgi_application, paths, options.concurrency))
+    report('ASGI (async views, 1 loop)', results, time.perf_counter() - started)
+    print("-" * 30)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='WSGI vs ASGI throughput of the read-only blog pages.')
+    parser.add_argument('--posts', type=int, default=500)
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--cache', action='store_true', help='Keep the response cache enabled.')
+    parser.add_argument('--wsgi-url')
+    parser.add_argument('--asgi-url')
+    parser.add_argument('--database', help='SQLite file to seed and serve in-process (default: a new temporary one).')
+    options = parser.parse_args()
+
+    if not (options.wsgi_url or options.asgi_url):
+        use_database('benchmark_async.sqlite3', options.database)
+        seed(options.posts)
+    print(f"Database: {connection.settings_dict['NAME']}")
+    if not options.cache:
+        override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}).enable()
+    run_benchmark(options)
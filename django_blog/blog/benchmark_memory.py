@@ -0,0 +1,118 @@
+import os
+import sys
+import json
+import resource
+import subprocess
+import tracemalloc
+
+import django
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'django_blog.settings')
+django.setup()
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from learnlab.benchmarks import use_database
+
+from blog.models import Post, PostQuerySet
+
+# Benchmark: peak memory of one listing request, full rows vs declared listing columns.
+# Usage: [BENCHMARK_DATABASE=path] python blog/benchmark_memory.py [total_posts] [body_kb]
+# Seeds a fresh, migrated temporary database (or tops up BENCHMARK_DATABASE, to
+# reuse the posts of an earlier run) with total_posts posts of body_kb KB each;
+# the configured database is never touched. Then requests every listing page
+# (all posts on one page) in a fresh child process per mode, reporting the peak
+# RSS growth and the peak Python allocation (tracemalloc) of that single request.
+#   full     - the listing querysets before per-view column declarations
+#              (every Post column, including the body)
+#   listing  - the views' listing_fields via PostQuerySet.for_listing()
+
+TOTAL_POSTS = int(sys.argv[1]) if len(sys.argv) > 1 and sys.argv[1] != '--measure' else 1000
+BODY_KB = int(sys.argv[2]) if len(sys.argv) > 2 and sys.argv[1] != '--measure' else 100
+BATCH_SIZE = 200
+PAGES = [('post_list', '/'), ('posts_by_tag', '/tags/benchmark/'), ('post_search', '/search/?q=benchmark')]
+
+
+def seed_posts():
+    """Top the blog up to TOTAL_POSTS posts with BODY_KB KB bodies, tagged 'benchmark'."""
+    existing = Post.objects.count()
+    if existing >= TOTAL_POSTS:
+        return
+    print(f"--- Seeding {TOTAL_POSTS - existing} posts of {BODY_KB} KB ---")
+    author, _ = User.objects.get_or_create(username='benchmark')
+    body = ('benchmark body text ' * (BODY_KB * 1024 // 20))[:BODY_KB * 1024]
+    with transaction.atomic():
+        for start in range(existing, TOTAL_POSTS, BATCH_SIZE):
+            # save() (not bulk_create) so excerpts, tags and the search index are maintained.
+            for i in range(start, min(start + BATCH_SIZE, TOTAL_POSTS)):
+                post = Post.objects.create(title=f'Benchmark post {i}', content=body, author=author)
+                post.tags.add('benchmark')
+    call_command('rebuild_tag_stats')
+
+
+def full_rows_listing(self, fields=None, tags=False):
+    """The listing queryset before per-view column declarations."""
+    return self.select_related('author').prefetch_related('tags')
+
+
+def measure(mode, path, metric):
+    """
+    Runs in a child process: one warm-up request, then the measured one.
+    RSS and tracemalloc are measured in separate processes, as tracing
+    changes how the allocator reuses memory.
+    """
+    if mode == 'full':
+        PostQuerySet.for_listing = full_rows_listing
+    client = Client(HTTP_HOST='localhost')
+    with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}):
+        client.get('/tags/missing/')  # warm up imports, URLconf and templates
+        if metric == 'rss':
+            baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            response = client.get(path)
+            # ru_maxrss is in KB on Linux.
+            result = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+        else:
+            tracemalloc.start()
+            response = client.get(path)
+            result = tracemalloc.get_traced_memory()[1] // 1024
+            tracemalloc.stop()
+    assert response.status_code == 200, response.status_code
+    print(json.dumps({'kb': result, 'bytes': len(response.content)}))
+
+
+def run_child(mode, path, metric):
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--measure', mode, path, metric],
+        check=True, capture_output=True, text=True, env=os.environ,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run_benchmark():
+    cache.clear()
+    print(f"### {Post.objects.count()} posts per page, {BODY_KB} KB bodies")
+    for name, path in PAGES:
+        for mode in ('full', 'listing'):
+            rss = run_child(mode, path, 'rss')
+            traced = run_child(mode, path, 'tracemalloc')
+            print(
+                f"- {name:13} {mode:8}: peak RSS +{rss['kb'] / 1024:8.1f} MB"
+                f" | peak Python allocations {traced['kb'] / 1024:8.1f} MB"
+                f" | response {rss['bytes'] / 1024:7.1f} KB"
+            )
+    print("-" * 30)
+
+
+if __name__ == '__main__':
+    # Set for the child processes, which measure the database seeded here.
+    os.environ['BENCHMARK_DATABASE'] = use_database('benchmark_memory.sqlite3', os.environ.get('BENCHMARK_DATABASE'))
+    if sys.argv[1:2] == ['--measure']:
+        measure(sys.argv[2], sys.argv[3], sys.argv[4])
+    else:
+        print(f"Database: {connection.settings_dict['NAME']}")
+        seed_posts()
+        run_benchmark()
@@ -0,0 +1,158 @@
+import os
+import sys
+import time
+import random
+import sqlite3
+import argparse
+import tempfile
+from statistics import median, quantiles
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'django_blog.settings')
+django.setup()
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import OperationalError, close_old_connections, connections, transaction
+
+from blog.models import Comment, Post
+from learnlab.sqlite import sqlite_database
+
+# Write-contention benchmark: many processes posting comments at once.
+# Usage: python blog/benchmark_writes.py [--writers N] [--readers N] [--duration SECONDS]
+#                                        [--posts N] [--database PATH]
+# Each worker process behaves like a web worker handling requests back to back,
+# calling close_old_connections() before and after each one (what the
+# request_started/request_finished signals do). Writers load a post and create a
+# comment in a transaction (the Comment signals update the post's comment
+# statistics in the same transaction); readers load a post and its first page
+# of comments, as the detail page does. The same workload runs against:
+#   - the bare sqlite3 settings (rollback journal, a new connection per request),
+#   - sqlite_database() with CONN_MAX_AGE=0 (WAL and PRAGMAs, no connection reuse),
+#   - sqlite_database() as configured in settings.py (WAL, PRAGMAs, persistent).
+# Reported, for writers and readers: completed requests per second, "database is
+# locked" failures and p50/p99 latency. The database is a fresh, migrated temporary file
+# unless --database is given; the configured database is never touched.
+
+CONFIGURATIONS = [
+    ('rollback journal, no reuse', 'DELETE', lambda name: {
+        'ENGINE': 'django.db.backends.sqlite3', 'NAME': name, 'CONN_MAX_AGE': 0, 'OPTIONS': {},
+    }),
+    ('WAL + PRAGMAs, no reuse', 'WAL', lambda name: sqlite_database(name, conn_max_age=0)),
+    ('WAL + PRAGMAs, persistent', 'WAL', sqlite_database),
+]
+
+
+def use_database(config):
+    """Point the default connection at config (closing any open connection first)."""
+    connections['default'].close()
+    connections['default'].settings_dict.update(config)
+
+
+def seed(posts):
+    """Authors and posts for the workers to comment on; returns (post ids, user ids)."""
+    if Post.objects.count() < posts:
+        authors = [User.objects.get_or_create(username=f'writer{i}')[0] for i in range(20)]
+        Post.objects.bulk_create(
+            Post(title=f'Write benchmark {i}', content='Comment here.', author=authors[i % len(authors)])
+            for i in range(posts - Post.objects.count())
+        )
+    post_ids = list(Post.objects.values_list('pk', flat=True)[:posts])
+    user_ids = list(User.objects.filter(username__startswith='writer').values_list('pk', flat=True))
+    return post_ids, user_ids
+
+
+def set_journal_mode(name, mode):
+    """journal_mode is stored in the file, so set it with no Django connection open."""
+    db = sqlite3.connect(name)
+    db.execute(f'PRAGMA journal_mode={mode}')
+    db.close()
+
+
+def write_request(rng, post_ids, user_ids):
+    post = Post.objects.get(pk=rng.choice(post_ids))
+    with transaction.atomic():
+        Comment.objects.create(post=post, author_id=rng.choice(user_ids), content='Benchmark comment')
+
+
+def read_request(rng, post_ids, user_ids):
+    post = Post.objects.for_detail().get(pk=rng.choice(post_ids))
+    comments, _ = post.comment_page()
+    list(comments)
+
+
+def worker(config, request, post_ids, user_ids, start_at, duration, seed):
+    """Run request from start_at for duration seconds; returns (latencies in ms, failures)."""
+    use_database(config)
+    rng = random.Random(seed)
+    latencies, failures = [], 0
+    time.sleep(max(0, start_at - time.time()))
+    deadline = start_at + duration
+    while time.time() < deadline:
+        close_old_connections()
+        started = time.perf_counter()
+        try:
+            request(rng, post_ids, user_ids)
+        except OperationalError:  # "database is locked"
+            failures += 1
+        else:
+            latencies.append((time.perf_counter() - started) * 1000)
+        close_old_connections()
+    connections.close_all()
+    return latencies, failures
+
+
+def summary(kind, results, duration):
+    latencies = [latency for worker_latencies, _ in results for latency in worker_latencies]
+    failures = sum(worker_failures for _, worker_failures in results)
+    cuts = quantiles(latencies, n=100) if len(latencies) > 1 else (latencies or [0]) * 99
+    return len(latencies) / duration, (
+        f"{len(latencies) / duration:8.1f} {kind}/s (failed {failures}, p50 {median(latencies or [0]):.2f} ms,"
+        f" p99 {cuts[98]:.2f} ms)"
+    )
+
+
+def run(label, config, post_ids, user_ids, options):
+    requests = [write_request] * options.writers + [read_request] * options.readers
+    # Workers start together, once the pool is up, so pool start-up is not timed.
+    start_at = time.time() + 1
+    with ProcessPoolExecutor(max_workers=len(requests)) as pool:
+        results = list(pool.map(
+            worker, [config] * len(requests), requests, [post_ids] * len(requests), [user_ids] * len(requests),
+            [start_at] * len(requests), [options.duration] * len(requests), range(len(requests)),
+        ))
+    writes, write_line = summary('writes', results[:options.writers], options.duration)
+    line = f"- {label:27} {write_line}"
+    if options.readers:
+        line += ' | ' + summary('reads', results[options.writers:], options.duration)[1]
+    print(line)
+    return writes
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Concurrent comment writers: rollback journal vs WAL.')
+    parser.add_argument('--writers', type=int, default=16, help='Processes posting comments.')
+    parser.add_argument('--readers', type=int, default=4, help='Processes reading post pages meanwhile.')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds per configuration.')
+    parser.add_argument('--posts', type=int, default=100)
+    parser.add_argument('--database', help='SQLite file to write to (default: a fresh temporary database).')
+    options = parser.parse_args()
+
+    name = options.database or os.path.join(tempfile.mkdtemp(), 'benchmark_writes.sqlite3')
+    use_database(sqlite_database(name))
+    if not options.database:
+        call_command('migrate', verbosity=0)
+    post_ids, user_ids = seed(options.posts)
+    connections.close_all()
+
+    print(f"### {options.writers} writers, {options.readers} readers, {options.duration:g}s per configuration, database {name}")
+    throughput = {}
+    for label, journal_mode, config in CONFIGURATIONS:
+        set_journal_mode(name, journal_mode)
+        throughput[label] = run(label, config(name), post_ids, user_ids, options)
+    baseline, tuned = throughput[CONFIGURATIONS[0][0]], throughput[CONFIGURATIONS[-1][0]]
+    if baseline:
+        print(f"Tuned vs bare settings: {tuned / baseline:.1f}x writes/s")
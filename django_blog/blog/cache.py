@@ -0,0 +1,201 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.shortcuts import render
+from django.utils.http import urlencode
+
+# Full-response cache for the public blog pages, invalidated by tag.
+#
+# Every cached page records the version token of each tag it depends on
+# ('posts', 'post:<pk>', 'tag:<slug>', 'author:<pk>'). The signals in models.py
+# bump those tokens when posts, comments, tags or users change; a cached page
+# is served only while all of its recorded versions are still current, so a
+# hit costs two cache reads and no database query. The cache must be shared by
+# every worker process (see CACHES in settings.py), and versions are bumped
+# only once the write has committed, so a request rendering concurrently cannot
+# store the uncommitted state under the new version.
+TAG_VERSION_KEY = 'blog:tag:{tag}:version'
+RESPONSE_KEY = 'blog:response:{digest}'
+
+
+def _new_version():
+    # A fresh token rather than a counter, so an evicted version key can never
+    # line up again with a page stored under an older version.
+    return time.time_ns()
+
+
+def get_tag_versions(tags):
+    """Return {tag: version} for the given tags, creating missing versions."""
+    keys = {TAG_VERSION_KEY.format(tag=tag): tag for tag in tags}
+    found = cache.get_many(keys)
+    versions = {keys[key]: version for key, version in found.items()}
+    missing = {key: _new_version() for key, tag in keys.items() if tag not in versions}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update({keys[key]: version for key, version in missing.items()})
+    return versions
+
+
+async def aget_tag_versions(tags):
+    """Async version of get_tag_versions()."""
+    keys = {TAG_VERSION_KEY.format(tag=tag): tag for tag in tags}
+    found = await cache.aget_many(keys)
+    versions = {keys[key]: version for key, version in found.items()}
+    missing = {key: _new_version() for key, tag in keys.items() if tag not in versions}
+    if missing:
+        await cache.aset_many(missing, timeout=None)
+        versions.update({keys[key]: version for key, version in missing.items()})
+    return versions
+
+
+def bump_tags(*tags):
+    """Invalidate every cached page depending on any of the given tags when the current transaction commits."""
+    if tags:
+        keys = [TAG_VERSION_KEY.format(tag=tag) for tag in tags]
+        transaction.on_commit(lambda: cache.set_many(dict.fromkeys(keys, _new_version()), timeout=None))
+
+
+def response_key(request, params=()):
+    """
+    Cache key of the page at request.path with only the query parameters in
+    `params`. Others (tracking parameters, cache busters) cannot change the
+    page, so they must not split its cache entry or fill the cache.
+    """
+    query = urlencode(sorted((name, value) for name in params for value in request.GET.getlist(name)))
+    digest = hashlib.sha1(f'{request.path}?{query}'.encode('utf-8')).hexdigest()
+    return RESPONSE_KEY.format(digest=digest)
+
+
+def get_cached_response(key):
+    """Return the cached HttpResponse for key, or None if missing or stale."""
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    current = cache.get_many([TAG_VERSION_KEY.format(tag=tag) for tag in entry['versions']])
+    return _fresh_response(entry, current)
+
+
+async def aget_cached_response(key):
+    """Async version of get_cached_response()."""
+    entry = await cache.aget(key)
+    if entry is None:
+        return None
+    current = await cache.aget_many([TAG_VERSION_KEY.format(tag=tag) for tag in entry['versions']])
+    return _fresh_response(entry, current)
+
+
+def _fresh_response(entry, current):
+    versions = entry['versions']
+    if any(current.get(TAG_VERSION_KEY.format(tag=tag)) != version for tag, version in versions.items()):
+        return None
+    return HttpResponse(entry['content'], content_type=entry['content_type'], status=entry['status'])
+
+
+def _entry(response, versions):
+    return {
+        'versions': versions,
+        'content': response.content,
+        'content_type': response['Content-Type'],
+        'status': response.status_code,
+    }
+
+
+def store_response(key, response, versions, timeout):
+    cache.set(key, _entry(response, versions), timeout)
+
+
+async def astore_response(key, response, versions, timeout):
+    await cache.aset(key, _entry(response, versions), timeout)
+
+
+class CachedResponseMixin:
+    """
+    Serve anonymous GET requests of a post view from the response cache.
+
+    `cache_tags` / get_cache_tags() name the tags known from the URL alone
+    (their versions are read before rendering); get_content_cache_tags() adds
+    one 'post:<pk>' and 'author:<pk>' tag per rendered post, and an
+    'author:<pk>' tag per rendered comment. Pages are keyed on the path and
+    the `cache_query_params` the views read; nothing else from the request
+    may be rendered into a cached page.
+    """
+    cache_tags = []
+    cache_timeout = 60 * 15
+    cache_query_params = ('sort',)
+
+    def get_cache_tags(self):
+        return list(self.cache_tags)
+
+    def get_content_cache_tags(self, context):
+        posts = context['object_list'] if 'object_list' in context else [context.get('object')]
+        tags = set()
+        for post in posts:
+            if post is not None:
+                tags.update(('post:%s' % post.pk, 'author:%s' % post.author_id))
+        for comment in context.get('comments') or []:
+            tags.add('author:%s' % comment.author_id)
+        return tags
+
+    def is_cacheable(self, request):
+        # Logged-in users see their own navigation, so only anonymous pages are shared.
+        return request.method in ('GET', 'HEAD') and not request.user.is_authenticated
+
+    def get(self, request, *args, **kwargs):
+        if not self.is_cacheable(request):
+            return super().get(request, *args, **kwargs)
+
+        key = response_key(request, self.cache_query_params)
+        cached = get_cached_response(key)
+        if cached is not None:
+            return cached
+
+        # Snapshot the URL tags before querying, so a write racing with the
+        # render leaves the stored page with an already outdated version.
+        versions = get_tag_versions(self.get_cache_tags())
+        response = super().get(request, *args, **kwargs)
+
+        def store(rendered):
+            if rendered.status_code == 200:
+                versions.update(get_tag_versions(self.get_content_cache_tags(rendered.context_data)))
+                store_response(key, rendered, versions, self.cache_timeout)
+
+        response.add_post_render_callback(store)
+        return response
+
+
+class AsyncCachedResponseMixin(CachedResponseMixin):
+    """
+    Async counterpart of CachedResponseMixin for the ASGI views. The view
+    implements `async def get_page_context()`, returning the template context
+    with every row the template reads already loaded.
+    """
+    template_name = None
+
+    async def get(self, request, *args, **kwargs):
+        # Resolve the user without blocking; the auth context processor reads it later.
+        request.user = await request.auser()
+        if not self.is_cacheable(request):
+            response, _ = await self.render_page()
+            return response
+
+        key = response_key(request, self.cache_query_params)
+        cached = await aget_cached_response(key)
+        if cached is not None:
+            return cached
+
+        versions = await aget_tag_versions(self.get_cache_tags())
+        response, context = await self.render_page()
+        if response.status_code == 200:
+            versions.update(await aget_tag_versions(self.get_content_cache_tags(context)))
+            await astore_response(key, response, versions, self.cache_timeout)
+        return response
+
+    async def get_page_context(self):
+        raise NotImplementedError
+
+    async def render_page(self):
+        context = await self.get_page_context()
+        return render(self.request, self.template_name, context), context
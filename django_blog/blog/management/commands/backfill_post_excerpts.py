@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    """Recompute the stored excerpt, length and word count of every post."""
+    help = 'Backfills Post.excerpt, Post.content_length and Post.word_count from the post bodies.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Posts loaded and updated per batch.')
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        updated = 0
+        batch = []
+
+        with transaction.atomic():
+            posts = Post.objects.only('pk', 'content').order_by('pk')
+            for post in posts.iterator(chunk_size=chunk_size):
+                post.update_excerpt()
+                batch.append(post)
+                if len(batch) >= chunk_size:
+                    Post.objects.bulk_update(batch, Post.EXCERPT_FIELDS)
+                    updated += len(batch)
+                    batch = []
+            Post.objects.bulk_update(batch, Post.EXCERPT_FIELDS)
+            updated += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f'Updated excerpts of {updated} posts.'))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.models import Post, PostSearchTerm
+
+
+class Command(BaseCommand):
+    """Rebuild the post search index from scratch in bulk."""
+    help = 'Rebuilds the inverted search index used by the post search page.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Posts loaded per batch.')
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        manager = PostSearchTerm.objects
+        indexed = 0
+
+        with transaction.atomic():
+            manager.all().delete()
+            terms = []
+            # Tags are prefetched per chunk so the whole rebuild is a handful of queries per batch.
+            posts = Post.objects.prefetch_related('tags').order_by('pk')
+            for post in posts.iterator(chunk_size=chunk_size):
+                terms.extend(manager.terms_for_post(post, [tag.name for tag in post.tags.all()]))
+                if len(terms) >= manager.BATCH_SIZE:
+                    manager.bulk_create(terms, batch_size=manager.BATCH_SIZE)
+                    terms = []
+                indexed += 1
+            manager.bulk_create(terms, batch_size=manager.BATCH_SIZE)
+
+        self.stdout.write(self.style.SUCCESS(f'Indexed {indexed} posts.'))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.models import TagStat
+
+
+class Command(BaseCommand):
+    """Recompute the materialized tag statistics from scratch."""
+    help = 'Rebuilds the per-tag post counts used by the tag cloud and tag pages.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = TagStat.objects.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt statistics for {count} tags.'))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    """Fix drift in the denormalized comment statistics of posts."""
+    help = 'Recomputes Post.comment_count and Post.last_activity_at where they disagree with the comments.'
+
+    def handle(self, *args, **options):
+        fixed = Post.objects.reconcile_comment_stats()
+        self.stdout.write(self.style.SUCCESS(f'Reconciled {fixed} posts.'))
@@ -0,0 +1,104 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+from learnlab.seeding import TableWriter, chunk_specs
+from taggit.models import Tag, TaggedItem
+
+from blog import seeding
+from blog.models import Comment, Post, PostSearchTerm
+
+
+class Command(BaseCommand):
+    """
+    Add a deterministic synthetic dataset for load tests: users, posts with
+    tags and comments, and the post search index.
+
+    Rows are written with bulk_create (tagged items and search terms
+    included), one transaction per chunk, and get their primary keys from
+    the database; with --workers the chunks are generated in a process pool
+    while the main process writes them, in order, so the data is the same
+    for any number of workers. The tag statistics are rebuilt once at the
+    end.
+    """
+    help = 'Seeds users, posts, tags, comments and the search index in bulk (deterministic for a given --seed).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=100_000)
+        parser.add_argument('--users', type=int, default=1_000)
+        parser.add_argument('--tags', type=int, default=len(seeding.WORDS))
+        parser.add_argument('--comments', type=int, default=5, help='Average comments per post.')
+        parser.add_argument('--max-words', type=int, default=300, help='Longest post body, in words.')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--workers', type=int, default=0, help='Generator processes (0: generate inline).')
+        parser.add_argument('--chunk-size', type=int, default=5_000, help='Posts generated and written per chunk.')
+        parser.add_argument('--batch-size', type=int, default=1_000, help='Rows per INSERT statement.')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        names = [seeding.WORDS[i % len(seeding.WORDS)] + ('' if i < len(seeding.WORDS) else str(i))
+                 for i in range(options['tags'])]
+        Tag.objects.bulk_create((Tag(name=name, slug=name) for name in names), ignore_conflicts=True)
+        tags = list(Tag.objects.filter(name__in=names).order_by('pk').values_list('pk', 'name'))
+
+        # Only keeps the usernames of this run apart from earlier ones; the keys come from the database.
+        name_offset = (User.objects.aggregate(top=Max('pk'))['top'] or 0) + 1
+        user_specs = chunk_specs(
+            options['users'], options['chunk_size'], seed=options['seed'], name_offset=name_offset,
+        )
+        post_specs = chunk_specs(
+            options['posts'], options['chunk_size'], seed=options['seed'], users=options['users'], tags=tags,
+            comments=options['comments'], max_words=options['max_words'],
+            content_type=ContentType.objects.get_for_model(Post).pk, excerpt_words=Post.EXCERPT_WORDS,
+        )
+        users = TableWriter(User, [
+            'password', 'is_superuser', 'username', 'first_name', 'last_name', 'email',
+            'is_staff', 'is_active', 'date_joined',
+        ], keep_pks=True, batch_size=options['batch_size'])
+        posts = TableWriter(Post, [
+            'title', 'content', 'published_date', 'author', 'comment_count', 'last_activity_at',
+            'excerpt', 'content_length', 'word_count',
+        ], references={'author': users}, keep_pks=True, batch_size=options['batch_size'])
+        writers = {
+            'user': users,
+            'post': posts,
+            'tagged_item': TableWriter(
+                TaggedItem, ['content_type', 'object_id', 'tag'],
+                references={'object_id': posts}, batch_size=options['batch_size'],
+            ),
+            'comment': TableWriter(
+                Comment, ['post', 'author', 'content', 'created_at', 'updated_at'],
+                references={'post': posts, 'author': users}, batch_size=options['batch_size'],
+            ),
+            'search_term': TableWriter(
+                PostSearchTerm, ['term', 'post', 'weight'],
+                references={'post': posts}, batch_size=options['batch_size'],
+            ),
+        }
+
+        if options['workers']:
+            with ProcessPoolExecutor(max_workers=options['workers']) as pool:
+                self.write_chunks(writers, pool.map(seeding.user_chunk, user_specs))
+                self.write_chunks(writers, pool.map(seeding.post_chunk, post_specs))
+        else:
+            self.write_chunks(writers, map(seeding.user_chunk, user_specs))
+            self.write_chunks(writers, map(seeding.post_chunk, post_specs))
+        call_command('rebuild_tag_stats', stdout=self.stdout)
+
+        elapsed = time.perf_counter() - started
+        total = sum(writer.written for writer in writers.values())
+        summary = ', '.join(f'{writer.written} {name} rows' for name, writer in writers.items())
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {total} rows in {elapsed:.1f}s ({total / elapsed * 60:,.0f} rows/min): {summary}.'
+        ))
+
+    def write_chunks(self, writers, chunks):
+        for chunk in chunks:
+            with transaction.atomic():
+                for table, rows in chunk.items():
+                    writers[table].write(rows)
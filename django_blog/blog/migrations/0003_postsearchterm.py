@@ -0,0 +1,70 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:43
+
+import re
+from collections import Counter, defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Weights and tokenization of PostSearchTermManager at the time of this
+# migration; later changes are applied with the rebuild_search_index command.
+TITLE_WEIGHT, TAG_WEIGHT, CONTENT_WEIGHT = 5, 3, 1
+TERM_LENGTH = 64
+
+
+def tokenize(text):
+    return [word[:TERM_LENGTH] for word in re.findall(r'\w+', text.casefold())]
+
+
+def index_existing_posts(apps, schema_editor):
+    # Historical models lack taggit's generic relation, so the tag names are
+    # read from TaggedItem directly.
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    TaggedItem = apps.get_model('taggit', 'TaggedItem')
+    Post = apps.get_model('blog', 'Post')
+    PostSearchTerm = apps.get_model('blog', 'PostSearchTerm')
+    tag_names = defaultdict(list)
+    post_type = ContentType.objects.filter(app_label='blog', model='post').first()
+    if post_type is not None:
+        for post_id, name in TaggedItem.objects.filter(content_type=post_type).values_list('object_id', 'tag__name'):
+            tag_names[post_id].append(name)
+
+    rows = []
+    for post_id, title, content in Post.objects.values_list('pk', 'title', 'content').iterator(chunk_size=1000):
+        weights = Counter()
+        for term in tokenize(title):
+            weights[term] += TITLE_WEIGHT
+        for term in tokenize(' '.join(tag_names[post_id])):
+            weights[term] += TAG_WEIGHT
+        for term in tokenize(content):
+            weights[term] += CONTENT_WEIGHT
+        rows.extend(PostSearchTerm(post_id=post_id, term=term, weight=weight) for term, weight in weights.items())
+        if len(rows) >= 5000:
+            PostSearchTerm.objects.bulk_create(rows)
+            rows = []
+    PostSearchTerm.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0002_post_tags_comment'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostSearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64)),
+                ('weight', models.PositiveIntegerField(default=1)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='blog.post')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['term', 'post'], name='blog_postse_term_91eb1c_idx')],
+            },
+        ),
+        migrations.RunPython(index_existing_posts, migrations.RunPython.noop),
+    ]
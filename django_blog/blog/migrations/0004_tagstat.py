@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_tag_stats(apps, schema_editor):
+    # Historical models lack taggit's generic relation, so aggregate TaggedItem
+    # directly; last_used is filled in by the next rebuild_tag_stats run.
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    TaggedItem = apps.get_model('taggit', 'TaggedItem')
+    TagStat = apps.get_model('blog', 'TagStat')
+    post_type = ContentType.objects.filter(app_label='blog', model='post').first()
+    if post_type is None:
+        return
+    rows = (
+        TaggedItem.objects.filter(content_type=post_type)
+        .values('tag', 'tag__name', 'tag__slug')
+        .annotate(post_count=Count('object_id', distinct=True))
+        .order_by()
+    )
+    TagStat.objects.bulk_create(
+        [
+            TagStat(tag_id=row['tag'], name=row['tag__name'], slug=row['tag__slug'], post_count=row['post_count'])
+            for row in rows
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0003_postsearchterm'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TagStat',
+            fields=[
+                ('tag', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='taggit.tag')),
+                ('name', models.CharField(max_length=100)),
+                ('slug', models.SlugField(max_length=100, unique=True)),
+                ('post_count', models.PositiveIntegerField(default=0)),
+                ('last_used', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-post_count', 'name', 'slug'], name='blog_tagstat_cloud_idx')],
+            },
+        ),
+        migrations.RunPython(populate_tag_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:09
+
+import django.db.models.functions.comparison
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_comment_stats(apps, schema_editor):
+    # One UPDATE for all posts, as PostQuerySet.reconcile_comment_stats() does for drifted ones.
+    Comment = apps.get_model('blog', 'Comment')
+    Post = apps.get_model('blog', 'Post')
+    comments = Comment.objects.filter(post=OuterRef('pk')).order_by().values('post')
+    Post.objects.update(
+        comment_count=Coalesce(Subquery(comments.annotate(value=Count('pk')).values('value')), 0),
+        last_activity_at=Subquery(comments.annotate(value=Max('created_at')).values('value')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_comment_post_created_index'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='last_activity_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['-comment_count', '-published_date'], name='blog_post_discussed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(models.OrderBy(django.db.models.functions.comparison.Coalesce('last_activity_at', 'published_date'), descending=True), name='blog_post_activity_idx'),
+        ),
+        migrations.RunPython(backfill_comment_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:13
+
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+# Post.update_excerpt() at the time of this migration; later changes are
+# applied with the backfill_post_excerpts command.
+EXCERPT_WORDS = 30
+BATCH_SIZE = 1000
+
+
+def backfill_excerpts(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    batch = []
+    for post in Post.objects.only('pk', 'content').order_by('pk').iterator(chunk_size=BATCH_SIZE):
+        post.excerpt = Truncator(post.content).words(EXCERPT_WORDS, truncate=' …')
+        post.content_length = len(post.content)
+        post.word_count = len(post.content.split())
+        batch.append(post)
+        if len(batch) >= BATCH_SIZE:
+            Post.objects.bulk_update(batch, ['excerpt', 'content_length', 'word_count'])
+            batch = []
+    Post.objects.bulk_update(batch, ['excerpt', 'content_length', 'word_count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_post_comment_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='content_length',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_excerpts, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,72 @@
 # blog/models.py (Updated)
-from django.db import models
+import re
+from collections import Counter
+
+from django.db import models, transaction
+from django.db.models import Count, F, Max, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
 from django.contrib.auth.models import User
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.text import Truncator
 from taggit.managers import TaggableManager
+from taggit.models import Tag
+
+from .cache import bump_tags
+from .pagination import CommentKeysetPaginator
+
+def comment_stat(aggregate):
+    """Correlated subquery computing `aggregate` over the comments of the outer post."""
+    comments = Comment.objects.filter(post=OuterRef('pk')).order_by().values('post')
+    return comments.annotate(value=aggregate).values('value')
+
+
+class PostQuerySet(models.QuerySet):
+    """Loads exactly what each blog page template reads, in a fixed number of queries."""
+
+    def for_listing(self, fields=None, tags=False):
+        """
+        Posts for a listing page with their authors. `fields` is the view's
+        declaration of the Post columns (and 'author__...' columns) its
+        template reads; everything else stays in the database. Without it only
+        the full 'content' body is left out. Tags cost a query of their own and
+        are only prefetched for templates that render them (`tags=True`).
+        """
+        queryset = self.select_related('author')
+        if tags:
+            queryset = queryset.prefetch_related('tags')
+        if fields is None:
+            return queryset.defer('content')
+        return queryset.only(*fields)
+
+    def for_detail(self):
+        # Comments are not prefetched: the detail page loads them one keyset
+        # page at a time (see pagination.py and Post.comment_page()).
+        return self.for_listing(tags=True).defer(None)
+
+    def reconcile_comment_stats(self):
+        """
+        Recompute comment_count and last_activity_at from the comments table
+        for the posts that drifted, in a single UPDATE. Returns the number of
+        posts fixed.
+        """
+        count = Coalesce(Subquery(comment_stat(Count('pk'))), 0)
+        last_activity = Subquery(comment_stat(Max('created_at')))
+        in_sync = Q(comment_count=F('expected_count')) & (
+            Q(last_activity_at=F('expected_activity'))
+            | Q(last_activity_at__isnull=True, expected_activity__isnull=True)
+        )
+        drifted = (
+            self.annotate(expected_count=count, expected_activity=last_activity)
+            .exclude(in_sync)
+            .values('pk')
+        )
+        return self.model.objects.filter(pk__in=Subquery(drifted)).update(
+            comment_count=count, last_activity_at=last_activity
+        )
+
 
 class Post(models.Model):
     # ... (existing Post model content remains the same) ...
@@ -11,16 +75,80 @@ class Post(models.Model):
     published_date = models.DateTimeField(auto_now_add=True)
     author = models.ForeignKey(User, on_delete=models.CASCADE) 
     tags = TaggableManager()
+    # Denormalized from the comments, updated with F() expressions by the
+    # Comment signals below (reconcile_comment_stats fixes any drift).
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+    last_activity_at = models.DateTimeField(null=True, blank=True, editable=False)  # newest comment, if any
+    # Derived from content on save (see update_excerpt), so listings can defer the body.
+    excerpt = models.TextField(blank=True, default='', editable=False)
+    content_length = models.PositiveIntegerField(default=0, editable=False)
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = PostQuerySet.as_manager()
+
+    # Written only through UPDATE ... SET x = x + 1, never from an in-memory copy.
+    COMMENT_STAT_FIELDS = ('comment_count', 'last_activity_at')
+    EXCERPT_FIELDS = ('excerpt', 'content_length', 'word_count')
+    EXCERPT_WORDS = 30
 
     def __str__(self):
         return self.title
 
+    def update_excerpt(self):
+        """Recompute the excerpt (as |truncatewords:30 renders it), length and word count of content."""
+        self.excerpt = Truncator(self.content).words(self.EXCERPT_WORDS, truncate=' …')
+        self.content_length = len(self.content)
+        self.word_count = len(self.content.split())
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'content' in update_fields:
+            self.update_excerpt()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, *self.EXCERPT_FIELDS}
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            # Saving an edited post must not overwrite counters changed by
+            # comments written since the post was loaded.
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COMMENT_STAT_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
     def get_absolute_url(self):
         # Good practice for CBVs to redirect after creation/update
         return reverse('post_detail', kwargs={'pk': self.pk})
 
+    def comment_page(self, cursor=None, per_page=None):
+        """Return one page of comments, newest first, as (comments, next_cursor)."""
+        # Going through the related manager sets comment.post without a query.
+        comments = self.comments.select_related('author')
+        return CommentKeysetPaginator(per_page).paginate(comments, cursor)
+
+    async def acomment_page(self, cursor=None, per_page=None):
+        """Async version of comment_page()."""
+        comments = self.comments.select_related('author')
+        return await CommentKeysetPaginator(per_page).apaginate(comments, cursor)
+
     class Meta:
         ordering = ['-published_date']
+        indexes = [
+            # "Most discussed" and "recent activity" orderings of the post list.
+            models.Index(fields=['-comment_count', '-published_date'], name='blog_post_discussed_idx'),
+            models.Index(
+                Coalesce('last_activity_at', 'published_date').desc(), name='blog_post_activity_idx'
+            ),
+        ]
+
+
+class CommentQuerySet(models.QuerySet):
+    def delete(self):
+        # Bulk deletes keep the post statistics too (see comments_removed()).
+        with transaction.atomic(using=self.db):
+            post_ids = set(self.order_by().values_list('post_id', flat=True))
+            result = super().delete()
+            comments_removed(post_ids)
+        return result
 
 
 class Comment(models.Model):
@@ -37,14 +165,344 @@ class Comment(models.Model):
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    objects = CommentQuerySet.as_manager()
     
     class Meta:
         # Order comments with the newest at the top
         ordering = ['-created_at']
+        indexes = [
+            # Serves each keyset page of a post's comments as one index range scan.
+            models.Index(fields=['post', 'created_at', 'id'], name='blog_comment_post_created_idx'),
+        ]
 
     def __str__(self):
         return f'Comment by {self.author.username} on {self.post.title[:20]}...'
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get('using')):
+            result = super().delete(*args, **kwargs)
+            comments_removed([self.post_id])
+        return result
         
     def get_absolute_url(self):
         # Redirect back to the post detail page after comment creation/update/delete
-        return reverse('post_detail', kwargs={'pk': self.post.pk})
\ No newline at end of file
+        return reverse('post_detail', kwargs={'pk': self.post.pk})
+
+
+class PostSearchTermManager(models.Manager):
+    """Builds and queries the inverted search index for posts."""
+
+    # Relative weight of a term depending on where it appears in the post.
+    TITLE_WEIGHT = 5
+    TAG_WEIGHT = 3
+    CONTENT_WEIGHT = 1
+    BATCH_SIZE = 5000
+
+    @staticmethod
+    def tokenize(text):
+        """Split text into case-folded word terms (truncated to the column size)."""
+        max_length = PostSearchTerm._meta.get_field('term').max_length
+        return [word[:max_length] for word in re.findall(r'\w+', text.casefold())]
+
+    @staticmethod
+    def term_weights(title, tag_names, content):
+        """Return a Counter mapping each distinct term of a post to its weight."""
+        manager = PostSearchTermManager
+        weights = Counter()
+        for term in manager.tokenize(title):
+            weights[term] += manager.TITLE_WEIGHT
+        for term in manager.tokenize(' '.join(tag_names)):
+            weights[term] += manager.TAG_WEIGHT
+        for term in manager.tokenize(content):
+            weights[term] += manager.CONTENT_WEIGHT
+        return weights
+
+    def terms_for_post(self, post, tag_names=None):
+        """Return PostSearchTerm rows (unsaved) for a post, one per distinct term."""
+        if tag_names is None:
+            tag_names = post.tags.names()
+        weights = self.term_weights(post.title, tag_names, post.content)
+        return [self.model(post=post, term=term, weight=weight) for term, weight in weights.items()]
+
+    def index_post(self, post):
+        """Replace the indexed terms of a single post."""
+        self.filter(post=post).delete()
+        self.bulk_create(self.terms_for_post(post), batch_size=self.BATCH_SIZE)
+
+    def search(self, query):
+        """
+        Return posts containing every word of the query (as a prefix),
+        ranked by the summed weight of the matched terms.
+        """
+        words = self.tokenize(query or '')
+        if not words:
+            return Post.objects.none()
+
+        posts = Post.objects.all()
+        matched = Q()
+        for word in words:
+            # A range scan instead of LIKE 'word%' so the (term, post) index is used;
+            # chr(0x10FFFF), the highest code point, sorts after any continuation.
+            prefix = Q(term__gte=word, term__lt=word + chr(0x10FFFF))
+            posts = posts.filter(pk__in=self.filter(prefix).values('post'))
+            matched |= prefix
+
+        rank = (
+            self.filter(matched, post=OuterRef('pk'))
+            .values('post')
+            .annotate(total=Sum('weight'))
+            .values('total')
+        )
+        return posts.annotate(search_rank=Subquery(rank)).order_by('-search_rank', '-published_date')
+
+
+class PostSearchTerm(models.Model):
+    """
+    Inverted index over post titles, tags and content.
+    One row per (term, post) with the weighted number of occurrences, so a
+    search is an index range scan on 'term' instead of a LIKE over every body.
+    """
+    term = models.CharField(max_length=64)
+    post = models.ForeignKey(Post, related_name='search_terms', on_delete=models.CASCADE)
+    weight = models.PositiveIntegerField(default=1)
+
+    objects = PostSearchTermManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['term', 'post']),
+        ]
+
+    def __str__(self):
+        return f'{self.term} -> {self.post_id} ({self.weight})'
+
+
+# Keep the search index in sync with posts and their tags.
+@receiver(post_save, sender=Post)
+def index_post_on_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        PostSearchTerm.objects.index_post(instance)
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def index_post_on_tags_changed(sender, instance, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear') and isinstance(instance, Post):
+        PostSearchTerm.objects.index_post(instance)
+
+
+@receiver(post_save, sender=Tag)
+def index_posts_on_tag_rename(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        for post in Post.objects.filter(tags=instance):
+            PostSearchTerm.objects.index_post(post)
+
+
+@receiver(pre_delete, sender=Tag)
+def remember_tagged_posts(sender, instance, **kwargs):
+    instance._tagged_post_ids = list(Post.objects.filter(tags=instance).values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Tag)
+def index_posts_on_tag_delete(sender, instance, **kwargs):
+    for post in Post.objects.filter(pk__in=getattr(instance, '_tagged_post_ids', [])):
+        PostSearchTerm.objects.index_post(post)
+
+
+class TagStatManager(models.Manager):
+    """Maintains and queries the materialized per-tag statistics."""
+
+    CLOUD_SIZES = 5
+
+    def record_added(self, tag_ids, when=None):
+        """Count one more post for each tag id (tags just added to a post)."""
+        if not tag_ids:
+            return
+        known = set(self.filter(tag_id__in=tag_ids).values_list('tag_id', flat=True))
+        missing = Tag.objects.filter(pk__in=set(tag_ids) - known)
+        self.bulk_create(
+            [self.model(tag=tag, name=tag.name, slug=tag.slug) for tag in missing], ignore_conflicts=True
+        )
+        self.filter(tag_id__in=tag_ids).update(post_count=F('post_count') + 1, last_used=when or timezone.now())
+
+    def record_removed(self, tag_ids):
+        """Count one post less for each tag id (tags just removed from a post)."""
+        if tag_ids:
+            self.filter(tag_id__in=tag_ids, post_count__gt=0).update(post_count=F('post_count') - 1)
+
+    def rebuild(self):
+        """Recompute every row from scratch with a single aggregate query over the tagged posts."""
+        rows = (
+            Post.objects.filter(tags__isnull=False)
+            .values('tags', 'tags__name', 'tags__slug')
+            .annotate(post_count=Count('pk', distinct=True), last_used=Max('published_date'))
+            .order_by()
+        )
+        stats = [
+            self.model(
+                tag_id=row['tags'], name=row['tags__name'], slug=row['tags__slug'],
+                post_count=row['post_count'], last_used=row['last_used'],
+            )
+            for row in rows
+        ]
+        self.all().delete()
+        self.bulk_create(stats, batch_size=1000)
+        return len(stats)
+
+    def cloud(self, limit=50):
+        """
+        Return the most used tags ordered by name, each with a 'size' from 1
+        to CLOUD_SIZES relative to the most used one. Served from the
+        (post_count, name, slug) index without touching taggit's tables.
+        """
+        tags = list(self.filter(post_count__gt=0).order_by('-post_count', 'name').only('slug', 'name', 'post_count')[:limit])
+        if tags:
+            top = tags[0].post_count
+            for tag in tags:
+                tag.size = 1 + (self.CLOUD_SIZES - 1) * tag.post_count // top
+        return sorted(tags, key=lambda tag: tag.name.casefold())
+
+
+class TagStat(models.Model):
+    """
+    Materialized statistics of one taggit Tag: how many posts carry it and
+    when it was last applied. Updated incrementally from the tagging signals
+    below; `rebuild_tag_stats` recomputes the table from scratch (then
+    'last_used' is the publication date of the newest tagged post).
+    """
+    tag = models.OneToOneField(Tag, primary_key=True, related_name='stats', on_delete=models.CASCADE)
+    name = models.CharField(max_length=100)
+    slug = models.SlugField(max_length=100, unique=True)
+    post_count = models.PositiveIntegerField(default=0)
+    last_used = models.DateTimeField(null=True, blank=True)
+
+    objects = TagStatManager()
+
+    class Meta:
+        indexes = [
+            # Covers the tag cloud query: ORDER BY post_count DESC reading name/slug from the index.
+            models.Index(fields=['-post_count', 'name', 'slug'], name='blog_tagstat_cloud_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.name} ({self.post_count})'
+
+
+# Keep the tag statistics in sync with the tagging of posts.
+@receiver(m2m_changed, sender=Post.tags.through)
+def update_tag_stats_on_tags_changed(sender, instance, action, pk_set=None, **kwargs):
+    if not isinstance(instance, Post):
+        return
+    if action == 'post_add':
+        TagStat.objects.record_added(pk_set)
+    elif action == 'post_remove':
+        TagStat.objects.record_removed(pk_set)
+    elif action == 'pre_clear':
+        instance._cleared_tag_ids = list(instance.tags.values_list('pk', flat=True))
+    elif action == 'post_clear':
+        TagStat.objects.record_removed(getattr(instance, '_cleared_tag_ids', []))
+
+
+@receiver(pre_delete, sender=Post)
+def update_tag_stats_on_post_delete(sender, instance, **kwargs):
+    # Deleting a post drops its tagged items without any m2m_changed signal.
+    TagStat.objects.record_removed(list(instance.tags.values_list('pk', flat=True)))
+
+
+@receiver(post_save, sender=Tag)
+def update_tag_stats_on_tag_rename(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        TagStat.objects.filter(tag=instance).update(name=instance.name, slug=instance.slug)
+
+
+# Invalidate the cached post pages (see cache.py) by tag.
+def post_cache_tags(post, tag_slugs=None):
+    if tag_slugs is None:
+        tag_slugs = post.tags.values_list('slug', flat=True)
+    return ['posts', 'post:%s' % post.pk, 'author:%s' % post.author_id] + ['tag:%s' % slug for slug in tag_slugs]
+
+
+@receiver(post_save, sender=Post)
+def invalidate_post_pages_on_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_tags(*post_cache_tags(instance))
+
+
+@receiver(pre_delete, sender=Post)
+def invalidate_post_pages_on_delete(sender, instance, **kwargs):
+    # Before the delete cascades to the tagged items, so the tag slugs are still known.
+    bump_tags(*post_cache_tags(instance))
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def invalidate_post_pages_on_tags_changed(sender, instance, action, pk_set=None, **kwargs):
+    if not isinstance(instance, Post):
+        return
+    if action in ('post_add', 'post_remove'):
+        bump_tags(*post_cache_tags(instance, Tag.objects.filter(pk__in=pk_set).values_list('slug', flat=True)))
+    elif action == 'pre_clear':
+        bump_tags(*post_cache_tags(instance))
+
+
+@receiver(post_save, sender=Comment)
+def invalidate_post_page_on_comment(sender, instance, raw=False, **kwargs):
+    if not raw:
+        # 'posts' too: comment counts and activity order the post list.
+        bump_tags('posts', 'post:%s' % instance.post_id)
+
+
+# Keep Post.comment_count / last_activity_at in sync, atomically in the database.
+@receiver(post_save, sender=Comment)
+def count_comment_on_create(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        # Concurrent commits can land out of created_at order, so the activity
+        # timestamp only ever moves forward.
+        created_at = Value(instance.created_at)
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F('comment_count') + 1,
+            last_activity_at=Greatest(Coalesce('last_activity_at', created_at), created_at),
+        )
+
+
+# Deleted comments are accounted for per delete() call rather than by a
+# post_delete receiver, which would run an UPDATE per comment and keep Django
+# from fast-deleting the comments of a deleted post (whose statistics no
+# longer matter).
+def comments_removed(post_ids):
+    """Recompute the statistics of the posts that lost comments and invalidate their pages."""
+    if post_ids:
+        Post.objects.filter(pk__in=post_ids).reconcile_comment_stats()
+        bump_tags('posts', *['post:%s' % pk for pk in post_ids])
+
+
+@receiver(pre_delete, sender=User)
+def remember_commented_posts(sender, instance, **kwargs):
+    # The user's comments go with the cascade, without Comment.delete().
+    commented = Comment.objects.filter(author=instance).exclude(post__author=instance)
+    instance._commented_post_ids = set(commented.order_by().values_list('post_id', flat=True))
+
+
+@receiver(post_delete, sender=User)
+def count_comments_on_user_delete(sender, instance, **kwargs):
+    comments_removed(getattr(instance, '_commented_post_ids', ()))
+
+
+@receiver(post_save, sender=Tag)
+def invalidate_tag_pages_on_save(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        post_ids = Post.objects.filter(tags=instance).values_list('pk', flat=True)
+        bump_tags('tag:%s' % instance.slug, *['post:%s' % pk for pk in post_ids])
+
+
+@receiver(post_delete, sender=Tag)
+def invalidate_tag_pages_on_delete(sender, instance, **kwargs):
+    post_ids = getattr(instance, '_tagged_post_ids', [])
+    bump_tags('tag:%s' % instance.slug, *['post:%s' % pk for pk in post_ids])
+
+
+@receiver(post_save, sender=User)
+def invalidate_author_pages(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    # Logging in only saves last_login, which no page shows.
+    if created or raw or update_fields == {'last_login'}:
+        return
+    bump_tags('author:%s' % instance.pk)
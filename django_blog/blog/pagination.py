@@ -0,0 +1,60 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
+from django.db.models import Q
+from django.http import Http404
+
+
+class CommentKeysetPaginator:
+    """
+    Keyset (cursor) pagination for the comments of a post, newest first.
+
+    The cursor holds the (created_at, id) of the last comment on the page and
+    the next page is fetched with 'WHERE (created_at, id) < (...)', so with the
+    (post, created_at, id) index every page is an index range scan no matter
+    how deep it is, and no COUNT(*) is issued.
+    """
+    per_page = 20
+
+    def __init__(self, per_page=None):
+        if per_page is not None:
+            self.per_page = per_page
+
+    def paginate(self, queryset, cursor=None):
+        """Return (comments, next_cursor); next_cursor is None on the last page."""
+        return self.split_page(list(self.page_queryset(queryset, cursor)))
+
+    async def apaginate(self, queryset, cursor=None):
+        """Async version of paginate() for the ASGI views."""
+        return self.split_page([comment async for comment in self.page_queryset(queryset, cursor)])
+
+    def page_queryset(self, queryset, cursor):
+        queryset = queryset.order_by('-created_at', '-id')
+        if cursor:
+            created_at, pk = self.decode_cursor(cursor)
+            queryset = queryset.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk),
+                created_at__lte=created_at,
+            )
+        # Fetch one extra row to know whether another page follows.
+        return queryset[:self.per_page + 1]
+
+    def split_page(self, comments):
+        if len(comments) <= self.per_page:
+            return comments, None
+        comments = comments[:self.per_page]
+        return comments, self.encode_cursor(comments[-1])
+
+    @staticmethod
+    def encode_cursor(comment):
+        payload = json.dumps([comment.created_at.isoformat(), comment.pk])
+        return urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+    @staticmethod
+    def decode_cursor(cursor):
+        try:
+            created_at, pk = json.loads(urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+            return datetime.fromisoformat(created_at), int(pk)
+        except (TypeError, ValueError, UnicodeError):
+            raise Http404('Invalid cursor')
@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta, timezone
+
+from django.utils.text import Truncator
+from learnlab.seeding import chunk_random
+
+from .models import PostSearchTermManager
+
+# Synthetic data for load tests (see the seed_blog command and
+# learnlab.seeding). Comments, tagged items and search terms refer to their
+# post, and posts and comments to their author, by index in the run. The
+# derived Post columns (excerpt, comment statistics) are computed the way
+# Post.save() and the Comment signals compute them, and the search terms
+# come from PostSearchTermManager.term_weights().
+
+WORDS = [
+    'django', 'python', 'async', 'cache', 'index', 'query', 'template', 'signal', 'model', 'view',
+    'database', 'migration', 'request', 'response', 'middleware', 'session', 'form', 'admin', 'test', 'deploy',
+]
+FIRST_NAMES = ['ada', 'alan', 'grace', 'linus', 'margaret', 'dennis', 'barbara', 'ken', 'frances', 'edsger']
+EPOCH = datetime(2020, 1, 1, tzinfo=timezone.utc)
+THREE_YEARS = 3 * 365 * 24 * 60 * 60
+
+
+def user_chunk(spec):
+    """Users [start, start + count) with unusable passwords."""
+    rng = chunk_random(spec['seed'], 'users', spec['start'])
+    users = []
+    for index in range(spec['start'], spec['start'] + spec['count']):
+        number = spec['name_offset'] + index
+        first_name = rng.choice(FIRST_NAMES)
+        # Same format as make_password(None): '!' and 40 random characters.
+        password = '!%040x' % rng.getrandbits(160)
+        joined = EPOCH + timedelta(seconds=rng.randrange(THREE_YEARS))
+        users.append((
+            password, False, f'{first_name}{number}', first_name.title(), '',
+            f'{first_name}{number}@example.com', False, True, joined,
+        ))
+    return {'user': users}
+
+
+def post_chunk(spec):
+    """Posts [start, start + count) with their tags, comments and search terms."""
+    rng = chunk_random(spec['seed'], 'posts', spec['start'])
+    posts, tagged, comments, terms = [], [], [], []
+    for index in range(spec['start'], spec['start'] + spec['count']):
+        words = rng.choices(WORDS, k=rng.randint(20, spec['max_words']))
+        title = f'{rng.choice(WORDS).title()} {rng.choice(WORDS)} notes {index}'
+        content = ' '.join(words)
+        published = EPOCH + timedelta(seconds=rng.randrange(THREE_YEARS))
+        tags = rng.sample(spec['tags'], k=min(len(spec['tags']), rng.randint(1, 3)))
+
+        created = sorted(
+            published + timedelta(seconds=rng.randrange(30 * 24 * 60 * 60))
+            for _ in range(rng.randrange(2 * spec['comments'] + 1))
+        )
+        for created_at in created:
+            author = rng.randrange(spec['users'])
+            comments.append((index, author, f'Comment on {title}: {rng.choice(WORDS)}', created_at, created_at))
+
+        posts.append((
+            title, content, published, rng.randrange(spec['users']),
+            len(created), created[-1] if created else None,
+            Truncator(content).words(spec['excerpt_words'], truncate=' …'), len(content), len(words),
+        ))
+        tagged.extend((spec['content_type'], index, tag_pk) for tag_pk, _ in tags)
+
+        weights = PostSearchTermManager.term_weights(title, [name for _, name in tags], content)
+        terms.extend((term, index, weight) for term, weight in weights.items())
+    return {'post': posts, 'tagged_item': tagged, 'comment': comments, 'search_term': terms}
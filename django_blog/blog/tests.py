@@ -1,3 +1,650 @@
-from django.test import TestCase
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.cache import cache
+from django.db import connection
+from django.db.utils import ConnectionHandler
+from django.test import AsyncClient, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+from django.utils import timezone
+from django.utils.text import Truncator
+from taggit.models import Tag
+
+from learnlab.sqlite import sqlite_database
+
+from . import views
+from .models import Comment, Post, PostSearchTerm, TagStat
+
+
+class PostSearchIndexTest(TestCase):
+    """Tests for the inverted search index behind the post search page."""
+
+    def setUp(self):
+        self.author = User.objects.create_user(username='writer', password='password123')
+        self.django_post = Post.objects.create(
+            title='Getting started with Django', content='Models, views and templates.', author=self.author
+        )
+        self.python_post = Post.objects.create(
+            title='Python tips', content='Django is mentioned once here.', author=self.author
+        )
+        self.python_post.tags.add('Tutorial')
+
+    def test_title_matches_rank_above_content_matches(self):
+        """Posts with the word in their title rank above posts that only mention it."""
+        results = list(PostSearchTerm.objects.search('django'))
+        self.assertEqual(results, [self.django_post, self.python_post])
+
+    def test_prefix_and_case_insensitive_matching(self):
+        """Words match as case-insensitive prefixes."""
+        self.assertEqual(list(PostSearchTerm.objects.search('TEMPL')), [self.django_post])
+
+    def test_prefix_matches_astral_plane_continuations(self):
+        """A prefix also matches words continuing with characters beyond U+FFFF."""
+        post = Post.objects.create(title='Mathematical a\U0001D518', content='', author=self.author)
+        self.assertEqual(list(PostSearchTerm.objects.search('mathematical a')), [post])
+
+    def test_every_word_must_match(self):
+        """Multi-word queries only return posts containing every word."""
+        self.assertEqual(list(PostSearchTerm.objects.search('django tips')), [self.python_post])
+        self.assertEqual(list(PostSearchTerm.objects.search('')), [])
+
+    def test_index_follows_edits_and_tags(self):
+        """Editing a post, deleting a tag or deleting a post keeps the index in sync."""
+        self.django_post.title = 'Renamed'
+        self.django_post.content = 'Nothing to see.'
+        self.django_post.save()
+        self.assertEqual(list(PostSearchTerm.objects.search('templates')), [])
+
+        self.assertEqual(list(PostSearchTerm.objects.search('tutorial')), [self.python_post])
+        Tag.objects.filter(name='Tutorial').get().delete()
+        self.assertEqual(list(PostSearchTerm.objects.search('tutorial')), [])
+
+        post_id = self.python_post.pk
+        self.python_post.delete()
+        self.assertFalse(PostSearchTerm.objects.filter(post_id=post_id).exists())
+
+    def test_rebuild_command_recreates_index(self):
+        """The rebuild_search_index command repopulates an emptied index."""
+        PostSearchTerm.objects.all().delete()
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(list(PostSearchTerm.objects.search('tutorial')), [self.python_post])
+
+
+class PostResponseCacheTest(TestCase):
+    """Tests for the tag-invalidated response cache of the public post pages."""
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='writer', password='password123')
+        self.post = Post.objects.create(title='Cached post', content='Some content.', author=self.author)
+        self.post.tags.add('Django')
+        self.other = Post.objects.create(title='Other post', content='Other content.', author=self.author)
+        self.urls = [
+            reverse('post_list'),
+            reverse('post_detail', kwargs={'pk': self.post.pk}),
+            reverse('posts_by_tag', kwargs={'tag_slug': 'django'}),
+        ]
+
+    def assertCachedWithoutQueries(self, url, contains=None):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        with self.assertNumQueries(0):
+            cached = self.client.get(url)
+        self.assertEqual(cached.content, response.content)
+        if contains is not None:
+            self.assertContains(cached, contains)
+
+    def test_unchanged_pages_are_served_without_queries(self):
+        """A repeated anonymous page view does not touch the database."""
+        for url in self.urls:
+            self.assertCachedWithoutQueries(url)
+
+    def test_post_edit_invalidates_list_detail_and_tag_pages(self):
+        """Saving a post refreshes every page showing it."""
+        for url in self.urls:
+            self.client.get(url)
+        self.post.title = 'Edited title'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post.save()
+        self.assertContains(self.client.get(self.urls[0]), 'Edited title')
+        self.assertContains(self.client.get(self.urls[2]), 'Edited title')
+
+    def test_tag_changes_invalidate_tag_pages(self):
+        """Tagging a post refreshes that tag's page only."""
+        self.client.get(self.urls[2])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other.tags.add('Django')
+        self.assertContains(self.client.get(self.urls[2]), 'Other post')
+
+    def test_comment_and_author_changes_invalidate_pages(self):
+        """Comments invalidate their post's page, username changes the author's pages."""
+        self.assertCachedWithoutQueries(self.urls[1])
+        with self.captureOnCommitCallbacks(execute=True):
+            Comment.objects.create(post=self.post, author=self.author, content='Nice!')
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.urls[1])
+        self.assertGreater(len(queries), 0)
+
+        self.client.get(self.urls[0])
+        self.author.username = 'renamed'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.author.save()
+        self.assertContains(self.client.get(self.urls[0]), 'By: renamed')
+
+    def test_commenter_changes_invalidate_post_page(self):
+        """Renaming a commenter refreshes the pages showing their comments; logging in does not."""
+        reader = User.objects.create_user(username='reader', password='password123')
+        Comment.objects.create(post=self.post, author=reader, content='Nice!')
+        self.client.get(self.urls[1])
+        reader.last_login = timezone.now()
+        with self.captureOnCommitCallbacks(execute=True):
+            reader.save(update_fields=['last_login'])
+        self.assertCachedWithoutQueries(self.urls[1])
+
+        reader.username = 'critic'
+        with self.captureOnCommitCallbacks(execute=True):
+            reader.save()
+        self.assertContains(self.client.get(self.urls[1]), 'critic')
+
+    def test_unread_query_parameters_share_the_cached_page(self):
+        """Only sort is part of the cache key."""
+        self.client.get(self.urls[0], {'utm_source': 'feed'})
+        with self.assertNumQueries(0):
+            self.client.get(self.urls[0], {'utm_source': 'mail', 'ref': 'x'})
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.urls[0], {'sort': 'discussed'})
+        self.assertGreater(len(queries), 0)
+
+    def test_search_query_is_not_rendered_into_cached_pages(self):
+        """A ?q= on a cached page cannot leak into the copy served to everyone else."""
+        self.client.get(self.urls[0], {'q': 'injected'})
+        self.assertNotContains(self.client.get(self.urls[0]), 'injected')
+        self.assertContains(self.client.get(reverse('post_search'), {'q': 'injected'}), 'value="injected"')
+
+    def test_logged_in_users_bypass_cache(self):
+        """Authenticated pages are never stored or served from the shared cache."""
+        self.client.get(self.urls[0])
+        self.client.login(username='writer', password='password123')
+        self.assertContains(self.client.get(self.urls[0]), 'Create New Post')
+
+    def test_pages_are_invalidated_when_the_write_commits(self):
+        """Until a write commits, the page cached before it is still served."""
+        self.assertCachedWithoutQueries(self.urls[0], contains='Cached post')
+        with self.captureOnCommitCallbacks(execute=True):
+            Post.objects.create(title='Fresh post', content='New.', author=self.author)
+            self.assertNotContains(self.client.get(self.urls[0]), 'Fresh post')
+        self.assertContains(self.client.get(self.urls[0]), 'Fresh post')
+
+
+class PostPageQueryCountTest(TestCase):
+    """Pins the number of queries each blog page needs, independent of the number of posts."""
+
+    POSTS = 100
+
+    @classmethod
+    def setUpTestData(cls):
+        authors = [User.objects.create_user(username=f'writer{i}') for i in range(5)]
+        for i in range(cls.POSTS):
+            post = Post.objects.create(title=f'Post {i}', content='Some content.', author=authors[i % 5])
+            post.tags.add('django', f'topic{i % 10}')
+            Comment.objects.create(post=post, author=authors[(i + 1) % 5], content='A comment.')
+        cls.post = post
+
+    def setUp(self):
+        # Measure rendering, not the response cache.
+        cache.clear()
+
+    def assertPageQueries(self, num, url):
+        with self.assertNumQueries(num):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_post_list(self):
+        """Posts with their authors; post_list.html does not show tags, so they are not loaded."""
+        self.assertPageQueries(1, reverse('post_list'))
+
+    def test_post_detail(self):
+        """The post with its author, its tags, the first page of comments with their authors."""
+        self.assertPageQueries(3, reverse('post_detail', kwargs={'pk': self.post.pk}))
+
+    def test_posts_by_tag(self):
+        """The tag itself, the tagged posts with their authors, then their tags."""
+        response = self.assertPageQueries(3, reverse('posts_by_tag', kwargs={'tag_slug': 'django'}))
+        self.assertEqual(len(response.context['posts']), self.POSTS)
+
+    def test_search(self):
+        """The ranked search query, then one query for all tags."""
+        response = self.assertPageQueries(2, reverse('post_search') + '?q=post')
+        self.assertEqual(len(response.context['posts']), self.POSTS)
+
+    def test_listings_select_only_declared_columns(self):
+        """Listing pages load only their views' listing_fields (a missed field would add queries above)."""
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('post_list'))
+        select = queries[0]['sql'].split(' FROM ')[0]
+        for column in ('content', 'word_count', 'last_activity_at', 'email', 'password'):
+            self.assertNotIn(f'."{column}"', select)
+
+    def test_comment_str_uses_loaded_relations(self):
+        """A page of comments renders its authors and post without further queries."""
+        post = Post.objects.for_detail().get(pk=self.post.pk)
+        comments, _ = post.comment_page()
+        with self.assertNumQueries(0):
+            [str(comment) for comment in comments]
+
+
+class TagStatTest(TestCase):
+    """Tests for the materialized tag statistics behind the tag cloud and tag pages."""
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='writer', password='password123')
+        self.first = Post.objects.create(title='First', content='One.', author=self.author)
+        self.second = Post.objects.create(title='Second', content='Two.', author=self.author)
+        self.first.tags.add('Django', 'Python')
+        self.second.tags.add('Django')
+
+    def counts(self):
+        return dict(TagStat.objects.values_list('slug', 'post_count'))
+
+    def test_counts_follow_tagging(self):
+        """Adding, removing and clearing tags or deleting posts updates the counts."""
+        self.assertEqual(self.counts(), {'django': 2, 'python': 1})
+        self.first.tags.add('Django')  # already tagged: no change
+        self.first.tags.remove('Python')
+        self.assertEqual(self.counts(), {'django': 2, 'python': 0})
+        self.second.tags.clear()
+        self.assertEqual(self.counts(), {'django': 1, 'python': 0})
+        self.first.delete()
+        self.assertEqual(self.counts(), {'django': 0, 'python': 0})
+
+    def test_rename_and_delete_tag(self):
+        """Renaming a tag updates its row; deleting it removes the row."""
+        tag = Tag.objects.get(slug='python')
+        tag.name, tag.slug = 'Py', 'py'
+        tag.save()
+        self.assertEqual(self.counts(), {'django': 2, 'py': 1})
+        tag.delete()
+        self.assertEqual(self.counts(), {'django': 2})
+
+    def test_rebuild_matches_incremental_counts(self):
+        """The rebuild_tag_stats command recomputes the same counts in one pass."""
+        expected = self.counts()
+        TagStat.objects.all().delete()
+        call_command('rebuild_tag_stats', stdout=StringIO())
+        self.assertEqual(self.counts(), expected)
+        self.assertEqual(TagStat.objects.get(slug='python').last_used, self.first.published_date)
+
+    def test_tag_cloud(self):
+        """The cloud lists used tags by name, sized relative to the most used one."""
+        self.first.tags.remove('Python')
+        response = self.client.get(reverse('tag_cloud'))
+        self.assertEqual([(tag.name, tag.size) for tag in response.context['tags']], [('Django', 5)])
+
+    def test_tag_page_does_not_join_tag_table(self):
+        """The tag page resolves the slug via TagStat and filters posts by tag id."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('posts_by_tag', kwargs={'tag_slug': 'django'}))
+        self.assertEqual(response.context['tag'].post_count, 2)
+        self.assertEqual(len(response.context['posts']), 2)
+        post_query = queries[1]['sql']
+        self.assertNotIn('"taggit_tag"', post_query)
+        self.assertEqual(self.client.get(reverse('posts_by_tag', kwargs={'tag_slug': 'missing'})).status_code, 404)
+
+
+class CommentPaginationTest(TestCase):
+    """Tests for the keyset-paginated comments of the post detail page."""
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='writer', password='password123')
+        self.post = Post.objects.create(title='Busy post', content='Lots of comments.', author=self.author)
+        # Several comments share a timestamp so the id tiebreaker is exercised.
+        created_at = self.post.published_date
+        Comment.objects.bulk_create(
+            Comment(post=self.post, author=self.author, content=f'Comment {i}', created_at=created_at)
+            for i in range(45)
+        )
+
+    def test_pages_cover_every_comment_once(self):
+        """Walking the cursors returns every comment exactly once, newest first."""
+        seen, cursor = [], None
+        while True:
+            comments, cursor = self.post.comment_page(cursor, per_page=20)
+            seen.extend(comment.pk for comment in comments)
+            if cursor is None:
+                break
+        expected = list(self.post.comments.order_by('-created_at', '-id').values_list('pk', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_detail_shows_first_page_and_fragment_loads_more(self):
+        """The detail page renders one page; the JSON endpoint returns the following ones."""
+        response = self.client.get(reverse('post_detail', kwargs={'pk': self.post.pk}))
+        self.assertEqual(len(response.context['comments']), 20)
+        next_url = response.context['comments_next_url']
+
+        pages = []
+        while next_url:
+            page = self.client.get(next_url).json()
+            pages.append(page['count'])
+            next_url = page['next']
+        self.assertEqual(pages, [20, 5])
+
+    def test_invalid_cursor(self):
+        """A malformed cursor is a 404, not a server error."""
+        url = reverse('post_comments', kwargs={'pk': self.post.pk})
+        self.assertEqual(self.client.get(url, {'cursor': 'not-a-cursor'}).status_code, 404)
+
+
+class PostCommentStatsTest(TestCase):
+    """Tests for the denormalized Post.comment_count and Post.last_activity_at."""
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='writer', password='password123')
+        self.quiet = Post.objects.create(title='Quiet post', content='Nobody comments.', author=self.author)
+        self.busy = Post.objects.create(title='Busy post', content='Everybody comments.', author=self.author)
+
+    def test_counts_follow_comment_create_and_delete(self):
+        """Creating and deleting comments updates the counter and the activity timestamp."""
+        first = Comment.objects.create(post=self.busy, author=self.author, content='One')
+        second = Comment.objects.create(post=self.busy, author=self.author, content='Two')
+        self.busy.refresh_from_db()
+        self.assertEqual(self.busy.comment_count, 2)
+        self.assertEqual(self.busy.last_activity_at, second.created_at)
+        second.delete()
+        self.busy.refresh_from_db()
+        self.assertEqual(self.busy.comment_count, 1)
+        self.assertEqual(self.busy.last_activity_at, first.created_at)
+        first.delete()
+        self.busy.refresh_from_db()
+        self.assertEqual((self.busy.comment_count, self.busy.last_activity_at), (0, None))
+
+    def test_bulk_and_cascaded_comment_deletes_update_counts(self):
+        """Queryset deletes and deleting a commenter keep the statistics of the remaining posts."""
+        reader = User.objects.create_user(username='reader', password='password123')
+        kept = Comment.objects.create(post=self.busy, author=self.author, content='Kept')
+        for content in ('One', 'Two'):
+            Comment.objects.create(post=self.busy, author=self.author, content=content)
+            Comment.objects.create(post=self.quiet, author=reader, content=content)
+        Comment.objects.filter(post=self.busy, content__in=['One', 'Two']).delete()
+        self.busy.refresh_from_db()
+        self.assertEqual((self.busy.comment_count, self.busy.last_activity_at), (1, kept.created_at))
+        reader.delete()
+        self.quiet.refresh_from_db()
+        self.assertEqual((self.quiet.comment_count, self.quiet.last_activity_at), (0, None))
+
+    def test_deleting_a_post_fast_deletes_its_comments(self):
+        """The comments of a deleted post go in one DELETE, without per-comment statistics updates."""
+        for content in ('One', 'Two', 'Three'):
+            Comment.objects.create(post=self.busy, author=self.author, content=content)
+        with CaptureQueriesContext(connection) as queries:
+            self.busy.delete()
+        statements = [query['sql'] for query in queries]
+        self.assertEqual(sum(sql.startswith('DELETE FROM "blog_comment"') for sql in statements), 1)
+        self.assertFalse([sql for sql in statements if sql.startswith('UPDATE "blog_post"')])
+        self.assertFalse(Comment.objects.exists())
+
+    def test_activity_never_moves_backwards(self):
+        """A comment committed after a newer one keeps the newer activity timestamp."""
+        later = timezone.now() + timedelta(minutes=5)
+        Post.objects.filter(pk=self.busy.pk).update(last_activity_at=later)
+        Comment.objects.create(post=self.busy, author=self.author, content='One')
+        self.busy.refresh_from_db()
+        self.assertEqual((self.busy.comment_count, self.busy.last_activity_at), (1, later))
+
+    def test_saving_stale_post_keeps_counters(self):
+        """Editing a post loaded before a comment was added does not reset its count."""
+        stale = Post.objects.get(pk=self.busy.pk)
+        Comment.objects.create(post=self.busy, author=self.author, content='One')
+        stale.title = 'Edited'
+        stale.save()
+        self.busy.refresh_from_db()
+        self.assertEqual((self.busy.title, self.busy.comment_count), ('Edited', 1))
+
+    def test_reconcile_command_fixes_drift(self):
+        """reconcile_comment_counts repairs posts whose counters drifted (e.g. after bulk_create)."""
+        Comment.objects.bulk_create(Comment(post=self.busy, author=self.author, content=str(i)) for i in range(3))
+        output = StringIO()
+        call_command('reconcile_comment_counts', stdout=output)
+        self.assertIn('Reconciled 1 posts.', output.getvalue())
+        self.busy.refresh_from_db()
+        self.assertEqual(self.busy.comment_count, 3)
+        self.assertEqual(self.busy.last_activity_at, self.busy.comments.latest('created_at').created_at)
+        self.assertEqual(Post.objects.reconcile_comment_stats(), 0)
+
+    def test_most_discussed_ordering(self):
+        """The post list can be sorted by comment count without a COUNT aggregate."""
+        Comment.objects.create(post=self.quiet, author=self.author, content='One')
+        Comment.objects.create(post=self.busy, author=self.author, content='One')
+        Comment.objects.create(post=self.busy, author=self.author, content='Two')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('post_list'), {'sort': 'discussed'})
+        self.assertEqual(list(response.context['posts']), [self.busy, self.quiet])
+        self.assertContains(response, '2 comments')
+        self.assertFalse(any('COUNT(' in query['sql'] for query in queries))
+
+        response = self.client.get(reverse('post_list'), {'sort': 'activity'})
+        self.assertEqual(list(response.context['posts']), [self.busy, self.quiet])
+
+
+@override_settings(ROOT_URLCONF='django_blog.asgi_urls')
+class AsyncPostViewsTest(TestCase):
+    """Tests for the async (ASGI) variants of the read-only blog views."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='writer', password='password123')
+        cls.post = Post.objects.create(title='Async post', content='Served without blocking.', author=cls.author)
+        cls.post.tags.add('Django')
+        Comment.objects.create(post=cls.post, author=cls.author, content='First!')
+
+    def setUp(self):
+        cache.clear()
+
+    def urls(self):
+        return [
+            reverse('post_list') + '?sort=discussed',
+            reverse('post_detail', kwargs={'pk': self.post.pk}),
+            reverse('posts_by_tag', kwargs={'tag_slug': 'django'}),
+            reverse('post_search') + '?q=async',
+        ]
+
+    async def test_async_pages_match_sync_pages(self):
+        """Each async view renders exactly what its sync counterpart renders."""
+        for url in self.urls():
+            async_response = await AsyncClient().get(url)
+            await cache.aclear()
+            with override_settings(ROOT_URLCONF='django_blog.urls'):
+                sync_response = await self.async_client.get(url)
+            await cache.aclear()
+            self.assertEqual(async_response.status_code, 200, url)
+            self.assertEqual(async_response.content, sync_response.content, url)
+
+    def test_async_pages_are_cached(self):
+        """A repeated anonymous view is served from the response cache without queries."""
+        get = async_to_sync(self.async_client.get)
+        url = reverse('post_detail', kwargs={'pk': self.post.pk})
+        first = get(url)
+        with self.assertNumQueries(0):
+            cached = get(url)
+        self.assertEqual(cached.content, first.content)
+
+    async def test_missing_objects_are_404(self):
+        """Unknown posts and tags are 404s."""
+        self.assertEqual((await self.async_client.get(reverse('post_detail', kwargs={'pk': 0}))).status_code, 404)
+        missing_tag = reverse('posts_by_tag', kwargs={'tag_slug': 'missing'})
+        self.assertEqual((await self.async_client.get(missing_tag)).status_code, 404)
+
+    def test_asgi_settings_route_to_async_views(self):
+        """The ASGI deployment resolves the read-only pages to their async views."""
+        from django_blog import asgi_settings
+        self.assertEqual(asgi_settings.ROOT_URLCONF, 'django_blog.asgi_urls')
+        match = resolve('/', urlconf=asgi_settings.ROOT_URLCONF)
+        self.assertIs(match.func.view_class, views.AsyncPostListView)
+
+    def test_asgi_settings_disable_persistent_connections(self):
+        """Only the ASGI deployment gives up CONN_MAX_AGE; everything else matches settings.py."""
+        from django_blog import asgi_settings, settings
+        asgi_database, database = asgi_settings.DATABASES['default'], settings.DATABASES['default']
+        self.assertEqual((asgi_database['CONN_MAX_AGE'], asgi_database['CONN_HEALTH_CHECKS']), (0, False))
+        self.assertEqual(database['CONN_MAX_AGE'], 600)
+        self.assertEqual(asgi_database['OPTIONS'], database['OPTIONS'])
+        self.assertEqual(asgi_settings.INSTALLED_APPS, settings.INSTALLED_APPS)
+
+
+class PostExcerptTest(TestCase):
+    """Tests for the precomputed post excerpt used by the listing pages."""
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='writer', password='password123')
+        self.body = ' '.join(f'word{i}' for i in range(100))
+        self.post = Post.objects.create(title='Long post', content=self.body, author=self.author)
+
+    def test_excerpt_matches_truncatewords(self):
+        """The stored excerpt is what |truncatewords:30 used to render."""
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.excerpt, Truncator(self.body).words(30, truncate=' …'))
+        self.assertEqual((self.post.word_count, self.post.content_length), (100, len(self.body)))
+
+    def test_excerpt_follows_content_updates(self):
+        """Editing the body, also with update_fields, refreshes the excerpt."""
+        self.post.content = 'Short body.'
+        self.post.save(update_fields=['content'])
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.excerpt, self.post.word_count), ('Short body.', 2))
+
+    def test_listings_do_not_load_content(self):
+        """The list query defers the body column and still renders the excerpt."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('post_list'))
+        self.assertContains(response, 'word29 …')
+        self.assertNotIn('"blog_post"."content"', queries[0]['sql'])
+
+    def test_backfill_command(self):
+        """backfill_post_excerpts fills in posts created without signals or save()."""
+        Post.objects.filter(pk=self.post.pk).update(excerpt='', word_count=0, content_length=0)
+        call_command('backfill_post_excerpts', stdout=StringIO())
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.word_count, 100)
+        self.assertTrue(self.post.excerpt.endswith('word29 …'))
+
+
+class PostCrudViewsTest(TestCase):
+    """Tests for the post and comment write views."""
+
+    def setUp(self):
+        self.author = User.objects.create_user(username='writer', password='password123')
+        self.other = User.objects.create_user(username='reader', password='password123')
+
+    def test_create_post_and_comment(self):
+        """Logged-in users publish posts as themselves and comment on them."""
+        self.client.force_login(self.author)
+        response = self.client.post(reverse('post_create'), {'title': 'New post', 'content': 'Body', 'tags': 'django'})
+        post = Post.objects.get(title='New post')
+        self.assertRedirects(response, post.get_absolute_url())
+        self.assertEqual((post.author, list(post.tags.names())), (self.author, ['django']))
+        self.client.post(reverse('comment_create', kwargs={'post_pk': post.pk}), {'content': 'First!'})
+        post.refresh_from_db()
+        self.assertEqual(post.comment_count, 1)
+
+    def test_only_the_author_can_edit_or_delete(self):
+        post = Post.objects.create(title='Mine', content='Body', author=self.author)
+        self.client.force_login(self.other)
+        self.assertEqual(self.client.get(reverse('post_update', kwargs={'pk': post.pk})).status_code, 403)
+        self.assertEqual(self.client.post(reverse('post_delete', kwargs={'pk': post.pk})).status_code, 403)
+        self.client.force_login(self.author)
+        self.assertRedirects(self.client.post(reverse('post_delete', kwargs={'pk': post.pk})), reverse('post_list'))
+        self.assertFalse(Post.objects.filter(pk=post.pk).exists())
+
+    def test_anonymous_users_are_sent_to_login(self):
+        response = self.client.get(reverse('post_create'))
+        self.assertRedirects(response, '%s?next=%s' % (reverse('login'), reverse('post_create')))
+
+
+class SeedBlogCommandTest(TestCase):
+    """Tests for the bulk synthetic data generator."""
+
+    def seed(self, **options):
+        call_command('seed_blog', posts=40, users=5, comments=3, chunk_size=15, stdout=StringIO(), **options)
+
+    def test_seeded_rows_are_consistent(self):
+        """Derived columns, the search index and the tag statistics agree with the seeded rows."""
+        self.seed()
+        self.assertEqual((Post.objects.count(), User.objects.count()), (40, 5))
+        output = StringIO()
+        call_command('reconcile_comment_counts', stdout=output)
+        self.assertIn('Reconciled 0 posts', output.getvalue())
+        post = Post.objects.order_by('pk').first()
+        self.assertEqual(post.excerpt, Truncator(post.content).words(30, truncate=' …'))
+        self.assertIn(post, PostSearchTerm.objects.search(post.title.split()[0]))
+        stat = TagStat.objects.get(tag=post.tags.first())
+        self.assertEqual(stat.post_count, Post.objects.filter(tags__id=stat.tag_id).count())
+        # The seeded posts took consecutive keys from the database.
+        self.assertEqual(Post.objects.create(title='New', content='Body', author=post.author).pk, post.pk + 40)
+
+    def test_same_seed_same_data(self):
+        self.seed(seed=7)
+        first = list(Post.objects.order_by('pk').values_list('title', 'content', 'comment_count'))
+        Post.objects.all().delete()
+        self.seed(seed=7)
+        self.assertEqual(list(Post.objects.order_by('pk').values_list('title', 'content', 'comment_count')), first)
+
+
+class SQLiteTuningTest(SimpleTestCase):
+    """Tests for the SQLite DATABASES entry built by sqlite_database()."""
+
+    def pragmas(self, config, names):
+        connection = ConnectionHandler({'default': {}, 'tuned': config})['tuned']
+        try:
+            with connection.cursor() as cursor:
+                values = {}
+                for name in names:
+                    cursor.execute(f'PRAGMA {name}')
+                    values[name] = cursor.fetchone()[0]
+            return values, connection.transaction_mode
+        finally:
+            connection.close()
+
+    def test_new_connections_use_wal_and_pragmas(self):
+        """Every new connection runs the PRAGMAs and starts transactions with BEGIN IMMEDIATE."""
+        with tempfile.TemporaryDirectory() as directory:
+            config = sqlite_database(os.path.join(directory, 'db.sqlite3'))
+            values, transaction_mode = self.pragmas(
+                config, ['journal_mode', 'synchronous', 'mmap_size', 'cache_size', 'busy_timeout']
+            )
+        self.assertEqual(values, {
+            'journal_mode': 'wal', 'synchronous': 1, 'mmap_size': 256 * 1024 * 1024,
+            'cache_size': -64 * 1024, 'busy_timeout': 5000,
+        })
+        self.assertEqual(transaction_mode, 'IMMEDIATE')
+        self.assertEqual((config['CONN_MAX_AGE'], config['CONN_HEALTH_CHECKS']), (600, True))
+
+    def test_wal_is_stored_in_the_file_once(self):
+        """The first connection switches the file to WAL; later ones leave it untouched."""
+        with tempfile.TemporaryDirectory() as directory:
+            name = os.path.join(directory, 'db.sqlite3')
+            config = sqlite_database(name)
+            self.pragmas(config, ['journal_mode'])
+            with open(name, 'rb') as database:
+                first = database.read()
+            self.pragmas(config, ['journal_mode'])
+            with open(name, 'rb') as database:
+                second = database.read()
+        # Bytes 18-19 of the header are the file format versions: 2 means WAL.
+        self.assertEqual(first[18:20], b'\x02\x02')
+        self.assertEqual(second, first)
+
+    def test_pragmas_can_be_overridden_or_dropped(self):
+        with tempfile.TemporaryDirectory() as directory:
+            config = sqlite_database(os.path.join(directory, 'db.sqlite3'), busy_timeout=100, mmap_size=None)
+            values, _ = self.pragmas(config, ['busy_timeout', 'mmap_size'])
+        self.assertEqual(values, {'busy_timeout': 100, 'mmap_size': 0})
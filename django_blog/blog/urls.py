@@ -5,6 +5,7 @@ from . import views
 from .views import (
     PostListView,
     PostDetailView,
+    PostCommentsView,
     PostCreateView,
     PostUpdateView,
     PostDeleteView,
@@ -13,6 +14,7 @@ from .views import (
     CommentDeleteView,
     PostSearchView,
     PostTagListView, # Imported the correct view name: PostTagListView
+    TagCloudView,
 )
 
 urlpatterns = [
@@ -30,12 +32,15 @@ urlpatterns = [
     # ----------------
     path('search/', PostSearchView.as_view(), name='post_search'),
     
+    path('tags/', TagCloudView.as_view(), name='tag_cloud'),
+
     # FIX: Using the correct view PostTagListView.as_view()
     path('tags/<slug:tag_slug>/', PostTagListView.as_view(), name='posts_by_tag'),
 
     # ----------------
     # Comment URL Patterns
     # ----------------
+    path('post/<int:pk>/comments/', PostCommentsView.as_view(), name='post_comments'),
     path('post/<int:post_pk>/comments/new/', CommentCreateView.as_view(), name='comment_create'),
     path('comment/<int:pk>/update/', CommentUpdateView.as_view(), name='comment_update'),
     path('comment/<int:pk>/delete/', CommentDeleteView.as_view(), name='comment_delete'),
@@ -1,33 +1,113 @@
 # blog/views.py (Updated - Only showing new/modified views)
 # ... (All previous imports remain the same) ...
-from django.db.models import Q # Import Q object for complex lookups
-from taggit.models import Tag
+from urllib.parse import urlencode
+
+from django.contrib.auth import login
+from django.contrib.auth.decorators import login_required
+from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.db.models.functions import Coalesce
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.template.loader import render_to_string
+from django.urls import reverse, reverse_lazy
+from django.views import View
+from django.views.generic import CreateView, DeleteView, DetailView, ListView, UpdateView
+
+from .cache import AsyncCachedResponseMixin, CachedResponseMixin # Tag-invalidated full-response cache
+from .forms import CommentForm, CustomUserCreationForm, PostForm
+from .models import Comment, Post
+from .models import PostSearchTerm # Inverted index backing the search page
+from .models import TagStat # Materialized tag statistics (tag pages and tag cloud)
+
+# ----------------------------------------------------
+# 0. Post List / Detail Views (cached)
+# ----------------------------------------------------
+
+class PostListView(CachedResponseMixin, ListView):
+    """Displays all blog posts, newest first (the blog index)."""
+    model = Post
+    template_name = 'blog/post_list.html'
+    context_object_name = 'posts'
+    # Any post being created, edited, commented on or deleted changes the index.
+    cache_tags = ['posts']
+    # The only columns post_list.html reads.
+    listing_fields = ('title', 'published_date', 'excerpt', 'comment_count', 'author__username')
+    # ?sort=... -> ordering; each one is served by an index on Post, no aggregation.
+    orderings = {
+        'latest': ('-published_date',),
+        'discussed': ('-comment_count', '-published_date'),
+        'activity': (Coalesce('last_activity_at', 'published_date').desc(),),
+    }
+
+    def get_sort(self):
+        sort = self.request.GET.get('sort')
+        return sort if sort in self.orderings else 'latest'
+
+    def get_queryset(self):
+        return Post.objects.for_listing(self.listing_fields).order_by(*self.orderings[self.get_sort()])
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['sort'] = self.get_sort()
+        return context
+
+
+class PostDetailView(CachedResponseMixin, DetailView):
+    """Displays a single post with its tags."""
+    model = Post
+    template_name = 'blog/post_detail.html'
+    context_object_name = 'post'
+
+    def get_queryset(self):
+        return Post.objects.for_detail()
+
+    def get_cache_tags(self):
+        return ['post:%s' % self.kwargs['pk']]
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        # Only the newest page of comments; the rest is fetched from PostCommentsView
+        comments, cursor = self.object.comment_page()
+        context['comments'] = comments
+        context['comments_next_url'] = comments_page_url(self.object, cursor)
+        return context
+
+
+def comments_page_url(post, cursor):
+    if cursor is None:
+        return None
+    return '%s?%s' % (reverse('post_comments', kwargs={'pk': post.pk}), urlencode({'cursor': cursor}))
+
+
+class PostCommentsView(View):
+    """Returns the next page of a post's comments as a JSON fragment ('Load more comments')."""
+
+    def get(self, request, pk):
+        post = get_object_or_404(Post, pk=pk)
+        comments, cursor = post.comment_page(request.GET.get('cursor'))
+        html = render_to_string('blog/comment_list.html', {'comments': comments}, request=request)
+        return JsonResponse({'html': html, 'count': len(comments), 'next': comments_page_url(post, cursor)})
 
 # ----------------------------------------------------
 # 1. Search Functionality View
 # ----------------------------------------------------
 
 class PostSearchView(ListView):
-    """Handles searching posts by title, content, and tags."""
+    """Handles searching posts by title, content, and tags through the search index."""
     model = Post
     template_name = 'blog/search_results.html'
     context_object_name = 'posts'
+    # The only columns search_results.html reads; it also lists each post's tags.
+    listing_fields = ('title', 'published_date', 'excerpt', 'author__username')
 
     def get_queryset(self):
         query = self.request.GET.get('q') # Get the search query from the URL
         
         if query:
-            # 1. Look up by Title or Content
-            # Q objects allow OR lookups (combining different fields with OR | )
-            object_list = Post.objects.filter(
-                Q(title__icontains=query) | Q(content__icontains=query)
-            ).distinct()
-            
-            # 2. Add Tag Search: Filter by posts that have a tag matching the query
-            tag_posts = Post.objects.filter(tags__name__icontains=query).distinct()
-            
-            # Combine the results and ensure uniqueness
-            return (object_list | tag_posts).order_by('-published_date')
+            # Look up the words of the query in the inverted search index
+            # (title, content and tags), ranked by relevance. Every word is
+            # matched as a prefix, so "djan" finds posts about "Django".
+            return PostSearchTerm.objects.search(query).for_listing(self.listing_fields, tags=True)
         
         # If no query, return an empty set or a default list
         return Post.objects.none() 
@@ -41,25 +121,214 @@ class PostSearchView(ListView):
 # 2. Tag Filtering View
 # ----------------------------------------------------
 
-class PostTagListView(ListView):
+class PostTagListView(CachedResponseMixin, ListView):
     """Displays posts associated with a specific tag name."""
     model = Post
     template_name = 'blog/post_list_by_tag.html'
     context_object_name = 'posts'
+    # The only columns post_list_by_tag.html reads; it also lists each post's tags.
+    listing_fields = ('title', 'published_date', 'excerpt', 'author__username')
+
+    def get_cache_tags(self):
+        return ['tag:%s' % self.kwargs.get('tag_slug')]
 
     def get_queryset(self):
         # Get the tag name from the URL path (slug is used for tag names)
         tag_slug = self.kwargs.get('tag_slug')
         
         if tag_slug:
-            # Filter posts that have a tag with the given slug
-            queryset = Post.objects.filter(tags__slug=tag_slug).order_by('-published_date')
+            # Resolve the slug once through the materialized tag statistics
+            # (unique slug index), then filter on the tag id so the query only
+            # joins taggit's TaggedItem table, not the Tag table.
+            self.tag = get_object_or_404(TagStat, slug=tag_slug)
+            queryset = Post.objects.for_listing(self.listing_fields, tags=True).filter(tags__id=self.tag.tag_id).order_by('-published_date')
             return queryset
         return Post.objects.none()
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        # Get the actual Tag object to display its name in the template
-        tag_slug = self.kwargs.get('tag_slug')
-        context['tag'] = get_object_or_404(Tag, slug=tag_slug)
-        return context
\ No newline at end of file
+        # The TagStat row carries the tag's name, slug and post count for the template
+        context['tag'] = getattr(self, 'tag', None)
+        return context
+
+# ----------------------------------------------------
+# 3. Tag Cloud View
+# ----------------------------------------------------
+
+class TagCloudView(ListView):
+    """Displays the most used tags, sized by how many posts carry them."""
+    template_name = 'blog/tag_cloud.html'
+    context_object_name = 'tags'
+
+    def get_queryset(self):
+        return TagStat.objects.cloud()
+
+# ----------------------------------------------------
+# 4. Async (ASGI) variants of the read-only views
+# ----------------------------------------------------
+# Served instead of the sync views under ASGI (asgi_settings.py routes with asgi_urls.py).
+# They load everything their template reads through the async ORM before
+# rendering, since a lazy query from inside a template would block the
+# event loop (and raises SynchronousOnlyOperation).
+
+async def aload(queryset, chunk_size=100):
+    """Evaluate a queryset (with its prefetches) without blocking the event loop."""
+    return [obj async for obj in queryset.aiterator(chunk_size=chunk_size)]
+
+
+class AsyncPostListView(AsyncCachedResponseMixin, View):
+    """Async version of PostListView."""
+    template_name = PostListView.template_name
+    cache_tags = PostListView.cache_tags
+
+    def get_sort(self):
+        sort = self.request.GET.get('sort')
+        return sort if sort in PostListView.orderings else 'latest'
+
+    async def get_page_context(self):
+        sort = self.get_sort()
+        posts = await aload(Post.objects.for_listing(PostListView.listing_fields).order_by(*PostListView.orderings[sort]))
+        return {'posts': posts, 'object_list': posts, 'sort': sort}
+
+
+class AsyncPostDetailView(AsyncCachedResponseMixin, View):
+    """Async version of PostDetailView."""
+    template_name = PostDetailView.template_name
+
+    def get_cache_tags(self):
+        return ['post:%s' % self.kwargs['pk']]
+
+    async def get_page_context(self):
+        try:
+            post = await Post.objects.for_detail().aget(pk=self.kwargs['pk'])
+        except Post.DoesNotExist:
+            raise Http404('No post found matching the query')
+        comments, cursor = await post.acomment_page()
+        return {
+            'post': post,
+            'object': post,
+            'comments': comments,
+            'comments_next_url': comments_page_url(post, cursor),
+        }
+
+
+class AsyncPostSearchView(View):
+    """Async version of PostSearchView (not cached: one entry per query string)."""
+    template_name = PostSearchView.template_name
+
+    async def get(self, request):
+        request.user = await request.auser()
+        query = request.GET.get('q')
+        posts = await aload(PostSearchTerm.objects.search(query).for_listing(PostSearchView.listing_fields, tags=True)) if query else []
+        return render(request, self.template_name, {'posts': posts, 'query': query})
+
+
+class AsyncPostTagListView(AsyncCachedResponseMixin, View):
+    """Async version of PostTagListView."""
+    template_name = PostTagListView.template_name
+
+    def get_cache_tags(self):
+        return ['tag:%s' % self.kwargs.get('tag_slug')]
+
+    async def get_page_context(self):
+        try:
+            tag = await TagStat.objects.aget(slug=self.kwargs.get('tag_slug'))
+        except TagStat.DoesNotExist:
+            raise Http404('No tag found matching the query')
+        posts = await aload(
+            Post.objects.for_listing(PostTagListView.listing_fields, tags=True).filter(tags__id=tag.tag_id).order_by('-published_date')
+        )
+        return {'posts': posts, 'object_list': posts, 'tag': tag}
+
+# ----------------------------------------------------
+# 5. Post CRUD Views
+# ----------------------------------------------------
+# Writes go through the models, so the signals in models.py keep the search
+# index, tag statistics, comment counts and page cache up to date.
+
+class AuthorRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
+    """Only the author of the object may change or delete it."""
+
+    def test_func(self):
+        return self.get_object().author_id == self.request.user.pk
+
+
+class PostCreateView(LoginRequiredMixin, CreateView):
+    """Creates a post authored by the logged-in user."""
+    model = Post
+    form_class = PostForm
+    template_name = 'blog/post_form.html'
+
+    def form_valid(self, form):
+        form.instance.author = self.request.user
+        return super().form_valid(form)
+
+
+class PostUpdateView(AuthorRequiredMixin, UpdateView):
+    """Edits a post (author only)."""
+    model = Post
+    form_class = PostForm
+    template_name = 'blog/post_form.html'
+
+
+class PostDeleteView(AuthorRequiredMixin, DeleteView):
+    """Deletes a post (author only)."""
+    model = Post
+    template_name = 'blog/post_confirm_delete.html'
+    success_url = reverse_lazy('post_list')
+
+# ----------------------------------------------------
+# 6. Comment CRUD Views
+# ----------------------------------------------------
+
+class CommentCreateView(LoginRequiredMixin, CreateView):
+    """Adds a comment by the logged-in user to the post in the URL."""
+    model = Comment
+    form_class = CommentForm
+    template_name = 'blog/comment_form.html'
+
+    def form_valid(self, form):
+        form.instance.post = get_object_or_404(Post, pk=self.kwargs['post_pk'])
+        form.instance.author = self.request.user
+        return super().form_valid(form)
+
+
+class CommentUpdateView(AuthorRequiredMixin, UpdateView):
+    """Edits a comment (author only)."""
+    model = Comment
+    form_class = CommentForm
+    template_name = 'blog/comment_form.html'
+
+
+class CommentDeleteView(AuthorRequiredMixin, DeleteView):
+    """Deletes a comment (author only) and returns to its post."""
+    model = Comment
+    template_name = 'blog/comment_confirm_delete.html'
+
+    def get_success_url(self):
+        return self.object.get_absolute_url()
+
+# ----------------------------------------------------
+# 7. Account Views
+# ----------------------------------------------------
+
+def register_user(request):
+    """Creates an account and logs the new user in."""
+    form = CustomUserCreationForm(request.POST or None)
+    if request.method == 'POST' and form.is_valid():
+        login(request, form.save())
+        return redirect('post_list')
+    return render(request, 'blog/register.html', {'form': form})
+
+
+@login_required
+def profile_view(request):
+    """Shows and updates the logged-in user's name and email."""
+    if request.method == 'POST':
+        user = request.user
+        user.first_name = request.POST.get('first_name', user.first_name)
+        user.last_name = request.POST.get('last_name', user.last_name)
+        user.email = request.POST.get('email', user.email)
+        user.save(update_fields=['first_name', 'last_name', 'email'])
+        return redirect('profile')
+    return render(request, 'blog/profile.html')
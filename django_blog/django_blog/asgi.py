@@ -3,6 +3,10 @@ ASGI config for django_blog project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+The settings come from ``django_blog.asgi_settings``, which routes requests
+with ``django_blog.asgi_urls`` (the read-only blog pages are served by their
+async views) and disables persistent database connections.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -11,6 +15,6 @@ import os
 
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'django_blog.settings')
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'django_blog.asgi_settings')
 
 application = get_asgi_application()
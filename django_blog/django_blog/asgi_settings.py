@@ -0,0 +1,24 @@
+"""
+Settings used by the ASGI deployment (django_blog/asgi.py).
+
+Same as django_blog.settings, except that:
+
+- requests are routed with django_blog.asgi_urls, which serves the read-only
+  blog pages with their async views;
+- persistent database connections are disabled. Under ASGI the async views
+  run their queries in sync_to_async() threads, which the
+  request_started/request_finished connection cleanup does not reach, so
+  connections kept for CONN_MAX_AGE would pile up in those threads. Django
+  recommends disabling persistent connections when running under ASGI.
+"""
+from learnlab.sqlite import sqlite_database
+
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR
+
+ROOT_URLCONF = 'django_blog.asgi_urls'
+
+DATABASES = {
+    # WAL and tuned PRAGMAs, a new connection per request (see learnlab/sqlite).
+    'default': sqlite_database(BASE_DIR / 'db.sqlite3', conn_max_age=0),
+}
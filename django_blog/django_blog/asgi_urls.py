@@ -0,0 +1,18 @@
+"""
+URL configuration used by the ASGI deployment (django_blog/asgi.py).
+
+Same URLs and names as django_blog.urls, but the read-only blog pages are
+served by their async views; every other URL falls through to the sync ones.
+"""
+from django.urls import path
+
+from blog import views
+
+from .urls import urlpatterns as sync_urlpatterns
+
+urlpatterns = [
+    path('', views.AsyncPostListView.as_view(), name='post_list'),
+    path('post/<int:pk>/', views.AsyncPostDetailView.as_view(), name='post_detail'),
+    path('search/', views.AsyncPostSearchView.as_view(), name='post_search'),
+    path('tags/<slug:tag_slug>/', views.AsyncPostTagListView.as_view(), name='posts_by_tag'),
+] + sync_urlpatterns
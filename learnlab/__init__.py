@@ -0,0 +1,3 @@
+# Code shared by the Django projects of this repository. Install it into the
+# environment the projects run in with `pip install -e .` from the repository
+# root (see README.md).
@@ -0,0 +1,24 @@
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.db import connection
+
+# The benchmark scripts seed their own data, so they run against a fresh,
+# migrated temporary SQLite file instead of the configured database, unless
+# they are given a file to reuse (one seeded by an earlier run).
+
+
+def use_database(filename, path=None):
+    """
+    Point the default connection at path, or at a new temporary file named
+    filename, which is migrated first. Returns the file's path.
+
+    The settings dict is shared by the connections of every thread, so
+    threads started afterwards use the same file.
+    """
+    connection.close()
+    connection.settings_dict['NAME'] = path or os.path.join(tempfile.mkdtemp(), filename)
+    if not path:
+        call_command('migrate', verbosity=0)
+    return str(connection.settings_dict['NAME'])
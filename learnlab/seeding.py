@@ -0,0 +1,80 @@
+import random
+from contextlib import contextmanager
+
+# Helpers for the synthetic load-test data of the seed commands (seed_blog in
+# django_blog, seed_data in advanced_features_and_security).
+#
+# Rows are generated as tuples of column values in chunks. Each chunk has its
+# own random.Random seeded from (seed, table, first row index), so a chunk is
+# the same whichever process generates it. The chunk functions never touch
+# the database, so they also run in worker processes. A row refers to a
+# parent generated in the same run by the parent's index in the run; the
+# TableWriter of the parent table turns that index into the primary key the
+# database assigned when the parent was inserted.
+
+
+def chunk_random(seed, table, start):
+    return random.Random(f'{seed}:{table}:{start}')
+
+
+def chunk_specs(total, chunk_size, **spec):
+    return [
+        dict(spec, start=start, count=min(chunk_size, total - start))
+        for start in range(0, total, chunk_size)
+    ]
+
+
+class TableWriter:
+    """
+    Inserts generated rows into one model's table with bulk_create(), in
+    batches of batch_size. The primary keys come from the database, so
+    concurrent writers cannot collide.
+
+    references maps a field to the TableWriter of the table it points to,
+    which must be created with keep_pks=True; the rows hold the index of the
+    parent row in the run, which is replaced by the parent's primary key.
+    Parent rows must be written first, in index order. Generated values of auto_now and auto_now_add fields are
+    kept; bulk_create() would otherwise replace them with the current time.
+    """
+
+    def __init__(self, model, fields, references=None, keep_pks=False, batch_size=1000, using='default'):
+        self.model = model
+        model_fields = [model._meta.get_field(name) for name in fields]
+        self.attnames = [field.attname for field in model_fields]
+        self.timestamp_fields = [
+            field for field in model_fields
+            if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+        ]
+        self.references = [(fields.index(name), parent) for name, parent in (references or {}).items()]
+        for _, parent in self.references:
+            if parent.pks is None:
+                raise ValueError(f'{parent.model.__name__} rows are referenced but their keys are not kept.')
+        self.batch_size = batch_size
+        self.using = using
+        # Primary keys of the written rows, in order, when another table refers to them.
+        self.pks = [] if keep_pks else None
+        self.written = 0
+
+    def write(self, rows):
+        objs = []
+        for row in rows:
+            values = list(row)
+            for position, parent in self.references:
+                values[position] = parent.pks[values[position]]
+            objs.append(self.model(**dict(zip(self.attnames, values))))
+        with self.generated_timestamps():
+            self.model.objects.using(self.using).bulk_create(objs, batch_size=self.batch_size)
+        if self.pks is not None:
+            self.pks.extend(obj.pk for obj in objs)
+        self.written += len(objs)
+
+    @contextmanager
+    def generated_timestamps(self):
+        flags = [(field, field.auto_now, field.auto_now_add) for field in self.timestamp_fields]
+        for field, _, _ in flags:
+            field.auto_now = field.auto_now_add = False
+        try:
+            yield
+        finally:
+            for field, auto_now, auto_now_add in flags:
+                field.auto_now, field.auto_now_add = auto_now, auto_now_add
@@ -0,0 +1,59 @@
+# SQLite configuration for concurrent use (several web workers or threads).
+#
+# A bare sqlite3 DATABASES entry keeps the rollback journal: a writer locks the
+# whole file and waits for every reader to finish before it can commit, and
+# every request opens (and throws away) its own connection. sqlite_database()
+# returns a DATABASES entry that uses the write-ahead log and keeps
+# connections open between requests. Every project in the repository uses it:
+#
+#   from learnlab.sqlite import sqlite_database
+#
+#   DATABASES = {'default': sqlite_database(BASE_DIR / 'db.sqlite3')}
+#
+# The entry's ENGINE is this package: its DatabaseWrapper (base.py) is the
+# stock SQLite backend, except that it switches the database file to WAL the
+# first time it connects to it. journal_mode is stored in the file, so it is
+# only written once, not by every connection.
+#
+# The PRAGMAs below are per connection and run once per new connection
+# (OPTIONS['init_command']), so with CONN_MAX_AGE their cost is paid once per
+# worker thread rather than once per request. Transactions start with BEGIN
+# IMMEDIATE: a writer takes the write lock up front and queues on
+# busy_timeout, instead of failing with "database is locked" when it upgrades
+# a read transaction another writer got ahead of.
+# django_blog/blog/benchmark_writes.py measures the difference under
+# concurrent writers.
+
+PRAGMAS = {
+    # With WAL, fsync on checkpoints only. A power loss can drop the last
+    # commits but cannot corrupt the database.
+    'synchronous': 'NORMAL',
+    # Read the database through a 256 MiB memory map instead of read() calls.
+    'mmap_size': 256 * 1024 * 1024,
+    # Page cache per connection; negative values are KiB (64 MiB).
+    'cache_size': -64 * 1024,
+    # Milliseconds a connection waits for the write lock before raising
+    # "database is locked".
+    'busy_timeout': 5000,
+    'temp_store': 'MEMORY',
+}
+
+
+def sqlite_database(name, conn_max_age=600, **pragmas):
+    """
+    A DATABASES entry for the SQLite file `name` with the PRAGMAS above
+    (override any of them as keyword arguments, None drops one) and
+    persistent connections reused for `conn_max_age` seconds.
+    """
+    pragmas = {key: value for key, value in {**PRAGMAS, **pragmas}.items() if value is not None}
+    return {
+        'ENGINE': 'learnlab.sqlite',
+        'NAME': name,
+        'CONN_MAX_AGE': conn_max_age,
+        # Reused connections are checked before each request, not trusted blindly.
+        'CONN_HEALTH_CHECKS': conn_max_age != 0,
+        'OPTIONS': {
+            'init_command': ';'.join(f'PRAGMA {key}={value}' for key, value in pragmas.items()),
+            'transaction_mode': 'IMMEDIATE',
+        },
+    }
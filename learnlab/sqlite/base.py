@@ -0,0 +1,18 @@
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    The stock SQLite backend, except that a new connection switches the
+    database file to the write-ahead log if it is not using it yet.
+
+    journal_mode is stored in the file: setting it from every connection
+    (e.g. in init_command) would rewrite the file header each time, so it is
+    read first and only written the first time.
+    """
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        if not self.is_in_memory_db() and conn.execute('PRAGMA journal_mode').fetchone()[0] != 'wal':
+            conn.execute('PRAGMA journal_mode=WAL')
+        return conn